@@ -0,0 +1,230 @@
+"""
+Load test untuk API JSON lokal (wallet_api.py).
+
+Beberapa thread klien mengirim campuran request baca (saldo, riwayat, rekap
+tahunan, login) dan tulis (tambah, hapus banyak) lewat koneksi keep-alive
+selama waktu tertentu, lalu melaporkan request per detik serta latensi
+p50/p99 per endpoint dan total.
+
+Tanpa --url, server dijalankan di proses terpisah (supaya klien dan server
+tidak berebut GIL) di atas database sementara berisi data sintetis.
+
+Contoh:
+    python bench_api.py                                   # 100k baris, 8 klien, 10 detik
+    python bench_api.py --klien 64 --readers 8 --detik 30 --tulis 0.3 --output api.json
+    python bench_api.py --url http://127.0.0.1:8765 --user budi --password rahasia
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+from bench_wallet import buat_data_sintetis
+from wallet_core import DatabaseManager, ke_sen
+
+# =============================================================================
+# 1. SERVER UJI
+# =============================================================================
+
+def _jalankan_server(db_file, port, jumlah_pembaca):
+    """Target proses server (harus di level modul supaya bisa di-spawn)."""
+    from wallet_api import ServerAPI
+    server = ServerAPI(("127.0.0.1", port), db_file, jumlah_pembaca)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+def port_kosong():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def tunggu_server(host, port, batas_detik=30):
+    akhir = time.monotonic() + batas_detik
+    while time.monotonic() < akhir:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server {host}:{port} tidak merespons")
+
+# =============================================================================
+# 2. KLIEN
+# =============================================================================
+
+class Klien:
+    """Satu koneksi keep-alive; setiap request dicatat (endpoint, latensi ms, status)."""
+    def __init__(self, host, port, token=None):
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+        self.header = {"Content-Type": "application/json"}
+        if token:
+            self.header["X-Token"] = token
+        self.catatan = []
+
+    def panggil(self, nama, metode, path, isi=None):
+        body = json.dumps(isi).encode("utf-8") if isi is not None else None
+        mulai = time.perf_counter()
+        try:
+            self.conn.request(metode, path, body=body, headers=self.header)
+            respons = self.conn.getresponse()
+            data = json.loads(respons.read())
+            status = respons.status
+        except (OSError, http.client.HTTPException, ValueError):
+            self.conn.close() # Koneksi dibuka ulang otomatis di request berikutnya
+            data, status = None, 0
+        self.catatan.append((nama, (time.perf_counter() - mulai) * 1000, status))
+        return data if status == 200 else None
+
+def jalankan_klien(klien, user, password, tahun, porsi_tulis, akhir, seed):
+    rng = random.Random(seed)
+    id_baru = []
+    kursor = None
+    while time.monotonic() < akhir:
+        acak = rng.random()
+        if acak < porsi_tulis:
+            if len(id_baru) >= 20:
+                klien.panggil("hapus_banyak", "POST", "/transactions/delete", {"user": user, "ids": id_baru})
+                id_baru = []
+            else:
+                hasil = klien.panggil("tambah", "POST", "/transactions", {
+                    "user": user, "jenis": "Pengeluaran", "kategori": "🍔 Makanan",
+                    "deskripsi": "Load test", "nominal_sen": ke_sen(rng.randrange(5, 500) * 1000)})
+                if hasil:
+                    id_baru.append(hasil["transaksi"]["id"])
+            continue
+        acak = rng.random()
+        if acak < 0.35:
+            klien.panggil("saldo", "GET", "/balance?" + urlencode({"user": user}))
+        elif acak < 0.75:
+            # Halaman riwayat berikutnya; kembali ke halaman pertama sesekali atau di akhir riwayat
+            parameter = {"user": user, "limit": 50}
+            if kursor and rng.random() < 0.8:
+                parameter.update(kursor)
+            hasil = klien.panggil("riwayat", "GET", "/history?" + urlencode(parameter))
+            kursor = hasil["berikutnya"] if hasil else None
+        elif acak < 0.95:
+            klien.panggil("rekap_tahunan", "GET", "/yearly-report?" + urlencode({"user": user, "year": tahun}))
+        else:
+            klien.panggil("login", "POST", "/login", {"user": user, "password": password})
+    if id_baru:
+        klien.panggil("hapus_banyak", "POST", "/transactions/delete", {"user": user, "ids": id_baru})
+
+# =============================================================================
+# 3. LAPORAN
+# =============================================================================
+
+def persentil(data_urut, p):
+    return data_urut[min(len(data_urut) - 1, max(0, int(round(p / 100 * len(data_urut))) - 1))]
+
+def statistik(catatan, detik):
+    latensi = sorted(ms for _, ms, _ in catatan)
+    return {
+        "request": len(catatan),
+        "gagal": sum(1 for _, _, status in catatan if status != 200),
+        "rps": round(len(catatan) / detik, 1),
+        "p50_ms": round(persentil(latensi, 50), 3),
+        "p99_ms": round(persentil(latensi, 99), 3),
+        "rata_ms": round(statistics.mean(latensi), 3),
+        "max_ms": round(latensi[-1], 3),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test API JSON Dompet Pintar")
+    parser.add_argument("--url", help="server yang sudah berjalan (default: jalankan server uji sendiri)")
+    parser.add_argument("--user", help="user yang dipakai klien (default: user terberat data sintetis)")
+    parser.add_argument("--password", default="rahasia")
+    parser.add_argument("--ukuran", type=int, default=100_000, help="jumlah baris data sintetis (default: 100000)")
+    parser.add_argument("--readers", type=int, default=8, help="thread baca server uji (default: 8)")
+    parser.add_argument("--klien", type=int, default=8, help="jumlah klien bersamaan (default: 8)")
+    parser.add_argument("--detik", type=float, default=10, help="lama pengujian (default: 10)")
+    parser.add_argument("--tulis", type=float, default=0.2, help="porsi request tulis 0-1 (default: 0.2)")
+    parser.add_argument("--tahun", type=int, default=2025, help="tahun untuk /yearly-report")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="file JSON hasil")
+    args = parser.parse_args(argv)
+    if not 0 <= args.tulis <= 1:
+        parser.error("--tulis harus di antara 0 dan 1")
+
+    proses_server = None
+    with tempfile.TemporaryDirectory() as folder:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+            user = args.user
+            if not user:
+                parser.error("--user wajib diisi bersama --url")
+        else:
+            db_file = os.path.join(folder, "dompet_pintar.db")
+            with DatabaseManager(db_file) as db:
+                mulai = time.perf_counter()
+                user = args.user or buat_data_sintetis(db, args.ukuran, args.seed)
+            print(f"Data {args.ukuran:,} baris dibuat dalam {time.perf_counter() - mulai:.1f} detik (user: {user})")
+            host, port = "127.0.0.1", port_kosong()
+            proses_server = multiprocessing.Process(target=_jalankan_server, args=(db_file, port, args.readers), daemon=True)
+            proses_server.start()
+        try:
+            tunggu_server(host, port)
+            daftar_klien = [Klien(host, port, os.environ.get("DOMPET_API_TOKEN")) for _ in range(args.klien)]
+            print(f"{args.klien} klien, {args.detik:g} detik, porsi tulis {args.tulis:.0%} -> http://{host}:{port}")
+            mulai = time.perf_counter()
+            akhir = time.monotonic() + args.detik
+            threads = [threading.Thread(target=jalankan_klien,
+                                        args=(klien, user, args.password, args.tahun, args.tulis, akhir, args.seed + i))
+                       for i, klien in enumerate(daftar_klien)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            detik = time.perf_counter() - mulai
+            for klien in daftar_klien:
+                klien.conn.close()
+        finally:
+            if proses_server is not None:
+                proses_server.terminate()
+                proses_server.join()
+
+    catatan = [baris for klien in daftar_klien for baris in klien.catatan]
+    if not catatan:
+        print("Tidak ada request yang selesai")
+        return 1
+    per_endpoint = {}
+    for baris in catatan:
+        per_endpoint.setdefault(baris[0], []).append(baris)
+    hasil = {nama: statistik(daftar, detik) for nama, daftar in sorted(per_endpoint.items())}
+    hasil["total"] = statistik(catatan, detik)
+
+    print(f"  {'endpoint':<16}{'request':>9}{'gagal':>7}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for nama, s in hasil.items():
+        print(f"  {nama:<16}{s['request']:>9}{s['gagal']:>7}{s['rps']:>10.1f}{s['p50_ms']:>10.2f}{s['p99_ms']:>10.2f}")
+
+    if args.output:
+        laporan = {
+            "meta": {
+                "waktu": datetime.now().isoformat(timespec="seconds"),
+                "klien": args.klien,
+                "detik": round(detik, 2),
+                "porsi_tulis": args.tulis,
+                "ukuran": None if args.url else args.ukuran,
+                "readers": None if args.url else args.readers,
+            },
+            "hasil": hasil,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(laporan, file, indent=2, ensure_ascii=False)
+        print(f"Hasil tersimpan di {args.output}")
+    return 1 if hasil["total"]["gagal"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
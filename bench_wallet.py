@@ -0,0 +1,238 @@
+"""
+Benchmark Dompet Pintar dengan data sintetis.
+
+Membuat database berisi transaksi palsu yang realistis (banyak user, kategori,
+rentang beberapa tahun) dengan seed tetap, lalu mengukur operasi-operasi utama.
+Hasil ditulis ke file JSON supaya bisa dibandingkan antar perubahan skema/query.
+
+Contoh:
+    python bench_wallet.py                          # 10k, 100k, 1M baris
+    python bench_wallet.py --ukuran 10000 --ulang 3 --output hasil.json
+    python bench_wallet.py --tanpa-gui              # lewati benchmark Tkinter
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import wallet_analitik
+from wallet_core import DAFTAR_KATEGORI, DatabaseManager, PoolKoneksi, baca_csv_transaksi, ke_sen
+
+# Deskripsi contoh per kategori, supaya isi tabel mirip data asli
+CONTOH_DESKRIPSI = {
+    "🍔 Makanan": ["Makan siang", "Kopi susu", "Nasi goreng", "Martabak", "Boba"],
+    "🚗 Transport": ["Ojol ke kampus", "Bensin", "Parkir", "KRL", "Tol"],
+    "🛍️ Belanja": ["Belanja bulanan", "Baju", "Sepatu", "Alat tulis"],
+    "💰 Gaji": ["Gaji bulanan", "Bonus", "Uang saku"],
+    "💅 Skincare": ["Sunscreen", "Serum", "Facial wash"],
+    "✨ Lainnya": ["Pulsa", "Donasi", "Langganan musik", "Hadiah"],
+}
+KATEGORI_KELUAR = [k for k in DAFTAR_KATEGORI if k != "💰 Gaji"]
+
+def buat_data_sintetis(db, jumlah_baris, seed=42, jumlah_user=50, tahun=3):
+    """
+    Mengisi database dengan transaksi sintetis.
+    Jumlah baris per user mengikuti distribusi Zipf, jadi ada satu user "berat"
+    yang riwayatnya jauh lebih panjang dari yang lain (kasus terburuk Dashboard).
+    Mengembalikan nama user terberat.
+    """
+    rng = random.Random(seed)
+    users = [f"user{i:03d}" for i in range(jumlah_user)]
+    bobot = [1 / (i + 1) for i in range(jumlah_user)]
+    total_bobot = sum(bobot)
+    akhir = datetime(2025, 12, 31, 23, 59, 59)
+    rentang_detik = int(timedelta(days=365 * tahun).total_seconds())
+
+    db.cursor.executemany("INSERT OR IGNORE INTO users VALUES (?, ?)", [(u, "rahasia") for u in users])
+
+    def baris():
+        for user, b in zip(users, bobot):
+            for _ in range(round(jumlah_baris * b / total_bobot)):
+                tanggal = akhir - timedelta(seconds=rng.randrange(rentang_detik))
+                if rng.random() < 0.08:
+                    jenis, kategori = "Pemasukan", "💰 Gaji"
+                    nominal = rng.randrange(500, 5000) * 1000
+                else:
+                    jenis, kategori = "Pengeluaran", rng.choice(KATEGORI_KELUAR)
+                    nominal = rng.randrange(5, 500) * 1000
+                yield (user, jenis, kategori, rng.choice(CONTOH_DESKRIPSI[kategori]),
+                       ke_sen(nominal), tanggal.strftime("%Y-%m-%d %H:%M:%S"))
+
+    db.cursor.executemany("""
+        INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, baris())
+    db.conn.commit()
+    return users[0]
+
+def ukur(fungsi, ulang):
+    """Menjalankan fungsi beberapa kali, mengembalikan statistik waktu (ms)."""
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append((time.perf_counter() - mulai) * 1000)
+    return {
+        "ulang": ulang,
+        "min_ms": round(min(waktu), 3),
+        "median_ms": round(statistics.median(waktu), 3),
+        "rata_ms": round(statistics.mean(waktu), 3),
+        "max_ms": round(max(waktu), 3),
+    }
+
+def bench_headless(db, user, folder, ulang):
+    """Benchmark operasi DatabaseManager (tanpa GUI)."""
+    hasil = {}
+    hasil["ambil_semua_data"] = ukur(lambda: db.ambil_semua_data(user), ulang)
+    hasil["ambil_data_tahunan"] = ukur(lambda: db.ambil_data_tahunan(user, 2024), ulang)
+    hasil["ambil_ringkasan"] = ukur(lambda: db.ambil_ringkasan(user), ulang)
+    hasil["ambil_halaman_pertama"] = ukur(lambda: db.ambil_halaman(user), ulang)
+
+    # Halaman "dalam": posisi di tengah riwayat, untuk membuktikan keyset pagination tidak melambat
+    tengah = db.cursor.execute("""
+        SELECT tanggal, id FROM transaksi WHERE username = ?
+        ORDER BY tanggal DESC, id DESC LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM transaksi WHERE username = ?)
+    """, (user, user)).fetchone()
+    hasil["ambil_halaman_tengah"] = ukur(lambda: db.ambil_halaman(user, tengah), ulang)
+    hasil["cari_transaksi_teks"] = ukur(lambda: db.cari_transaksi(user, "makan"), ulang)
+
+    def muat_cache():
+        db.lepas_cache(user)
+        db.ambil_cache(user)
+    hasil["ambil_cache_muat"] = ukur(muat_cache, ulang)
+
+    if wallet_analitik.NUMPY_TERSEDIA:
+        # Hitung penuh (tanpa cache), lalu panggilan yang dilayani cache
+        hasil["analitik_hitung"] = ukur(lambda: wallet_analitik.hitung_analitik(wallet_analitik.muat_data(db, user)), ulang)
+        wallet_analitik.analitik_user(db, user)
+        hasil["analitik_cache"] = ukur(lambda: wallet_analitik.analitik_user(db, user), ulang)
+
+    id_baru = []
+    hasil["tambah_data"] = ukur(lambda: id_baru.append(
+        db.tambah_data(user, "Pengeluaran", "🍔 Makanan", "Benchmark", ke_sen(12000))[0]), max(ulang, 20))
+    # Input cepat: 25 entri dalam satu commit
+    entri_cepat = [("Pengeluaran", "🍔 Makanan", "Benchmark", ke_sen(12000), "2025-06-01 12:00:00")] * 25
+    hasil["tambah_banyak_25"] = ukur(lambda: id_baru.extend(
+        baris[0] for baris in db.tambah_banyak(user, entri_cepat)), ulang)
+    hasil["hapus_banyak"] = ukur(lambda: db.hapus_banyak(user, id_baru), 1)
+
+    # Catch-up transaksi rutin: aturan harian yang terlewat 2 tahun dibuat dalam satu commit
+    db.tambah_rutin("user_rutin", "Pengeluaran", "🚗 Transport", "KRL", ke_sen(8000), "hari",
+                    mulai=(datetime.now() - timedelta(days=730)).strftime("%Y-%m-%d"))
+    hasil["jalankan_rutin_2_tahun"] = ukur(lambda: db.jalankan_rutin("user_rutin"), 1)
+
+    file_csv = os.path.join(folder, "ekspor.csv")
+    hasil["ekspor_csv"] = ukur(lambda: db.ekspor_csv(user, file_csv), ulang)
+    # Import ulang file export ke user baru (semua baris baru, tanpa duplikat)
+    hasil["impor_transaksi"] = ukur(lambda: db.impor_transaksi("user_impor", baca_csv_transaksi(file_csv)), 1)
+    return hasil
+
+def bench_gui(db_file, user, folder, ulang):
+    """Benchmark Dashboard dan export CSV di bawah root Tk tersembunyi. Mengembalikan None jika tidak ada display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e: # ImportError atau TclError (tidak ada display)
+        print(f"  (benchmark GUI dilewati: {e})")
+        return None
+
+    from wallet import Dashboard, ExportWindow, PekerjaDB
+
+    def tunggu_pekerja():
+        # Query berjalan di thread database; tunggu sampai semua hasilnya sudah tampil di widget
+        while dashboard.pekerja.sibuk:
+            root.update()
+
+    root.withdraw()
+    window = tk.Toplevel(root)
+    window.withdraw()
+    hasil = {}
+    dashboard = None
+    try:
+        mulai = time.perf_counter()
+        dashboard = Dashboard(window, root, user, PekerjaDB(root, db_file))
+        tunggu_pekerja()
+        hasil["dashboard_buka"] = {"ulang": 1, "median_ms": round((time.perf_counter() - mulai) * 1000, 3)}
+
+        def refresh():
+            dashboard.refresh_data()
+            tunggu_pekerja()
+        hasil["dashboard_refresh_data"] = ukur(refresh, ulang)
+
+        def halaman_berikut():
+            dashboard.muat_halaman_berikut()
+            tunggu_pekerja()
+        hasil["dashboard_muat_halaman_berikut"] = ukur(halaman_berikut, ulang)
+
+        def export_window():
+            # Export berjalan di thread ExportWindow; selesai = saat UI menerima hasilnya lewat polling
+            jendela = ExportWindow(window, db_file, user)
+            jendela.win.withdraw()
+            selesai = []
+            jendela.export_selesai = lambda ditulis, file_path: selesai.append(ditulis)
+            jendela.jalankan_export(os.path.join(folder, "ekspor_gui.csv"))
+            while not selesai:
+                root.update()
+            jendela.win.destroy()
+        hasil["export_window_csv"] = ukur(export_window, ulang)
+    finally:
+        if dashboard is not None:
+            dashboard.pekerja.hentikan()
+        root.destroy()
+    return hasil
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Dompet Pintar dengan data sintetis")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="jumlah baris transaksi yang dibuat (default: 10000 100000 1000000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ulang", type=int, default=5, help="pengulangan per operasi")
+    parser.add_argument("--output", default="bench_hasil.json", help="file JSON hasil benchmark")
+    parser.add_argument("--tanpa-gui", action="store_true", help="lewati benchmark Tkinter")
+    args = parser.parse_args(argv)
+
+    laporan = {
+        "meta": {
+            "waktu": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "hasil": [],
+    }
+
+    for ukuran in args.ukuran:
+        with tempfile.TemporaryDirectory() as folder:
+            print(f"== {ukuran:,} baris ==")
+            db_file = os.path.join(folder, "dompet_pintar.db")
+            with DatabaseManager(db_file) as db:
+                mulai = time.perf_counter()
+                user = buat_data_sintetis(db, ukuran, args.seed)
+                jumlah_user = db.cursor.execute(
+                    "SELECT COUNT(*) FROM transaksi WHERE username = ?", (user,)).fetchone()[0]
+                print(f"  data dibuat dalam {time.perf_counter() - mulai:.1f} detik "
+                      f"(user terberat: {user}, {jumlah_user:,} baris)")
+                operasi = bench_headless(db, user, folder, args.ulang)
+            if not args.tanpa_gui:
+                operasi.update(bench_gui(db_file, user, folder, args.ulang) or {})
+            PoolKoneksi.tutup_semua()
+
+        for nama, statistik in operasi.items():
+            print(f"  {nama:<32}{statistik['median_ms']:>12.2f} ms")
+            laporan["hasil"].append({"ukuran": ukuran, "baris_user": jumlah_user, "operasi": nama, **statistik})
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(laporan, file, indent=2, ensure_ascii=False)
+    print(f"Hasil tersimpan di {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
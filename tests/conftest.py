@@ -0,0 +1,19 @@
+"""Fixture bersama: database sementara dengan skema lengkap (semua migrasi)."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wallet_core import DatabaseManager, PoolKoneksi  # noqa: E402
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "dompet_pintar.db")
+
+@pytest.fixture
+def db(db_file):
+    with DatabaseManager(db_file) as db:
+        yield db
+    PoolKoneksi.tutup_semua()
@@ -0,0 +1,24 @@
+"""Anggaran bulanan: batas per kategori dan pemakaian dari rekap_bulanan."""
+import pytest
+
+from wallet_core import ke_sen
+
+def test_pemakaian_dari_rekap(db):
+    db.simpan_anggaran("budi", "🍔 Makanan", ke_sen(100_000))
+    db.tambah_banyak("budi", [
+        ("Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000), "2025-03-01 08:00:00"),
+        ("Pengeluaran", "🍔 Makanan", "Roti", ke_sen(15_000), "2025-03-02 08:00:00"),
+        ("Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000), "2025-04-01 08:00:00"),
+    ])
+    assert db.ambil_anggaran("budi", "2025-03") == {"🍔 Makanan": (ke_sen(100_000), ke_sen(40_000))}
+    assert db.ambil_anggaran("budi", "2025-05") == {"🍔 Makanan": (ke_sen(100_000), 0)}
+
+def test_batas_nol_menghapus(db):
+    db.simpan_anggaran("budi", "🍔 Makanan", ke_sen(100_000))
+    db.simpan_anggaran("budi", "🍔 Makanan", 0)
+    assert db.ambil_anggaran("budi", "2025-03") == {}
+
+def test_batas_negatif_ditolak(db):
+    with pytest.raises(ValueError):
+        db.simpan_anggaran("budi", "🍔 Makanan", ke_sen(-5))
+    assert db.ambil_anggaran("budi", "2025-03") == {}
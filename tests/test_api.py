@@ -0,0 +1,101 @@
+"""API JSON lokal: endpoint, token, dan penutupan koneksi pembaca/penulis."""
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from wallet_api import ServerAPI
+from wallet_core import DatabaseManager, PoolKoneksi
+from wallet_shard import buka_database, nama_file_shard, pecah_database
+
+@pytest.fixture(params=[False, True], ids=["tunggal", "shard"])
+def server(request, db_file):
+    with DatabaseManager(db_file) as db:
+        db.registrasi_user("budi", "rahasia")
+    PoolKoneksi.tutup_semua()
+    if request.param:
+        pecah_database(db_file, "shard")
+    server = ServerAPI(("127.0.0.1", 0), db_file, jumlah_pembaca=2, token="abc")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+def panggil(server, metode, path, isi=None, token="abc"):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        conn.request(metode, path, body=json.dumps(isi) if isi is not None else None,
+                     headers={"X-Token": token} if token else {})
+        respons = conn.getresponse()
+        return respons.status, json.loads(respons.read())
+    finally:
+        conn.close()
+
+def test_alur_tambah_riwayat_hapus(server):
+    assert panggil(server, "POST", "/login", {"user": "budi", "password": "rahasia"}) == (200, {"ok": True})
+    status, hasil = panggil(server, "POST", "/transactions", {
+        "user": "budi", "jenis": "Pengeluaran", "kategori": "🍔 Makanan", "deskripsi": "Kopi", "nominal_sen": 2_500_000})
+    assert status == 200
+    id_baru = hasil["transaksi"]["id"]
+    # Tulisan penulis langsung terlihat oleh pembaca
+    assert panggil(server, "GET", "/balance?user=budi")[1]["total_keluar_sen"] == 2_500_000
+    status, halaman = panggil(server, "GET", "/history?user=budi&limit=1")
+    assert [t["id"] for t in halaman["transaksi"]] == [id_baru]
+    assert panggil(server, "POST", "/transactions/delete", {"user": "budi", "ids": [id_baru]})[1]["dihapus"] == 1
+    assert panggil(server, "GET", "/balance?user=budi")[1]["saldo_sen"] == 0
+
+def test_validasi_dan_token(server):
+    assert panggil(server, "GET", "/balance?user=budi", token=None)[0] == 401
+    assert panggil(server, "GET", "/balance?user=budi", token="abd")[0] == 401
+    assert panggil(server, "GET", "/balance")[0] == 400
+    assert panggil(server, "POST", "/transactions", {"user": "budi", "jenis": "Pengeluaran", "kategori": "x",
+                                                     "nominal_sen": True})[0] == 400
+    assert panggil(server, "GET", "/tidak-ada")[0] == 404
+
+def test_klien_lebih_banyak_dari_pembaca(server):
+    # Koneksi keep-alive yang diam tidak boleh menahan pembaca (pool hanya 2 thread)
+    diam = [http.client.HTTPConnection(*server.server_address, timeout=10) for _ in range(4)]
+    for conn in diam:
+        conn.request("GET", "/balance?user=budi", headers={"X-Token": "abc"})
+        conn.getresponse().read()
+    try:
+        assert panggil(server, "GET", "/balance?user=budi")[0] == 200
+    finally:
+        for conn in diam:
+            conn.close()
+
+def test_pembaca_read_only_dan_ditutup(server):
+    panggil(server, "GET", "/balance?user=budi")
+    pembaca = list(server._pembaca)
+    assert pembaca and all(db.baca_saja for db in pembaca)
+    with pytest.raises(sqlite3.OperationalError):
+        pembaca[0].conn.execute("DELETE FROM users")
+    conn = pembaca[0].conn
+    server.shutdown()
+    server.server_close()
+    # Mode shard: koneksi milik file direktori di dalam DatabaseShard
+    assert server._pembaca == [] and getattr(pembaca[0], "direktori", pembaca[0]).conn is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+def test_user_didaftarkan_selagi_server_jalan(server):
+    kosong = {"user": "wati", "saldo_sen": 0, "total_masuk_sen": 0, "total_keluar_sen": 0}
+    assert panggil(server, "GET", "/balance?user=wati") == (200, kosong)
+    with buka_database(server.db_file) as db:
+        assert db.registrasi_user("wati", "rahasia")
+        # Didaftarkan versi lama: tercatat di direktori_shard, tetapi file shard belum dibuat
+        db.cursor.execute("INSERT INTO users VALUES ('tono', 'rahasia')")
+        db.cursor.execute("INSERT INTO direktori_shard VALUES ('tono', ?)", (nama_file_shard("tono"),))
+        db.conn.commit()
+    PoolKoneksi.tutup_semua()
+    for user in ("wati", "tono"):
+        assert panggil(server, "GET", f"/balance?user={user}") == (200, {**kosong, "user": user})
+        assert panggil(server, "GET", f"/history?user={user}") == (200, {"transaksi": [], "berikutnya": None})
+    for user in ("wati", "tono"):
+        assert panggil(server, "POST", "/transactions", {
+            "user": user, "jenis": "Pemasukan", "kategori": "💰 Gaji", "nominal_sen": 100})[0] == 200
+        assert panggil(server, "GET", f"/balance?user={user}")[1]["saldo_sen"] == 100
@@ -0,0 +1,33 @@
+"""Pemulihan jurnal input cepat: entri kembar di jurnal tidak boleh hilang, yang sudah tersimpan tidak boleh ganda."""
+from wallet_core import BufferTulis, file_jurnal, ke_sen
+
+KOPI = ("Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000), "2025-03-01 08:00:00")
+ROTI = ("Pengeluaran", "🍔 Makanan", "Roti", ke_sen(15_000), "2025-03-01 08:00:00")
+
+def jurnal_sisa(db, *entri):
+    """Jurnal seperti yang tertinggal saat aplikasi mati, dipindahkan ke file .pulih seperti di Dashboard."""
+    buffer = BufferTulis("budi", file_jurnal(db.db_file, "budi"))
+    for i, e in enumerate(entri):
+        buffer.tambah(i, *e)
+    return BufferTulis("budi", buffer.file_jurnal).pindahkan_jurnal_lama()
+
+def jumlah(db, deskripsi):
+    return db.cursor.execute("SELECT COUNT(*) FROM transaksi WHERE deskripsi = ?", (deskripsi,)).fetchone()[0]
+
+def test_entri_kembar_di_jurnal_semuanya_disimpan(db):
+    assert db.pulihkan_jurnal("budi", jurnal_sisa(db, KOPI, KOPI, ROTI)) == 3
+    assert jumlah(db, "Kopi") == 2
+    assert db.ambil_ringkasan("budi")[2] == 2 * ke_sen(25_000) + ke_sen(15_000)
+
+def test_entri_yang_sudah_tercommit_dilewati(db):
+    # Batch sudah ter-commit, tetapi aplikasi mati sebelum jurnal ditulis ulang
+    db.tambah_banyak("budi", [KOPI, KOPI])
+    assert db.pulihkan_jurnal("budi", jurnal_sisa(db, KOPI, KOPI, KOPI, ROTI)) == 2
+    assert jumlah(db, "Kopi") == 3
+    assert jumlah(db, "Roti") == 1
+
+def test_baris_jurnal_terpotong_dilewati(db):
+    file_pulih = jurnal_sisa(db, KOPI)
+    with open(file_pulih, "a", encoding="utf-8") as file:
+        file.write('["Pengeluaran", "🍔 Mak')
+    assert db.pulihkan_jurnal("budi", file_pulih) == 1
@@ -0,0 +1,65 @@
+"""Log perubahan (trigger) dan export inkremental per checkpoint."""
+import csv
+
+import pytest
+
+from wallet_core import ke_sen
+
+def ekspor(db, tmp_path, nama="gudang"):
+    file_path = str(tmp_path / f"{nama}.csv")
+    hasil = db.ekspor_perubahan(file_path, nama)
+    with open(file_path, newline="", encoding="utf-8") as file:
+        baris = list(csv.reader(file))[1:]
+    return hasil, {int(b[3]): (b[2], b[9]) for b in baris}
+
+def jumlah_log(db):
+    return db.cursor.execute("SELECT COUNT(*) FROM log_perubahan").fetchone()[0]
+
+def test_tanpa_checkpoint_tidak_mencatat(db):
+    db.tambah_data("budi", "Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000))
+    assert jumlah_log(db) == 0
+
+def test_export_penuh_lalu_delta(db, tmp_path):
+    a = db.tambah_data("budi", "Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000))
+    b = db.tambah_data("budi", "Pengeluaran", "🚗 Transport", "KRL", ke_sen(8_000))
+    hasil, isi = ekspor(db, tmp_path)
+    assert hasil["penuh"] and isi == {a[0]: ("simpan", "25000"), b[0]: ("simpan", "8000")}
+    assert jumlah_log(db) == 0
+
+    # Update, delete, dan insert yang langsung dihapus lagi sebelum export berikutnya
+    db.cursor.execute("UPDATE transaksi SET nominal = ? WHERE id = ?", (ke_sen(27_500.50), a[0]))
+    db.conn.commit()
+    db.hapus_banyak("budi", [b[0]])
+    c = db.tambah_data("budi", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(5_000_000))
+    sementara = db.tambah_data("budi", "Pengeluaran", "✨ Lainnya", "Salah input", ke_sen(1))
+    db.hapus_banyak("budi", [sementara[0]])
+    assert jumlah_log(db) == 5
+
+    hasil, isi = ekspor(db, tmp_path)
+    assert not hasil["penuh"]
+    assert isi == {a[0]: ("simpan", "27500.50"), b[0]: ("hapus", ""), c[0]: ("simpan", "5000000")}
+    assert jumlah_log(db) == 0
+
+    hasil, isi = ekspor(db, tmp_path)
+    assert hasil["baris"] == 0 and isi == {}
+
+def test_log_dipertahankan_untuk_checkpoint_tertinggal(db, tmp_path):
+    ekspor(db, tmp_path, "gudang")
+    ekspor(db, tmp_path, "audit")
+    baris = db.tambah_data("budi", "Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000))
+    ekspor(db, tmp_path, "gudang")
+    assert jumlah_log(db) == 1 # "audit" belum mengambilnya
+    _, isi = ekspor(db, tmp_path, "audit")
+    assert isi == {baris[0]: ("simpan", "25000")}
+    assert jumlah_log(db) == 0
+
+    db.hapus_checkpoint("audit")
+    db.reset_checkpoint("gudang")
+    hasil, _ = ekspor(db, tmp_path, "gudang")
+    assert hasil["penuh"]
+
+def test_checkpoint_berubah_selama_export(db):
+    db.daftarkan_checkpoint("gudang")
+    db.majukan_checkpoint("gudang", None, 0)
+    with pytest.raises(RuntimeError):
+        db.majukan_checkpoint("gudang", None, 0)
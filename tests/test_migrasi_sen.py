@@ -0,0 +1,79 @@
+"""Migrasi nominal REAL (Rupiah) -> INTEGER (sen) dari skema awal aplikasi."""
+import random
+import sqlite3
+from decimal import Decimal
+
+from wallet_core import DatabaseManager, PoolKoneksi
+
+def buat_database_lama(db_file, jumlah=996):
+    """Database dengan skema versi pertama (nominal REAL, tanpa user_version). Mengembalikan baris yang tersimpan."""
+    rng = random.Random(7)
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE users (username TEXT PRIMARY KEY, password TEXT);
+        CREATE TABLE transaksi (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, jenis TEXT,
+            kategori TEXT, deskripsi TEXT, nominal REAL, tanggal TEXT
+        );
+    """)
+    baris = []
+    for i in range(jumlah):
+        jenis = "Pemasukan" if i % 7 == 0 else "Pengeluaran"
+        nominal = round(rng.uniform(0, 2_000_000), 2) if i % 3 else float(rng.randrange(1, 500) * 1000)
+        baris.append((f"user{i % 5}", jenis, "✨ Lainnya", f"Baris {i}", nominal,
+                      f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 08:00:00"))
+    conn.executemany("""
+        INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal) VALUES (?, ?, ?, ?, ?, ?)
+    """, baris)
+    # Baris terakhir dihapus: AUTOINCREMENT tidak boleh memakai ulang ID-nya setelah migrasi
+    conn.execute("DELETE FROM transaksi WHERE id = ?", (jumlah,))
+    conn.commit()
+    conn.close()
+    return baris[:-1]
+
+def total_sen(baris, username):
+    """Total (masuk, keluar) dalam sen dihitung tepat dengan Decimal dari nilai REAL aslinya."""
+    masuk = keluar = 0
+    for user, jenis, _, _, nominal, _ in baris:
+        if user == username:
+            sen = int((Decimal(repr(nominal)) * 100).to_integral_value())
+            if jenis == "Pemasukan":
+                masuk += sen
+            else:
+                keluar += sen
+    return masuk, keluar
+
+def cek_hasil_migrasi(db_file, baris_lama):
+    with DatabaseManager(db_file) as db:
+        kolom = {b[1]: b[2] for b in db.cursor.execute("PRAGMA table_info(transaksi)").fetchall()}
+        assert kolom["nominal"].upper() == "INTEGER"
+        assert db.cursor.execute("SELECT COUNT(*) FROM transaksi WHERE typeof(nominal) != 'integer'").fetchone()[0] == 0
+        assert db.cursor.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0] == len(baris_lama)
+        for username in {b[0] for b in baris_lama}:
+            saldo, masuk, keluar = db.ambil_ringkasan(username)
+            assert (masuk, keluar) == total_sen(baris_lama, username)
+            assert saldo == masuk - keluar
+        baru = db.tambah_data("user0", "Pengeluaran", "✨ Lainnya", "Setelah migrasi", 100)
+        assert baru[0] == len(baris_lama) + 2
+        assert db.cursor.execute("SELECT name FROM sqlite_master WHERE name = 'transaksi_sen'").fetchone() is None
+    PoolKoneksi.tutup_semua()
+
+def test_migrasi_database_lama(db_file):
+    baris_lama = buat_database_lama(db_file)
+    cek_hasil_migrasi(db_file, baris_lama)
+
+def test_migrasi_terputus_dilanjutkan(db_file):
+    baris_lama = buat_database_lama(db_file)
+    # Keadaan setelah proses mati di tengah penyalinan: sebagian chunk sudah ter-commit ke transaksi_sen
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE transaksi_sen (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, jenis TEXT,
+            kategori TEXT, deskripsi TEXT, nominal INTEGER NOT NULL, tanggal TEXT
+        );
+        INSERT INTO transaksi_sen SELECT id, username, jenis, kategori, deskripsi,
+            CAST(ROUND(nominal * 100) AS INTEGER), tanggal FROM transaksi WHERE id <= 400;
+        PRAGMA user_version = 2;
+    """)
+    conn.close()
+    cek_hasil_migrasi(db_file, baris_lama)
@@ -0,0 +1,45 @@
+"""Index full-text (trigger) dan filter cari_transaksi harus mengikuti isi tabel transaksi."""
+import pytest
+
+from wallet_core import ke_sen
+
+@pytest.fixture
+def data(db):
+    return db.tambah_banyak("budi", [
+        ("Pengeluaran", "🍔 Makanan", "Makan siang warteg", ke_sen(20_000), "2025-01-05 12:00:00"),
+        ("Pengeluaran", "🍔 Makanan", "Kopi susu", ke_sen(25_000), "2025-01-06 08:00:00"),
+        ("Pengeluaran", "🚗 Transport", "Ojol ke kampus", ke_sen(15_000), "2025-02-01 07:00:00"),
+        ("Pemasukan", "💰 Gaji", "Gaji bulanan", ke_sen(5_000_000), "2025-02-25 09:00:00"),
+    ])
+
+def id_hasil(db, *args, **kwargs):
+    return [baris[0] for baris in db.cari_transaksi("budi", *args, **kwargs)]
+
+def test_teks_prefix_dan_per_user(db, data):
+    db.tambah_data("sari", "Pengeluaran", "🍔 Makanan", "Makan malam", ke_sen(40_000))
+    assert id_hasil(db, "makan") == [data[0][0]]
+    assert id_hasil(db, "mak sia") == [data[0][0]]
+    assert id_hasil(db, "tidakada") == []
+
+def test_trigger_update_dan_delete(db, data):
+    db.cursor.execute("UPDATE transaksi SET deskripsi = 'Es teh manis' WHERE id = ?", (data[1][0],))
+    db.conn.commit()
+    assert id_hasil(db, "kopi") == []
+    assert id_hasil(db, "teh") == [data[1][0]]
+
+    db.hapus_banyak("budi", [data[0][0]])
+    assert id_hasil(db, "makan") == []
+    if db.fts_tersedia(): # Index FTS tetap konsisten dengan tabel transaksi
+        db.cursor.execute("INSERT INTO transaksi_fts (transaksi_fts, rank) VALUES ('integrity-check', 1)")
+
+def test_filter(db, data):
+    assert id_hasil(db, kategori="🍔 Makanan") == [data[1][0], data[0][0]]
+    assert id_hasil(db, jenis="Pemasukan") == [data[3][0]]
+    assert id_hasil(db, dari="2025-02-01", sampai="2025-02-01") == [data[2][0]]
+    assert id_hasil(db, nominal_min=ke_sen(20_000), nominal_max=ke_sen(25_000)) == [data[1][0], data[0][0]]
+    assert id_hasil(db, "kopi", kategori="🚗 Transport") == []
+
+def test_halaman_keyset(db, data):
+    pertama = db.cari_transaksi("budi", batas=2)
+    kedua = db.cari_transaksi("budi", setelah=(pertama[-1][6], pertama[-1][0]), batas=2)
+    assert [b[0] for b in pertama + kedua] == [b[0] for b in reversed(data)]
@@ -0,0 +1,32 @@
+"""Query utama harus memakai index / primary key, tidak pernah full scan tabel transaksi."""
+import pytest
+
+from wallet_core import ke_sen
+
+def isi_data(db):
+    transaksi = []
+    for i in range(2000):
+        jenis, kategori = ("Pemasukan", "💰 Gaji") if i % 10 == 0 else ("Pengeluaran", "🍔 Makanan")
+        transaksi.append((jenis, kategori, f"Makan siang {i}", ke_sen(1000 + i),
+                          f"202{3 + i % 3}-{1 + i % 12:02d}-{1 + i % 28:02d} 12:00:00"))
+    for username in ("user", "lain"):
+        db.tambah_banyak(username, transaksi)
+    db.simpan_anggaran("user", "🍔 Makanan", ke_sen(500_000))
+    db.cursor.execute("ANALYZE")
+    db.conn.commit()
+
+@pytest.mark.parametrize("dengan_data", [False, True], ids=["kosong", "analyze"])
+def test_query_utama_memakai_index(db, dengan_data):
+    if dengan_data:
+        isi_data(db)
+    hasil = db.cek_rencana_query()
+    assert hasil
+    for nama, detail, pakai_index in hasil:
+        langkah = detail.split(" | ")
+        for baris in langkah:
+            # SCAN hanya boleh pada tabel virtual FTS (lookup ke index full-text)
+            if baris.startswith("SCAN"):
+                assert "VIRTUAL TABLE" in baris, f"{nama}: {detail}"
+        assert any(baris.startswith("SEARCH") and ("USING INDEX" in baris or "PRIMARY KEY" in baris)
+                   for baris in langkah), f"{nama}: {detail}"
+        assert pakai_index, f"{nama}: {detail}"
@@ -0,0 +1,42 @@
+"""Tabel rekap_bulanan yang dijaga trigger harus sama dengan GROUP BY atas transaksi mentah."""
+from wallet_core import ke_sen
+
+def rekap_mentah(db):
+    return db.cursor.execute("""
+        SELECT username, substr(tanggal, 1, 7), jenis, kategori, SUM(nominal), COUNT(*)
+        FROM transaksi GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+    """).fetchall()
+
+def rekap_trigger(db):
+    return db.cursor.execute("""
+        SELECT username, bulan, jenis, kategori, total, jumlah FROM rekap_bulanan ORDER BY 1, 2, 3, 4
+    """).fetchall()
+
+def test_insert_delete_update(db):
+    baris = db.tambah_banyak("budi", [
+        ("Pemasukan", "💰 Gaji", "Gaji", ke_sen(5_000_000), "2024-12-25 09:00:00"),
+        ("Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000), "2025-01-03 08:00:00"),
+        ("Pengeluaran", "🍔 Makanan", "Nasi goreng", ke_sen(30_000), "2025-01-20 19:00:00"),
+        ("Pengeluaran", "🚗 Transport", "KRL", ke_sen(8_000), "2025-02-01 07:00:00"),
+    ])
+    assert rekap_trigger(db) == rekap_mentah(db)
+    assert sorted(db.ambil_data_tahunan("budi", 2025)) == [
+        ("01", "Pengeluaran", ke_sen(55_000)), ("02", "Pengeluaran", ke_sen(8_000))]
+
+    # Pindah bulan dan kategori lewat UPDATE
+    db.cursor.execute("UPDATE transaksi SET tanggal = '2025-02-10 12:00:00', kategori = '🛍️ Belanja' WHERE id = ?",
+                      (baris[1][0],))
+    db.conn.commit()
+    assert rekap_trigger(db) == rekap_mentah(db)
+
+    # Baris rekap yang jumlahnya menjadi 0 dihapus, jadi daftar tahun ikut berubah
+    db.hapus_banyak("budi", [baris[0][0]])
+    assert rekap_trigger(db) == rekap_mentah(db)
+    assert db.ambil_daftar_tahun("budi") == [2025]
+
+def test_bangun_ulang_sama_dengan_trigger(db):
+    db.tambah_banyak("budi", [("Pengeluaran", "🍔 Makanan", f"Item {i}", ke_sen(1000 + i),
+                               f"2025-{1 + i % 12:02d}-15 10:00:00") for i in range(120)])
+    sebelum = rekap_trigger(db)
+    db.bangun_ulang_rekap_bulanan()
+    assert rekap_trigger(db) == sebelum == rekap_mentah(db)
@@ -0,0 +1,45 @@
+"""Tabel ringkasan_user yang dijaga trigger harus selalu sama dengan hitungan dari transaksi mentah."""
+from wallet_core import ke_sen
+
+def ringkasan_mentah(db):
+    return db.cursor.execute("""
+        SELECT username,
+               SUM(CASE WHEN jenis = 'Pemasukan' THEN nominal ELSE 0 END),
+               SUM(CASE WHEN jenis = 'Pemasukan' THEN 0 ELSE nominal END),
+               COUNT(*)
+        FROM transaksi GROUP BY username ORDER BY username
+    """).fetchall()
+
+def ringkasan_trigger(db):
+    return db.cursor.execute("""
+        SELECT username, total_masuk, total_keluar, jumlah_transaksi
+        FROM ringkasan_user WHERE jumlah_transaksi > 0 ORDER BY username
+    """).fetchall()
+
+def test_insert_dan_delete(db):
+    db.tambah_data("budi", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(5_000_000))
+    kopi = db.tambah_data("budi", "Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(25_000.50))
+    db.tambah_data("sari", "Pengeluaran", "🚗 Transport", "KRL", ke_sen(8_000))
+    assert db.ambil_ringkasan("budi") == (ke_sen(4_974_999.50), ke_sen(5_000_000), ke_sen(25_000.50))
+    assert ringkasan_trigger(db) == ringkasan_mentah(db)
+
+    db.hapus_banyak("budi", [kopi[0]])
+    assert db.ambil_ringkasan("budi") == (ke_sen(5_000_000), ke_sen(5_000_000), 0)
+    assert ringkasan_trigger(db) == ringkasan_mentah(db)
+
+def test_update_jenis_nominal_username(db):
+    baris = db.tambah_data("budi", "Pengeluaran", "🍔 Makanan", "Kopi", ke_sen(20_000))
+    db.cursor.execute("UPDATE transaksi SET jenis = 'Pemasukan', nominal = ? WHERE id = ?", (ke_sen(30_000), baris[0]))
+    assert db.ambil_ringkasan("budi") == (ke_sen(30_000), ke_sen(30_000), 0)
+    db.cursor.execute("UPDATE transaksi SET username = 'sari' WHERE id = ?", (baris[0],))
+    db.conn.commit()
+    assert db.ambil_ringkasan("budi") == (0, 0, 0)
+    assert db.ambil_ringkasan("sari") == (ke_sen(30_000), ke_sen(30_000), 0)
+    assert ringkasan_trigger(db) == ringkasan_mentah(db)
+
+def test_bangun_ulang_sama_dengan_trigger(db):
+    db.tambah_banyak("budi", [("Pengeluaran", "🍔 Makanan", f"Item {i}", ke_sen(1000 + i), "2025-01-01 10:00:00")
+                              for i in range(100)])
+    sebelum = ringkasan_trigger(db)
+    db.bangun_ulang_ringkasan()
+    assert ringkasan_trigger(db) == sebelum == ringkasan_mentah(db)
@@ -0,0 +1,25 @@
+"""Transaksi rutin: validasi aturan dan catch-up yang tidak pernah ganda."""
+import pytest
+
+from wallet_core import ke_sen
+
+def test_catch_up_sekali_saja(db):
+    db.tambah_rutin("budi", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(5_000_000), "bulan",
+                    mulai="2025-01-31", selesai="2025-06-30")
+    assert db.jalankan_rutin("budi", sampai="2025-12-31 23:59:59") == {"budi": 6}
+    assert db.jalankan_rutin("budi", sampai="2025-12-31 23:59:59") == {}
+    tanggal = [b[0] for b in db.cursor.execute("SELECT substr(tanggal, 1, 10) FROM transaksi ORDER BY tanggal")]
+    # Tanggal 31 dipotong ke akhir bulan yang lebih pendek
+    assert tanggal[:3] == ["2025-01-31", "2025-02-28", "2025-03-31"]
+    assert db.ambil_ringkasan("budi") == (6 * ke_sen(5_000_000), 6 * ke_sen(5_000_000), 0)
+
+@pytest.mark.parametrize("argumen", [
+    {"jenis": "Tabungan"},
+    {"satuan": "tahun"},
+    {"setiap": 0},
+])
+def test_aturan_tidak_valid_ditolak(db, argumen):
+    aturan = {"jenis": "Pengeluaran", "satuan": "hari", "setiap": 1, **argumen}
+    with pytest.raises(ValueError):
+        db.tambah_rutin("budi", aturan["jenis"], "🚗 Transport", "KRL", ke_sen(8_000), aturan["satuan"], aturan["setiap"])
+    assert db.ambil_rutin("budi") == []
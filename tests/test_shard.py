@@ -0,0 +1,156 @@
+"""Mode shard: pemecahan database, routing per user, dan method yang dilarang."""
+import csv
+import os
+
+import pytest
+
+import wallet_backup
+from wallet_core import DatabaseManager, PoolKoneksi, ke_sen
+from wallet_shard import DatabaseShard, buka_database, nama_file_shard, pecah_database
+
+@pytest.fixture
+def db_monolitik(db_file):
+    with DatabaseManager(db_file) as db:
+        for username, jumlah in (("budi", 3), ("sari", 2), ("tono", 0)):
+            db.registrasi_user(username, "rahasia")
+            for i in range(jumlah):
+                db.tambah_data(username, "Pengeluaran", "🍔 Makanan", f"Makan {i}", ke_sen(10_000 * (i + 1)))
+    PoolKoneksi.tutup_semua()
+    return db_file
+
+def jumlah_transaksi(path, username=None):
+    with DatabaseManager(path) as db:
+        if username is None:
+            return db.cursor.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+        return db.cursor.execute("SELECT COUNT(*) FROM transaksi WHERE username=?", (username,)).fetchone()[0]
+
+@pytest.mark.parametrize("jumlah_bucket", [0, 2])
+def test_pecah_memindahkan_semua_transaksi(db_monolitik, jumlah_bucket):
+    hasil = pecah_database(db_monolitik, "shard", jumlah_bucket)
+    assert (hasil["user"], hasil["transaksi"]) == (3, 5)
+    assert hasil["file"] == len({nama_file_shard(u, jumlah_bucket) for u in ("budi", "sari", "tono")})
+    assert jumlah_transaksi(db_monolitik) == 0
+    folder = os.path.join(os.path.dirname(db_monolitik), "shard")
+    assert jumlah_transaksi(os.path.join(folder, nama_file_shard("budi", jumlah_bucket)), "budi") == 3
+    assert jumlah_transaksi(os.path.join(folder, nama_file_shard("sari", jumlah_bucket)), "sari") == 2
+    PoolKoneksi.tutup_semua()
+
+def test_pecah_ulang_tidak_menggandakan(db_monolitik):
+    pecah_database(db_monolitik, "shard")
+    ulang = pecah_database(db_monolitik, "shard")
+    assert (ulang["user"], ulang["transaksi"]) == (3, 0)
+    with pytest.raises(ValueError):
+        pecah_database(db_monolitik, "shard", jumlah_bucket=4)
+    with buka_database(db_monolitik) as db:
+        assert db.ambil_ringkasan("budi") == (-ke_sen(60_000), 0, ke_sen(60_000))
+        assert len(db.ambil_semua_data("budi")) == 3
+    PoolKoneksi.tutup_semua()
+
+def test_tabel_pendamping_ikut_terisi_di_shard(db_monolitik):
+    pecah_database(db_monolitik, "shard")
+    with buka_database(db_monolitik) as db:
+        # Ringkasan, rekap bulanan, dan FTS dibangun trigger saat baris disalin ke shard
+        assert db.ambil_ringkasan("sari") == (-ke_sen(30_000), 0, ke_sen(30_000))
+        tahun = int(db.ambil_semua_data("sari")[0][6][:4])
+        assert sum(total for _, _, total in db.ambil_data_tahunan("sari", tahun)) == ke_sen(30_000)
+        assert len(db.cari_transaksi("sari", "makan")) == 2
+    PoolKoneksi.tutup_semua()
+
+def test_anggaran_ikut_dipindah(db_monolitik):
+    with DatabaseManager(db_monolitik) as db:
+        db.simpan_anggaran("budi", "🍔 Makanan", ke_sen(500_000))
+        db.simpan_anggaran("sari", "🚗 Transport", ke_sen(200_000))
+    PoolKoneksi.tutup_semua()
+    pecah_database(db_monolitik, "shard")
+    pecah_database(db_monolitik, "shard")
+    with buka_database(db_monolitik) as db:
+        bulan = db.ambil_semua_data("budi")[0][6][:7]
+        assert db.ambil_anggaran("budi", bulan) == {"🍔 Makanan": (ke_sen(500_000), ke_sen(60_000))}
+        assert db.ambil_anggaran("sari", bulan) == {"🚗 Transport": (ke_sen(200_000), 0)}
+        assert db.direktori.cursor.execute("SELECT COUNT(*) FROM anggaran").fetchone()[0] == 0
+    PoolKoneksi.tutup_semua()
+
+def test_aturan_rutin_ikut_dipindah_tanpa_kejadian_ganda(db_monolitik):
+    with DatabaseManager(db_monolitik) as db:
+        id_rutin = db.tambah_rutin("sari", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(5_000_000), "bulan",
+                                   mulai="2025-01-25", selesai="2025-12-31")
+        assert db.jalankan_rutin("sari", sampai="2025-03-31 23:59:59") == {"sari": 3}
+        aturan = db.ambil_rutin("sari")
+    PoolKoneksi.tutup_semua()
+    pecah_database(db_monolitik, "shard", jumlah_bucket=2)
+    pecah_database(db_monolitik, "shard", jumlah_bucket=2)
+    with buka_database(db_monolitik) as db:
+        assert db.ambil_rutin("sari") == aturan and aturan[0][0] == id_rutin
+        assert db.direktori.cursor.execute("SELECT COUNT(*) FROM transaksi_rutin").fetchone()[0] == 0
+        # Kolom terakhir ikut tersalin: catch-up hanya membuat kejadian April-Juni
+        assert db.jalankan_rutin("sari", sampai="2025-06-30 23:59:59") == {"sari": 3}
+        assert db.jalankan_rutin(sampai="2025-06-30 23:59:59") == {}
+        assert db.ambil_ringkasan("sari")[1] == 6 * ke_sen(5_000_000)
+        assert db.hapus_rutin("sari", id_rutin) and db.ambil_rutin("sari") == []
+    PoolKoneksi.tutup_semua()
+
+def test_routing_termasuk_user_baru(db_monolitik):
+    pecah_database(db_monolitik, "shard")
+    with buka_database(db_monolitik) as db:
+        assert isinstance(db, DatabaseShard)
+        assert db.registrasi_user("wati", "rahasia")
+        assert not db.registrasi_user("wati", "lain")
+        db.tambah_data("wati", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(1_000_000))
+        assert db.file_shard("wati").endswith(nama_file_shard("wati"))
+        assert db.untuk_user("wati") is not db.direktori
+        assert db.ambil_ringkasan("wati") == (ke_sen(1_000_000), ke_sen(1_000_000), 0)
+        assert db.ambil_ringkasan("budi")[2] == ke_sen(60_000)
+    assert jumlah_transaksi(db_monolitik) == 0
+    assert jumlah_transaksi(os.path.join(os.path.dirname(db_monolitik), "shard", nama_file_shard("wati")), "wati") == 1
+    PoolKoneksi.tutup_semua()
+
+def test_hapus_data_per_id_ditolak(db_monolitik):
+    pecah_database(db_monolitik, "shard")
+    with buka_database(db_monolitik) as db:
+        id_budi = db.ambil_semua_data("budi")[0][0]
+        with pytest.raises(RuntimeError):
+            db.hapus_data(id_budi)
+        assert len(db.ambil_semua_data("budi")) == 3
+    PoolKoneksi.tutup_semua()
+
+def test_backup_dan_restore_menolak_mode_shard(db_monolitik, tmp_path):
+    # Backup yang dibuat sebelum dipecah tetap utuh, tetapi tidak boleh menimpa direktori shard
+    backup = wallet_backup.buat_backup(db_monolitik, str(tmp_path / "backup"), kompres=False)
+    pecah_database(db_monolitik, "shard")
+    with pytest.raises(ValueError, match="mode shard"):
+        wallet_backup.buat_backup(db_monolitik, str(tmp_path / "backup"))
+    with pytest.raises(ValueError, match="mode shard"):
+        wallet_backup.pulihkan_backup(backup["file"], db_monolitik)
+    assert wallet_backup.daftar_backup(str(tmp_path / "backup")) == [backup["file"]]
+    assert not os.path.exists(db_monolitik + ".sebelum-pulih")
+    with buka_database(db_monolitik) as db:
+        assert isinstance(db, DatabaseShard)
+        assert len(db.ambil_semua_data("budi")) == 3
+    PoolKoneksi.tutup_semua()
+
+def test_ekspor_perubahan_dengan_sumber_per_file(db_monolitik, tmp_path):
+    pecah_database(db_monolitik, "shard")
+    file_csv = str(tmp_path / "perubahan.csv")
+    with buka_database(db_monolitik) as db:
+        db.registrasi_user("wati", "rahasia")
+        # File shard baru: ID mulai lagi dari 1, sama dengan ID transaksi budi
+        baris_wati = db.tambah_data("wati", "Pemasukan", "💰 Gaji", "Gaji", ke_sen(1_000_000))
+        hasil = db.ekspor_perubahan(file_csv)
+        with open(file_csv, newline="", encoding="utf-8") as file:
+            isi = list(csv.DictReader(file))
+        assert hasil["penuh"] and hasil["baris"] == len(isi) == 6
+        kunci = {(b["Sumber"], int(b["ID"])) for b in isi}
+        assert len(kunci) == 6 and len({id_ for _, id_ in kunci}) < 6
+        assert (nama_file_shard("wati"), baris_wati[0]) in kunci
+        assert {f["sumber"] for f in hasil["per_file"]} == {
+            "dompet_pintar.db", *(nama_file_shard(u) for u in ("budi", "sari", "tono", "wati"))}
+
+        db.hapus_banyak("wati", [baris_wati[0]])
+        hasil = db.ekspor_perubahan(file_csv)
+        with open(file_csv, newline="", encoding="utf-8") as file:
+            isi = list(csv.DictReader(file))
+        assert [(b["Sumber"], b["Aksi"], int(b["ID"])) for b in isi] == [(nama_file_shard("wati"), "hapus", baris_wati[0])]
+        per_file = {f["sumber"]: f for f in hasil["per_file"]}
+        assert not hasil["penuh"] and per_file[nama_file_shard("wati")]["baris"] == 1
+        assert per_file[nama_file_shard("budi")]["seq_lama"] == per_file[nama_file_shard("budi")]["seq_baru"]
+    PoolKoneksi.tutup_semua()
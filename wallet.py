@@ -1,10 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import sqlite3
 import csv
-from abc import ABC, abstractmethod
 from datetime import datetime
 import calendar
+import itertools
+import logging
+import os
+import queue
+import threading
+
+import wallet_analitik
+import wallet_backup
+from wallet_core import (
+    DAFTAR_KATEGORI, PERSEN_PERINGATAN_ANGGARAN, SATUAN_RUTIN, SEN_PER_RUPIAH, BufferTulis, PoolKoneksi, Pemasukan, Pengeluaran,
+    aktifkan_dari_env, baca_csv_transaksi, file_jurnal, format_rupiah, instrumentasi_aktif, ke_sen, log,
+    pantau_stall,
+)
+from wallet_shard import buka_database
 
 # =============================================================================
 # 1. KONFIGURASI GLOBAL (WARNA & FONT)
@@ -19,6 +31,7 @@ COLORS = {
     "lime": "#B0D9B1", 
     "rose": "#FF8F8F",
     "danger": "#D04848",
+    "warning": "#F4A259",
     "text": "#5C5470",
     "btn_text": "#FFFFFF"
 }
@@ -30,119 +43,7 @@ FONT_UI_S = ("Comic Sans MS", 10)
 FONT_STD = ("Segoe UI Emoji", 10)
 
 # =============================================================================
-# 2. DATABASE MANAGER
-# Menangani semua koneksi ke SQLite (Create, Read, Delete).
-# =============================================================================
-class DatabaseManager:
-    def __init__(self, db_file="dompet_pintar.db"):
-        self.conn = sqlite3.connect(db_file)
-        self.cursor = self.conn.cursor()
-        self.buat_tabel()
-
-    def buat_tabel(self):
-        """Membuat tabel users dan transaksi jika belum ada."""
-        # Tabel untuk Login
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            username TEXT PRIMARY KEY,
-            password TEXT
-        )
-        """)
-        # Tabel untuk Data Keuangan
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transaksi (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT,
-            jenis TEXT,
-            kategori TEXT,
-            deskripsi TEXT,
-            nominal REAL,
-            tanggal TEXT
-        )
-        """)
-        self.conn.commit()
-
-    def registrasi_user(self, username, password):
-        """Mendaftarkan user baru."""
-        try:
-            self.cursor.execute("INSERT INTO users VALUES (?, ?)", (username, password))
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False # Username sudah ada
-
-    def cek_login(self, username, password):
-        """Memvalidasi login user."""
-        self.cursor.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
-        return self.cursor.fetchone() is not None
-
-    def tambah_data(self, username, jenis, kategori, deskripsi, nominal):
-        """Menyimpan transaksi ke database."""
-        tanggal = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute("""
-            INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal) 
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (username, jenis, kategori, deskripsi, nominal, tanggal))
-        self.conn.commit()
-
-    def ambil_semua_data(self, username):
-        """Mengambil data milik user tertentu."""
-        self.cursor.execute("SELECT * FROM transaksi WHERE username=? ORDER BY tanggal DESC", (username,))
-        return self.cursor.fetchall()
-
-    def ambil_data_tahunan(self, username, tahun):
-        """Mengambil rekap data per bulan untuk tahun tertentu."""
-        query = """
-            SELECT strftime('%m', tanggal) as bulan, jenis, SUM(nominal) 
-            FROM transaksi 
-            WHERE strftime('%Y', tanggal) = ? AND username = ? 
-            GROUP BY bulan, jenis
-        """
-        self.cursor.execute(query, (str(tahun), username))
-        return self.cursor.fetchall()
-
-    def hapus_data(self, id_transaksi):
-        """Menghapus data berdasarkan ID."""
-        self.cursor.execute("DELETE FROM transaksi WHERE id=?", (id_transaksi,))
-        self.conn.commit()
-
-# =============================================================================
-# 3. PENERAPAN OOP (CORE LOGIC)
-# Bagian ini PENTING untuk nilai UAS: Inheritance, Encapsulation, Polymorphism.
-# =============================================================================
-
-class Transaksi(ABC):
-    """
-    [PARENT CLASS] Kelas abstrak untuk semua jenis transaksi.
-    """
-    def __init__(self, deskripsi, nominal, kategori):
-        self.deskripsi = deskripsi
-        self.kategori = kategori
-        # [ENCAPSULATION] Atribut private
-        self.__nominal = nominal 
-
-    def get_nominal(self):
-        return self.__nominal
-
-    @abstractmethod
-    def info_sukses(self):
-        """[POLYMORPHISM] Method abstrak yang akan di-override anak."""
-        pass
-
-class Pemasukan(Transaksi):
-    """[CHILD CLASS] Mewarisi Transaksi."""
-    def info_sukses(self):
-        # [POLYMORPHISM] Override pesan untuk Pemasukan
-        return f"Yey! Uang masuk Rp {self.get_nominal():,.0f} berhasil disimpan! 🤑"
-
-class Pengeluaran(Transaksi):
-    """[CHILD CLASS] Mewarisi Transaksi."""
-    def info_sukses(self):
-        # [POLYMORPHISM] Override pesan untuk Pengeluaran
-        return f"Oke, pengeluaran Rp {self.get_nominal():,.0f} tercatat. Hemat ya! 🥺"
-
-# =============================================================================
-# 4. KOMPONEN UI & UTILITIES
+# 2. KOMPONEN UI & UTILITIES
 # =============================================================================
 
 def create_washi_tape(parent):
@@ -152,8 +53,114 @@ def create_washi_tape(parent):
     pattern = "🍓  ✨  🌸  ✨  🍓  ✨  🌸  ✨  🍓  ✨  🌸  ✨  🍓"
     tk.Label(frame, text=pattern, font=("Segoe UI Emoji", 12), bg=COLORS["cream"], fg=COLORS["pink_main"]).pack(pady=2)
 
+class PekerjaDB:
+    """
+    Satu thread khusus yang memiliki koneksi database. Window tidak pernah
+    memanggil DatabaseManager langsung; permintaan dikirim lewat antrian dan
+    hasilnya dikembalikan ke callback di thread Tk lewat polling root.after,
+    jadi query yang lambat tidak membekukan UI.
+
+    Permintaan yang memakai `kunci` yang sama saling menggantikan: hanya yang
+    terbaru yang dijalankan/diteruskan, hasil permintaan lama (basi) dibuang.
+    """
+    INTERVAL_POLL_MS = 16 # ~60 fps
+
+    def __init__(self, root, db_file="dompet_pintar.db"):
+        self.root = root
+        self.db_file = db_file
+        self.permintaan = queue.Queue()
+        self.hasil = queue.Queue()
+        self.versi = {}       # kunci -> nomor permintaan terbaru
+        self.nomor = itertools.count(1)
+        self.tertunda = 0     # permintaan yang hasilnya belum diproses UI
+        self.berhenti = False
+        self.thread = threading.Thread(target=self._jalan, name="dompet-db", daemon=True)
+        self.thread.start()
+        self.root.after(self.INTERVAL_POLL_MS, self._poll)
+
+    def kirim(self, nama_method, *args, selesai=None, gagal=None, kunci=None, **kwargs):
+        """
+        Menjadwalkan db.<nama_method>(*args, **kwargs) di thread database
+        (nama_method boleh juga fungsi biasa, dipanggil sebagai fungsi(db, *args, **kwargs)).
+        selesai(hasil) / gagal(error) dipanggil di thread Tk.
+        """
+        nomor = next(self.nomor)
+        if kunci is not None:
+            self.versi[kunci] = nomor
+        self.tertunda += 1
+        self.permintaan.put((nomor, kunci, nama_method, args, kwargs, selesai, gagal))
+        return nomor
+
+    def batalkan(self, kunci):
+        """Membuang permintaan dengan kunci ini yang belum selesai (misalnya window sudah ditutup)."""
+        self.versi[kunci] = None
+
+    def basi(self, nomor, kunci):
+        return kunci is not None and self.versi.get(kunci) != nomor
+
+    @property
+    def sibuk(self):
+        return self.tertunda > 0
+
+    def hentikan(self, tunggu=2.0):
+        """Menghentikan thread setelah permintaan yang sudah antri selesai."""
+        self.berhenti = True
+        self.permintaan.put(None)
+        self.thread.join(tunggu)
+
+    def _jalan(self):
+        """Loop thread database. Koneksi dibuka (dan migrasi dijalankan) di sini, bukan di thread Tk."""
+        db = None
+        try:
+            while True:
+                tugas = self.permintaan.get()
+                if tugas is None:
+                    break
+                nomor, kunci, nama_method, args, kwargs, selesai, gagal = tugas
+                if self.basi(nomor, kunci):
+                    self.hasil.put((nomor, kunci, None, None, None)) # Dilewati, sudah ada permintaan lebih baru
+                    continue
+                try:
+                    if db is None:
+                        db = buka_database(self.db_file)
+                    if callable(nama_method):
+                        nilai = nama_method(db, *args, **kwargs)
+                    else:
+                        nilai = getattr(db, nama_method)(*args, **kwargs)
+                    self.hasil.put((nomor, kunci, selesai, nilai, None))
+                except Exception as e:
+                    log.exception("Permintaan database %s gagal", nama_method)
+                    self.hasil.put((nomor, kunci, gagal or self.tampilkan_error, None, e))
+        finally:
+            if db is not None:
+                db.tutup()
+            PoolKoneksi.tutup_semua()
+
+    def _poll(self):
+        """Meneruskan hasil dari thread database ke callback (dipanggil lewat after)."""
+        if self.berhenti: return
+        try:
+            while True:
+                nomor, kunci, callback, nilai, error = self.hasil.get_nowait()
+                self.tertunda -= 1
+                if self.basi(nomor, kunci) or callback is None:
+                    continue
+                if kunci is not None:
+                    del self.versi[kunci]
+                try:
+                    callback(error if error is not None else nilai)
+                except tk.TclError:
+                    pass # Widget tujuan sudah ditutup sebelum hasilnya datang
+        except queue.Empty:
+            pass
+        self.root.after(self.INTERVAL_POLL_MS, self._poll)
+
+    @staticmethod
+    def tampilkan_error(error):
+        messagebox.showerror("Error", f"Terjadi kesalahan database: {error}")
+
 # =============================================================================
-# 5. WINDOWS (LOGIN & REGISTER)
+# 3. WINDOWS (LOGIN & REGISTER)
 # =============================================================================
 
 class LoginWindow:
@@ -162,7 +169,7 @@ class LoginWindow:
         self.root.title("🍓 Dompet Pintar - Login")
         self.root.geometry("400x550")
         self.root.configure(bg=COLORS["cream"])
-        self.db = DatabaseManager()
+        self.pekerja = PekerjaDB(self.root)
 
         create_washi_tape(self.root)
 
@@ -179,9 +186,10 @@ class LoginWindow:
         self.entry_pass = self.create_styled_entry(card, "Password 🔐", show_char="•")
 
         # Tombol Login
-        tk.Button(card, text="Masuk Sekarang ✨", bg=COLORS["pink_main"], fg="white", 
-                  font=FONT_TITLE_M, relief="flat", cursor="hand2", 
-                  command=self.proses_login).pack(fill="x", pady=10, ipady=5)
+        self.btn_login = tk.Button(card, text="Masuk Sekarang ✨", bg=COLORS["pink_main"], fg="white", 
+                                   font=FONT_TITLE_M, relief="flat", cursor="hand2", 
+                                   command=self.proses_login)
+        self.btn_login.pack(fill="x", pady=10, ipady=5)
 
         # Link Register
         frame_reg = tk.Frame(card, bg=COLORS["white"])
@@ -200,26 +208,38 @@ class LoginWindow:
         tk.Frame(parent, bg=COLORS["lavender"], height=2).pack(fill="x", pady=(0, 10))
         return entry
 
+    @pantau_stall
     def proses_login(self):
         username = self.entry_user.get()
         password = self.entry_pass.get()
         
-        if self.db.cek_login(username, password):
+        self.btn_login.config(state="disabled", text="Sebentar ya... ⏳")
+        self.pekerja.kirim("cek_login", username, password,
+                           selesai=lambda berhasil: self.hasil_login(username, berhasil),
+                           gagal=self.login_gagal)
+
+    def hasil_login(self, username, berhasil):
+        self.btn_login.config(state="normal", text="Masuk Sekarang ✨")
+        if berhasil:
             self.root.withdraw() # Sembunyikan login window
-            Dashboard(tk.Toplevel(self.root), self.root, username) # Buka dashboard
+            Dashboard(tk.Toplevel(self.root), self.root, username, self.pekerja) # Buka dashboard
         else:
             messagebox.showerror("Ups!", "Username atau Password salah nih 🥺")
 
+    def login_gagal(self, error):
+        self.btn_login.config(state="normal", text="Masuk Sekarang ✨")
+        PekerjaDB.tampilkan_error(error)
+
     def buka_register(self):
-        RegisterWindow(self.root, self.db)
+        RegisterWindow(self.root, self.pekerja)
 
 class RegisterWindow:
-    def __init__(self, parent, db_manager):
+    def __init__(self, parent, pekerja):
         self.window = tk.Toplevel(parent)
         self.window.title("Daftar Akun Baru ✨")
         self.window.geometry("350x450")
         self.window.configure(bg=COLORS["cream"])
-        self.db = db_manager
+        self.pekerja = pekerja
         create_washi_tape(self.window)
         
         tk.Label(self.window, text="Buat Akun 🍓", font=FONT_TITLE_L, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=20)
@@ -235,22 +255,38 @@ class RegisterWindow:
         self.entry_pass = tk.Entry(frame_form, font=FONT_STD, bg="white", relief="flat", show="•")
         self.entry_pass.pack(fill="x", pady=5, ipady=5)
 
-        tk.Button(self.window, text="Simpan Akun ✅", bg=COLORS["lime"], fg=COLORS["text"], 
-                  font=FONT_TITLE_M, relief="flat", command=self.simpan_akun).pack(fill="x", padx=30, pady=30, ipady=5)
+        self.btn_simpan = tk.Button(self.window, text="Simpan Akun ✅", bg=COLORS["lime"], fg=COLORS["text"], 
+                                    font=FONT_TITLE_M, relief="flat", command=self.simpan_akun)
+        self.btn_simpan.pack(fill="x", padx=30, pady=30, ipady=5)
 
     def simpan_akun(self):
-        if self.db.registrasi_user(self.entry_user.get(), self.entry_pass.get()):
+        self.btn_simpan.config(state="disabled")
+        self.pekerja.kirim("registrasi_user", self.entry_user.get(), self.entry_pass.get(),
+                           selesai=self.hasil_simpan, gagal=self.simpan_gagal)
+
+    def hasil_simpan(self, berhasil):
+        if berhasil:
             messagebox.showinfo("Yey!", "Akun berhasil dibuat! Login yuk 🥳")
             self.window.destroy()
         else:
+            self.btn_simpan.config(state="normal")
             messagebox.showwarning("Hmm..", "Username itu udah dipake orang lain 😢")
 
+    def simpan_gagal(self, error):
+        self.btn_simpan.config(state="normal")
+        PekerjaDB.tampilkan_error(error)
+
 # =============================================================================
-# 6. DASHBOARD UTAMA (GUI UTAMA)
+# 4. DASHBOARD UTAMA (GUI UTAMA)
 # =============================================================================
 
 class Dashboard:
-    def __init__(self, root, original_root, username):
+    UKURAN_HALAMAN = 200 # Jumlah baris riwayat yang dimuat per halaman
+    # Input cepat: entri disimpan berkelompok (satu commit) setiap interval atau saat buffer penuh
+    INTERVAL_FLUSH_MS = 1500
+    BATAS_BUFFER = 25
+
+    def __init__(self, root, original_root, username, pekerja=None):
         self.root = root
         self.original_root = original_root
         self.username = username
@@ -258,7 +294,21 @@ class Dashboard:
         self.root.title(f"🎀 Dashboard - {username}")
         self.root.geometry("950x720") 
         self.root.configure(bg=COLORS["cream"])
-        self.db = DatabaseManager()
+        # Semua akses database lewat thread pekerja (dipakai bersama window login)
+        self.pekerja = pekerja or PekerjaDB(original_root)
+        self.total_masuk = 0         # Ringkasan saldo (sen); diisi hasil ambil_ringkasan, lalu diubah per delta
+        self.total_keluar = 0
+        self.posisi_halaman = None   # (tanggal, id) baris terakhir yang sudah dimuat
+        self.halaman_habis = False
+        self.sedang_memuat = False
+        self.filter_cari = None      # None = riwayat biasa, dict = argumen cari_transaksi()
+        self.jadwal_cari = None
+        self.buffer = BufferTulis(username, file_jurnal(self.pekerja.db_file, username))
+        self.jadwal_flush = None
+        self.nomor_sementara = itertools.count(1) # iid baris sementara "baru-N" di tabel
+        self.anggaran = {}           # kategori -> [batas, terpakai] (sen) untuk bulan_anggaran
+        self.bulan_anggaran = None
+        self.meter_anggaran = {}     # kategori -> (progressbar, label)
         
         # Saat dashboard ditutup, matikan seluruh aplikasi
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -266,10 +316,19 @@ class Dashboard:
         self.setup_styles()
         self.setup_header()       
         self.setup_input_area()   
+        self.setup_anggaran()
         self.setup_footer()       
         self.setup_table()        
 
+        # Entri input cepat yang belum sempat tersimpan di sesi sebelumnya (aplikasi mati)
+        file_pulih = self.buffer.pindahkan_jurnal_lama()
+        if file_pulih:
+            self.pekerja.kirim("pulihkan_jurnal", username, file_pulih, selesai=self.hasil_pulihkan)
+        # Transaksi rutin yang jatuh tempo selama aplikasi tertutup dibuat sekaligus (satu commit)
+        self.pekerja.kirim("jalankan_rutin", username, selesai=self.hasil_rutin)
         self.refresh_data()
+        # Setelah halaman pertama & ringkasan: isi cache transaksi sesi (dipakai Analitik)
+        self.pekerja.kirim("ambil_cache", self.username, kunci=(id(self), "cache"))
 
     def setup_styles(self):
         """Konfigurasi style untuk Treeview dan Progressbar."""
@@ -354,7 +413,7 @@ class Dashboard:
 
         # 3. Kategori
         tk.Label(lf_input, text="Kategori 🏷️ :", bg="white", font=FONT_UI_S).grid(row=2, column=0, sticky="e", padx=10, pady=5)
-        self.combo_kategori = ttk.Combobox(lf_input, values=["🍔 Makanan", "🚗 Transport", "🛍️ Belanja", "💰 Gaji", "💅 Skincare", "✨ Lainnya"], 
+        self.combo_kategori = ttk.Combobox(lf_input, values=DAFTAR_KATEGORI, 
                                   font=FONT_STD, width=25, state="readonly")
         self.combo_kategori.current(0)
         self.combo_kategori.grid(row=2, column=1, sticky="w", padx=10, ipady=3)
@@ -370,9 +429,29 @@ class Dashboard:
         tk.Radiobutton(frame_radio, text="Pengeluaran 📉", variable=self.var_jenis, value="Pengeluaran", fg=COLORS["rose"], **rb_style).pack(side="left", padx=15)
 
         # Tombol Simpan
-        btn_simpan = tk.Button(lf_input, text="💖 SIMPAN CATATAN 💖", bg=COLORS["lavender"], fg=COLORS["text"], 
-                               font=FONT_TITLE_M, bd=0, cursor="hand2", command=self.simpan_transaksi)
-        btn_simpan.grid(row=4, column=0, columnspan=2, sticky="ew", padx=50, pady=(15, 5), ipady=5)
+        self.btn_simpan = tk.Button(lf_input, text="💖 SIMPAN CATATAN 💖", bg=COLORS["lavender"], fg=COLORS["text"], 
+                                    font=FONT_TITLE_M, bd=0, cursor="hand2", command=self.simpan_transaksi)
+        self.btn_simpan.grid(row=4, column=0, columnspan=2, sticky="ew", padx=50, pady=(15, 5), ipady=5)
+
+        # Mode input cepat: tanpa popup per entri, disimpan berkelompok (Enter = simpan)
+        self.var_cepat = tk.BooleanVar(value=False)
+        tk.Checkbutton(lf_input, text="⚡ Input cepat (Enter untuk simpan, disimpan berkelompok)", variable=self.var_cepat,
+                       bg="white", activebackground="white", font=FONT_UI_S, fg=COLORS["text"],
+                       command=self.ubah_mode_cepat).grid(row=5, column=0, columnspan=2)
+        for entry in (self.entry_desc, self.entry_nom):
+            entry.bind("<Return>", lambda e: self.simpan_transaksi())
+
+    def setup_anggaran(self):
+        """Baris meteran anggaran bulanan per kategori (hanya kategori yang punya anggaran)."""
+        frame = tk.Frame(self.root, bg=COLORS["cream"])
+        frame.pack(fill="x", padx=30, pady=(5, 0), side="top")
+        tk.Label(frame, text="🎯 Anggaran bulan ini:", font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack(side="left")
+        tk.Button(frame, text="Atur ✏️", bg=COLORS["lavender"], fg=COLORS["text"], bd=0, font=FONT_UI_S,
+                  cursor="hand2", command=self.buka_anggaran).pack(side="right")
+        self.frame_meter = tk.Frame(frame, bg=COLORS["cream"])
+        self.frame_meter.pack(side="left", fill="x", expand=True, padx=5)
+        self.lbl_peringatan_anggaran = tk.Label(frame, text="", font=FONT_UI_S, bg=COLORS["cream"], fg=COLORS["danger"])
+        self.lbl_peringatan_anggaran.pack(side="right", padx=5)
 
     def setup_footer(self):
         """Area tombol aksi tambahan di bawah."""
@@ -386,16 +465,35 @@ class Dashboard:
         
         tk.Button(frame_footer, text="📂 Export CSV", bg=COLORS["lime"], fg=COLORS["text"], 
                   activebackground="#95D2B3", command=self.export_csv, **btn_style).pack(side="left", padx=5)
+
+        tk.Button(frame_footer, text="📥 Import CSV", bg=COLORS["lavender"], fg=COLORS["text"], 
+                  activebackground="#C8A2E8", command=self.import_csv, **btn_style).pack(side="left", padx=5)
+
+        tk.Button(frame_footer, text="🔁 Rutin", bg=COLORS["white"], fg=COLORS["text"], 
+                  activebackground="#F5E6CC", command=self.buka_rutin, **btn_style).pack(side="left", padx=5)
+
+        tk.Button(frame_footer, text="💾 Backup", bg=COLORS["white"], fg=COLORS["text"], 
+                  activebackground="#F5E6CC", command=self.buka_backup, **btn_style).pack(side="left", padx=5)
         
         tk.Button(frame_footer, text="📅 Lihat Arsip Tahunan", bg=COLORS["pink_main"], fg="white", 
                   activebackground="#FF5588", command=self.buka_arsip, **btn_style).pack(side="right", padx=30)
 
+        tk.Button(frame_footer, text="📈 Analitik", bg=COLORS["pink_header"], fg="white", 
+                  activebackground="#FF5588", command=self.buka_analitik, **btn_style).pack(side="right", padx=5)
+
     def setup_table(self):
         """Area Tabel Riwayat Transaksi."""
         frame_table = tk.Frame(self.root, bg=COLORS["cream"], padx=30, pady=10)
         frame_table.pack(fill="both", expand=True, side="top")
 
-        tk.Label(frame_table, text="Riwayat Transaksi Terakhir 👇", font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack(anchor="w", pady=(0,5))
+        frame_judul = tk.Frame(frame_table, bg=COLORS["cream"])
+        frame_judul.pack(fill="x", pady=(0,5))
+        tk.Label(frame_judul, text="Riwayat Transaksi Terakhir 👇", font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack(side="left")
+        # Indikator loading selama thread database masih bekerja
+        self.lbl_status = tk.Label(frame_judul, text="", font=FONT_UI_S, bg=COLORS["cream"], fg=COLORS["pink_main"])
+        self.lbl_status.pack(side="right")
+
+        self.setup_pencarian(frame_table)
 
         cols = ("ID", "Tanggal", "Jenis", "Kategori", "Deskripsi", "Nominal")
         self.tree = ttk.Treeview(frame_table, columns=cols, show="headings")
@@ -410,15 +508,53 @@ class Dashboard:
         self.tree.column("Deskripsi", width=250, anchor="w")
         self.tree.column("Nominal", width=120, anchor="e")
 
-        scrollbar = ttk.Scrollbar(frame_table, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(frame_table, command=self.tree.yview)
+        self.tree.configure(yscroll=self.on_scroll_tabel) # Muat halaman berikutnya saat scroll mendekati akhir
         
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar.pack(side="right", fill="y")
         
         # Tag warna baris
         self.tree.tag_configure("in", foreground="#6A9C89", background="#E9EFEC")
         self.tree.tag_configure("out", foreground="#D04848", background="#FDECEC")
+        self.tree.tag_configure("tertunda", foreground="grey")
+
+    def setup_pencarian(self, parent):
+        """Bar pencarian: teks deskripsi + filter kategori, jenis, tanggal, dan nominal."""
+        frame_cari = tk.Frame(parent, bg=COLORS["white"], padx=10, pady=6)
+        frame_cari.pack(fill="x", pady=(0, 8))
+        entry_style = {"bg": COLORS["cream"], "relief": "flat", "font": FONT_STD}
+
+        tk.Label(frame_cari, text="🔍", bg="white", font=FONT_STD).pack(side="left")
+        self.entry_cari = tk.Entry(frame_cari, width=16, **entry_style)
+        self.entry_cari.pack(side="left", padx=(2, 8), ipady=3)
+        self.entry_cari.bind("<KeyRelease>", self.jadwalkan_cari) # Cari otomatis setelah berhenti mengetik
+        self.entry_cari.bind("<Return>", lambda e: self.cari())
+
+        self.combo_cari_kategori = ttk.Combobox(frame_cari, values=["Semua"] + DAFTAR_KATEGORI, width=11, state="readonly", font=FONT_STD)
+        self.combo_cari_kategori.current(0)
+        self.combo_cari_kategori.pack(side="left", padx=2)
+        self.combo_cari_jenis = ttk.Combobox(frame_cari, values=["Semua", "Pemasukan", "Pengeluaran"], width=10, state="readonly", font=FONT_STD)
+        self.combo_cari_jenis.current(0)
+        self.combo_cari_jenis.pack(side="left", padx=2)
+        for combo in (self.combo_cari_kategori, self.combo_cari_jenis):
+            combo.bind("<<ComboboxSelected>>", lambda e: self.cari())
+
+        # Rentang tanggal (YYYY-MM-DD) dan nominal (Rupiah), semua opsional
+        self.entry_cari_dari = tk.Entry(frame_cari, width=10, **entry_style)
+        self.entry_cari_sampai = tk.Entry(frame_cari, width=10, **entry_style)
+        self.entry_cari_min = tk.Entry(frame_cari, width=8, **entry_style)
+        self.entry_cari_max = tk.Entry(frame_cari, width=8, **entry_style)
+        for label, entry in (("📅", self.entry_cari_dari), ("–", self.entry_cari_sampai),
+                             ("Rp", self.entry_cari_min), ("–", self.entry_cari_max)):
+            tk.Label(frame_cari, text=label, bg="white", font=FONT_UI_S).pack(side="left", padx=(4, 0))
+            entry.pack(side="left", padx=2, ipady=3)
+            entry.bind("<Return>", lambda e: self.cari())
+
+        tk.Button(frame_cari, text="Reset", bg=COLORS["cream"], fg=COLORS["text"], bd=0, font=FONT_UI_S,
+                  cursor="hand2", command=self.reset_cari).pack(side="right", padx=2)
+        tk.Button(frame_cari, text="Cari", bg=COLORS["lavender"], fg=COLORS["text"], bd=0, font=FONT_UI_S,
+                  cursor="hand2", command=self.cari).pack(side="right", padx=2)
 
     # =========================================================================
     # LOGIKA & EVENT HANDLERS
@@ -437,6 +573,7 @@ class Dashboard:
             self.entry_nom.delete(0, tk.END)
             self.entry_nom.insert(0, formatted)
 
+    @pantau_stall
     def simpan_transaksi(self):
         try:
             desc = self.entry_desc.get()
@@ -456,51 +593,330 @@ class Dashboard:
             else:
                 transaksi_baru = Pengeluaran(desc, nominal, kategori)
 
-            # Simpan ke DB menggunakan data dari Objek
-            self.db.tambah_data(self.username, jenis, transaksi_baru.kategori, 
-                                transaksi_baru.deskripsi, transaksi_baru.get_nominal())
-            
-            # Reset form
-            self.entry_desc.delete(0, 'end')
-            self.entry_nom.delete(0, 'end')
+            # Simpan ke DB menggunakan data dari Objek (nominal disimpan dalam sen)
+            nominal_sen = ke_sen(transaksi_baru.get_nominal())
+        except ValueError: 
+            return messagebox.showerror("Error", "Nominal harus angka ya cantik/ganteng 🥺")
+
+        if self.var_cepat.get():
+            return self.simpan_cepat(jenis, transaksi_baru, nominal_sen)
+
+        self.btn_simpan.config(state="disabled")
+        self.tampilkan_status("Menyimpan... ⏳")
+        self.pekerja.kirim("tambah_data", self.username, jenis, transaksi_baru.kategori,
+                           transaksi_baru.deskripsi, nominal_sen,
+                           selesai=lambda baris: self.hasil_simpan(transaksi_baru, baris),
+                           gagal=self.proses_gagal)
+
+    def hasil_simpan(self, transaksi_baru, baris_baru):
+        self.btn_simpan.config(state="normal")
+        self.tampilkan_status("")
+
+        # Reset form
+        self.entry_desc.delete(0, 'end')
+        self.entry_nom.delete(0, 'end')
+
+        # Cukup sisipkan satu baris di atas tabel dan geser total (tanpa reload penuh).
+        # Saat tabel berisi hasil pencarian, baris baru belum tentu cocok, jadi tidak disisipkan.
+        if self.filter_cari is None:
+            self.tambah_baris_tabel(baris_baru, posisi=0)
+        if baris_baru[2] == "Pemasukan":
+            self.ubah_total(baris_baru[5], 0)
+        else:
+            self.ubah_total(0, baris_baru[5])
+        peringatan = self.ubah_anggaran(baris_baru[2], baris_baru[3], baris_baru[6], baris_baru[5])
+        
+        # Tampilkan pesan sukses dari Method Polymorphism
+        messagebox.showinfo("Sukses", transaksi_baru.info_sukses())
+        if peringatan:
+            messagebox.showwarning("Anggaran", peringatan)
+
+    def simpan_cepat(self, jenis, transaksi_baru, nominal_sen):
+        """Input cepat: entri masuk buffer & langsung tampil, disimpan nanti bersama entri lain."""
+        iid = f"baru-{next(self.nomor_sementara)}"
+        entri = self.buffer.tambah(iid, jenis, transaksi_baru.kategori, transaksi_baru.deskripsi, nominal_sen)
+        if self.filter_cari is None:
+            self.tree.insert("", 0, iid=iid, values=("⏳", entri[4][:10], "Masuk" if jenis == "Pemasukan" else "Keluar",
+                                                     entri[1], entri[2], format_rupiah(nominal_sen)), tags=("tertunda",))
+        if jenis == "Pemasukan":
+            self.ubah_total(nominal_sen, 0)
+        else:
+            self.ubah_total(0, nominal_sen)
+        self.ubah_anggaran(jenis, entri[1], entri[4], nominal_sen) # Tanpa popup di mode cepat, cukup label peringatan
+
+        self.entry_desc.delete(0, 'end')
+        self.entry_nom.delete(0, 'end')
+        self.entry_desc.focus_set()
+        self.tampilkan_status(f"⚡ {len(self.buffer)} catatan menunggu disimpan")
+        if len(self.buffer) >= self.BATAS_BUFFER:
+            self.flush_buffer()
+        elif self.jadwal_flush is None:
+            self.jadwal_flush = self.root.after(self.INTERVAL_FLUSH_MS, self.flush_buffer)
+
+    def flush_buffer(self):
+        """Mengirim semua entri di buffer ke thread database sebagai satu transaksi."""
+        if self.jadwal_flush is not None:
+            self.root.after_cancel(self.jadwal_flush)
+            self.jadwal_flush = None
+        batch = self.buffer.ambil()
+        if not batch: return
+        self.tampilkan_status(f"Menyimpan {len(batch)} catatan... ⏳")
+        self.pekerja.kirim("tambah_banyak", self.username, [entri for _, entri in batch],
+                           selesai=lambda baris: self.hasil_flush(batch, baris),
+                           gagal=lambda error: self.flush_gagal(batch, error))
+
+    def hasil_flush(self, batch, daftar_baris):
+        self.buffer.tersimpan(batch) # Dulu, sebelum widget disentuh (window mungkin sudah ditutup)
+        # Baris sementara diganti baris asli (iid = ID transaksi) di posisi yang sama
+        for (iid, _), baris in zip(batch, daftar_baris):
+            if self.tree.exists(iid):
+                posisi = self.tree.index(iid)
+                self.tree.delete(iid)
+                self.tambah_baris_tabel(baris, posisi=posisi)
+        self.tampilkan_status(f"⚡ {len(self.buffer)} catatan menunggu disimpan" if len(self.buffer) else "")
+
+    def flush_gagal(self, batch, error):
+        """Batch dikembalikan ke buffer (tetap tercatat di jurnal) dan dicoba lagi nanti."""
+        self.buffer.gagal(batch)
+        self.tampilkan_status(f"⚠️ {len(self.buffer)} catatan belum tersimpan, dicoba lagi...")
+        if self.jadwal_flush is None:
+            self.jadwal_flush = self.root.after(self.INTERVAL_FLUSH_MS * 4, self.flush_buffer)
+        log.warning("Simpan berkelompok gagal: %s", error)
+
+    def ubah_mode_cepat(self):
+        if not self.var_cepat.get():
+            self.flush_buffer()
+
+    def hasil_pulihkan(self, jumlah):
+        # Halaman pertama & ringkasan diminta setelah pemulihan, jadi sudah ikut memuat entri ini
+        if jumlah:
+            messagebox.showinfo("Dipulihkan", f"{jumlah} catatan dari sesi sebelumnya yang belum sempat tersimpan sudah disimpan ✅")
+
+    def hasil_rutin(self, per_user, muat_ulang=False):
+        jumlah = per_user.get(self.username, 0)
+        if jumlah and muat_ulang:
             self.refresh_data()
-            
-            # Tampilkan pesan sukses dari Method Polymorphism
-            messagebox.showinfo("Sukses", transaksi_baru.info_sukses())
+        if jumlah:
+            messagebox.showinfo("Transaksi Rutin", f"🔁 {jumlah:,} transaksi rutin yang sudah jatuh tempo dicatat otomatis ✅")
 
-        except ValueError: 
-            messagebox.showerror("Error", "Nominal harus angka ya cantik/ganteng 🥺")
+    def proses_gagal(self, error):
+        """Callback gagal umum: aktifkan lagi tombol dan tampilkan error."""
+        self.btn_simpan.config(state="normal")
+        self.tampilkan_status("")
+        PekerjaDB.tampilkan_error(error)
+
+    def tampilkan_status(self, teks):
+        self.lbl_status.config(text=teks)
 
+    @pantau_stall
     def refresh_data(self):
-        """Mengambil data terbaru dan menghitung ulang saldo/meteran boros."""
-        for i in self.tree.get_children(): self.tree.delete(i)
-        
-        data = self.db.ambil_semua_data(self.username)
-        saldo = 0
-        total_masuk = 0
-        total_keluar = 0
+        """Memuat ulang halaman pertama riwayat, lalu memperbarui saldo/meteran boros."""
+        # Isi tabel lama baru dibuang saat halaman pertama datang (tidak berkedip kosong)
+        self.halaman_habis = False
+        self.muat_halaman_berikut(dari_awal=True)
+
+        # Total diambil dari tabel ringkasan (tidak perlu menjumlah ulang seluruh riwayat)
+        self.pekerja.kirim("ambil_ringkasan", self.username, kunci=(id(self), "ringkasan"),
+                           selesai=self.tampilkan_ringkasan)
+        self.muat_anggaran()
+
+    def tampilkan_ringkasan(self, ringkasan):
+        _, self.total_masuk, self.total_keluar = ringkasan
+        self.perbarui_header()
+
+    def muat_anggaran(self):
+        """Meminta anggaran & pemakaian bulan ini (dibaca dari rekap bulanan, bukan menjumlah transaksi)."""
+        bulan = datetime.now().strftime("%Y-%m")
+        self.flush_buffer() # Antrean FIFO: entri input cepat ikut terhitung
+        self.pekerja.kirim("ambil_anggaran", self.username, bulan, kunci=(id(self), "anggaran"),
+                           selesai=lambda data: self.tampilkan_anggaran(bulan, data))
+
+    def tampilkan_anggaran(self, bulan, data):
+        """Membuat ulang meteran untuk kategori yang punya anggaran (urutan sesuai DAFTAR_KATEGORI)."""
+        self.bulan_anggaran = bulan
+        self.anggaran = {kategori: list(nilai) for kategori, nilai in data.items()}
+        for widget in self.frame_meter.winfo_children():
+            widget.destroy()
+        self.meter_anggaran = {}
+        self.lbl_peringatan_anggaran.config(text="")
+        if not self.anggaran:
+            tk.Label(self.frame_meter, text="belum diatur", font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack(side="left")
+            return
+        style = ttk.Style()
+        for i, kategori in enumerate(k for k in DAFTAR_KATEGORI + sorted(self.anggaran) if k in self.anggaran):
+            if kategori in self.meter_anggaran: continue
+            nama_style = f"Anggaran{i}.Horizontal.TProgressbar"
+            style.configure(nama_style, troughcolor="white", background=COLORS["lime"], thickness=8, borderwidth=0)
+            label = tk.Label(self.frame_meter, text="", font=("Segoe UI Emoji", 9), bg=COLORS["cream"], fg=COLORS["text"])
+            label.pack(side="left", padx=(8, 2))
+            bar = ttk.Progressbar(self.frame_meter, style=nama_style, length=60, mode="determinate")
+            bar.pack(side="left")
+            self.meter_anggaran[kategori] = (bar, label)
+            self.perbarui_meter(kategori)
+
+    def persen_anggaran(self, kategori):
+        batas, terpakai = self.anggaran[kategori]
+        return terpakai * 100 / batas
+
+    def perbarui_meter(self, kategori):
+        """Update satu meteran anggaran dari angka yang tersimpan (tanpa query)."""
+        bar, label = self.meter_anggaran[kategori]
+        persen = self.persen_anggaran(kategori)
+        warna = (COLORS["danger"] if persen >= 100 else
+                 COLORS["warning"] if persen >= PERSEN_PERINGATAN_ANGGARAN else COLORS["lime"])
+        bar["value"] = min(persen, 100)
+        ttk.Style().configure(bar.cget("style"), background=warna)
+        label.config(text=f"{kategori.split()[0]} {persen:.0f}%", fg=COLORS["danger"] if persen >= 100 else COLORS["text"])
+
+    def ubah_anggaran(self, jenis, kategori, tanggal, nominal_sen):
+        """
+        Menggeser pemakaian anggaran kategori sebesar satu transaksi (O(1), tanpa query).
+        Mengembalikan teks peringatan jika pemakaian baru saja melewati batas anggaran.
+        """
+        if jenis != "Pengeluaran" or self.bulan_anggaran is None: return None
+        if tanggal[:7] > self.bulan_anggaran:
+            self.muat_anggaran() # Sudah ganti bulan sejak dashboard dibuka
+            return None
+        if tanggal[:7] != self.bulan_anggaran or kategori not in self.anggaran: return None
+
+        sebelum = self.persen_anggaran(kategori)
+        self.anggaran[kategori][1] += nominal_sen
+        sesudah = self.persen_anggaran(kategori)
+        self.perbarui_meter(kategori)
+        batas, terpakai = self.anggaran[kategori]
+        if sebelum < 100 <= sesudah:
+            teks = f"Anggaran {kategori} bulan ini jebol! {format_rupiah(terpakai)} dari {format_rupiah(batas)} 😱"
+        elif sebelum < PERSEN_PERINGATAN_ANGGARAN <= sesudah:
+            teks = f"Anggaran {kategori} sudah terpakai {sesudah:.0f}% ⚠️"
+        else:
+            return None
+        self.lbl_peringatan_anggaran.config(text=teks)
+        return teks if sesudah >= 100 else None
 
+    @pantau_stall
+    def muat_halaman_berikut(self, dari_awal=False):
+        """
+        Meminta satu halaman riwayat (lazy loading). dari_awal=True memuat ulang
+        halaman pertama dan membatalkan permintaan halaman lain yang masih berjalan.
+        """
+        if not dari_awal and (self.halaman_habis or self.sedang_memuat): return
+        if dari_awal:
+            self.flush_buffer() # Antrean FIFO: entri tersimpan dulu sebelum halaman dibaca
+        self.sedang_memuat = True
+        self.tampilkan_status("Memuat riwayat... ⏳")
+
+        posisi = None if dari_awal else self.posisi_halaman
+        selesai = lambda data: self.tampilkan_halaman(data, dari_awal)
+        if self.filter_cari is None:
+            self.pekerja.kirim("ambil_halaman", self.username, posisi, self.UKURAN_HALAMAN,
+                               kunci=(id(self), "halaman"), selesai=selesai, gagal=self.halaman_gagal)
+        else:
+            # Hasil pencarian memakai kunci yang sama: pencarian baru membatalkan yang lama
+            self.pekerja.kirim("cari_transaksi", self.username, setelah=posisi, batas=self.UKURAN_HALAMAN,
+                               kunci=(id(self), "halaman"), selesai=selesai, gagal=self.halaman_gagal,
+                               **self.filter_cari)
+
+    def baca_filter_cari(self):
+        """Membaca bar pencarian menjadi argumen cari_transaksi(), atau None jika semua kosong."""
+        filter_cari = {}
+        teks = self.entry_cari.get().strip()
+        if teks:
+            filter_cari["teks"] = teks
+        if self.combo_cari_kategori.get() != "Semua":
+            filter_cari["kategori"] = self.combo_cari_kategori.get()
+        if self.combo_cari_jenis.get() != "Semua":
+            filter_cari["jenis"] = self.combo_cari_jenis.get()
+        for nama, entry in (("dari", self.entry_cari_dari), ("sampai", self.entry_cari_sampai)):
+            tgl = entry.get().strip()
+            if tgl:
+                datetime.strptime(tgl, "%Y-%m-%d") # ValueError jika format salah
+                filter_cari[nama] = tgl
+        for nama, entry in (("nominal_min", self.entry_cari_min), ("nominal_max", self.entry_cari_max)):
+            angka = entry.get().strip().replace(".", "")
+            if angka:
+                filter_cari[nama] = ke_sen(angka)
+        return filter_cari or None
+
+    def jadwalkan_cari(self, event=None):
+        """Debounce: pencarian baru dikirim 300 ms setelah user berhenti mengetik."""
+        if self.jadwal_cari is not None:
+            self.root.after_cancel(self.jadwal_cari)
+        self.jadwal_cari = self.root.after(300, self.cari)
+
+    @pantau_stall
+    def cari(self):
+        if self.jadwal_cari is not None:
+            self.root.after_cancel(self.jadwal_cari)
+            self.jadwal_cari = None
+        try:
+            filter_cari = self.baca_filter_cari()
+        except ValueError:
+            return messagebox.showwarning("Eits!", "Tanggal pakai format YYYY-MM-DD dan nominal berupa angka ya 😉")
+        if filter_cari == self.filter_cari:
+            return
+        self.filter_cari = filter_cari
+        self.halaman_habis = False
+        self.muat_halaman_berikut(dari_awal=True)
+
+    def reset_cari(self):
+        for entry in (self.entry_cari, self.entry_cari_dari, self.entry_cari_sampai, self.entry_cari_min, self.entry_cari_max):
+            entry.delete(0, "end")
+        self.combo_cari_kategori.current(0)
+        self.combo_cari_jenis.current(0)
+        self.cari()
+
+    def tampilkan_halaman(self, data, dari_awal):
+        """Menambahkan halaman yang sudah diambil thread database ke bawah tabel."""
+        if dari_awal:
+            # Baris input cepat yang belum tersimpan tetap di atas (hanya pada riwayat biasa)
+            simpan_sementara = self.filter_cari is None
+            for i in self.tree.get_children():
+                if not (simpan_sementara and i.startswith("baru-")): self.tree.delete(i)
+            self.posisi_halaman = None
         for r in data:
-            # r = (id, username, jenis, kategori, deskripsi, nominal, tanggal)
-            is_income = r[2] == "Pemasukan"
-            nominal = r[5]
-            
-            if is_income:
-                saldo += nominal
-                total_masuk += nominal
-            else:
-                saldo -= nominal
-                total_keluar += nominal
-            
-            tgl_short = r[6][:10] # Ambil tanggal saja (YYYY-MM-DD)
-            jenis_txt = "Masuk" if is_income else "Keluar"
-            tag = "in" if is_income else "out"
-            
-            # Masukkan ke tabel
-            self.tree.insert("", "end", values=(r[0], tgl_short, jenis_txt, r[3], r[4], f"Rp {nominal:,.0f}"), tags=(tag,))
-            
-        # Update UI Saldo
-        self.lbl_saldo.config(text=f"Rp {saldo:,.0f}")
+            self.tambah_baris_tabel(r)
+
+        if data:
+            self.posisi_halaman = (data[-1][6], data[-1][0])
+        self.halaman_habis = len(data) < self.UKURAN_HALAMAN
+        self.sedang_memuat = False
+        self.tampilkan_status("")
+
+    def halaman_gagal(self, error):
+        self.sedang_memuat = False
+        self.tampilkan_status("")
+        PekerjaDB.tampilkan_error(error)
+
+    def tambah_baris_tabel(self, r, posisi="end"):
+        """Memasukkan satu baris transaksi ke tabel. iid = ID transaksi."""
+        # r = (id, username, jenis, kategori, deskripsi, nominal, tanggal)
+        if self.tree.exists(str(r[0])): return # Sudah tampil (baru disimpan sebelum halaman ini datang)
+        is_income = r[2] == "Pemasukan"
+        nominal = r[5]
+        
+        tgl_short = r[6][:10] # Ambil tanggal saja (YYYY-MM-DD)
+        jenis_txt = "Masuk" if is_income else "Keluar"
+        tag = "in" if is_income else "out"
+        
+        self.tree.insert("", posisi, iid=str(r[0]), values=(r[0], tgl_short, jenis_txt, r[3], r[4], format_rupiah(nominal)), tags=(tag,))
+
+    def ubah_total(self, delta_masuk, delta_keluar):
+        """Menggeser total header sebesar delta (negatif = data dihapus)."""
+        self.total_masuk += delta_masuk
+        self.total_keluar += delta_keluar
+        self.perbarui_header()
+
+    def on_scroll_tabel(self, first, last):
+        """Sinkronkan scrollbar, dan muat halaman berikutnya jika sudah dekat akhir tabel."""
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.9 and not self.halaman_habis and not self.sedang_memuat:
+            self.root.after_idle(self.muat_halaman_berikut)
+
+    def perbarui_header(self):
+        """Update kartu saldo dan Meteran Boros dari total yang tersimpan."""
+        total_masuk, total_keluar = self.total_masuk, self.total_keluar
+        saldo = total_masuk - total_keluar
+        self.lbl_saldo.config(text=format_rupiah(saldo))
         self.lbl_saldo.config(fg=COLORS["danger"] if saldo < 0 else COLORS["pink_main"])
 
         # Update Meteran Boros
@@ -523,119 +939,712 @@ class Dashboard:
             s.configure("Pink.Horizontal.TProgressbar", background=COLORS["lime"]) 
             self.lbl_persen_boros.config(fg=COLORS["lime"])
 
+    @pantau_stall
     def hapus_data(self):
         if not self.tree.selection(): 
             messagebox.showinfo("Info", "Pilih dulu data yang mau dihapus yaa")
             return
+        if any(i.startswith("baru-") for i in self.tree.selection()):
+            self.flush_buffer()
+            messagebox.showinfo("Info", "Catatan baru masih disimpan, coba hapus lagi sebentar ya ⏳")
+            return
         if messagebox.askyesno("Hapus?", "Yakin mau hapus data ini? 🥺"):
-            for i in self.tree.selection(): 
-                item_id = self.tree.item(i)['values'][0]
-                self.db.hapus_data(item_id)
-            self.refresh_data()
+            terpilih = self.tree.selection()
+            self.tampilkan_status("Menghapus... ⏳")
+            # Satu panggilan untuk semua baris terpilih (iid baris = ID transaksi)
+            self.pekerja.kirim("hapus_banyak", self.username, [int(i) for i in terpilih],
+                               selesai=lambda hasil: self.hasil_hapus(terpilih, hasil),
+                               gagal=self.proses_gagal)
+
+    def hasil_hapus(self, terpilih, hasil):
+        _, hapus_masuk, hapus_keluar = hasil
+        # Hanya baris terpilih yang dibuang dari tabel (yang masih tampil)
+        self.tree.delete(*[i for i in terpilih if self.tree.exists(i)])
+        self.ubah_total(-hapus_masuk, -hapus_keluar)
+        self.tampilkan_status("")
+        if self.anggaran:
+            self.muat_anggaran() # Beberapa baris lintas kategori: baca ulang rekap (satu baris per kategori)
 
     def export_csv(self):
-        """Fitur Export data tabel ke file CSV."""
+        """Fitur Export data ke file CSV (dengan filter, berjalan di background)."""
         if not self.tree.get_children():
             messagebox.showwarning("Kosong", "Belum ada data buat diexport nih 😅")
             return
-        
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", 
-                                                 filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")], 
-                                                 title="Simpan Laporan")
-        if file_path:
-            try:
-                with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    cols = ("ID", "Tanggal", "Jenis", "Kategori", "Deskripsi", "Nominal")
-                    writer.writerow(cols)
-                    
-                    for item in self.tree.get_children():
-                        row = self.tree.item(item)['values']
-                        # Bersihkan format Rp dan koma agar jadi angka murni di Excel
-                        clean_row = list(row)
-                        clean_row[5] = str(row[5]).replace("Rp ", "").replace(",", "")
-                        writer.writerow(clean_row)
-                        
-                messagebox.showinfo("Berhasil", f"Laporan tersimpan di:\n{file_path} ✅")
-            except Exception as e:
-                messagebox.showerror("Error", f"Gagal nyimpen file: {e}")
+        ExportWindow(self.root, self.pekerja.db_file, self.username)
+
+    @pantau_stall
+    def import_csv(self):
+        """Import transaksi dari file CSV (hasil export / mutasi bank) secara massal."""
+        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")], 
+                                               title="Pilih File CSV")
+        if not file_path: return
+
+        self.tampilkan_status("Mengimport... ⏳")
+        # File dibaca (generator) di thread database, bukan di thread Tk
+        self.pekerja.kirim("impor_transaksi", self.username, baca_csv_transaksi(file_path),
+                           selesai=self.hasil_import, gagal=self.import_gagal)
+
+    def import_gagal(self, e):
+        self.tampilkan_status("")
+        if isinstance(e, (OSError, ValueError, csv.Error)):
+            messagebox.showerror("Error", f"Gagal import file: {e}")
+        else:
+            PekerjaDB.tampilkan_error(e)
+
+    def hasil_import(self, laporan):
+        self.tampilkan_status("")
+        pesan = (f"{laporan['diimpor']:,} transaksi berhasil diimport ✅\n"
+                 f"Duplikat dilewati: {laporan['duplikat']:,}\n"
+                 f"Baris ditolak: {len(laporan['ditolak']):,}\n"
+                 f"Kecepatan: {laporan['baris_per_detik']:,.0f} baris/detik")
+        for nomor_baris, alasan in laporan["ditolak"][:5]:
+            pesan += f"\n  • baris {nomor_baris}: {alasan}"
+        messagebox.showinfo("Import Selesai", pesan)
+
+        # Data baru bisa tersebar di seluruh riwayat, jadi tabel dimuat ulang
+        if laporan["diimpor"]:
+            self.refresh_data()
 
     def buka_arsip(self):
-        ArsipWindow(self.root, self.db, self.username)
+        ArsipWindow(self.root, self.pekerja, self.username)
+
+    def buka_backup(self):
+        BackupWindow(self.root, self.pekerja.db_file)
+
+    def buka_rutin(self):
+        RutinWindow(self.root, self.pekerja, self.username,
+                    lambda per_user: self.hasil_rutin(per_user, muat_ulang=True))
+
+    def buka_anggaran(self):
+        AnggaranWindow(self.root, self.pekerja, self.username,
+                       {kategori: batas for kategori, (batas, _) in self.anggaran.items()}, self.muat_anggaran)
+
+    def buka_analitik(self):
+        if not wallet_analitik.NUMPY_TERSEDIA:
+            messagebox.showinfo("Info", "Fitur analitik butuh NumPy dulu ya 🙏\n\npip install numpy")
+            return
+        AnalitikWindow(self.root, self.pekerja, self.username)
 
     def logout(self):
+        # Thread database tetap hidup karena window login masih memakainya
+        self.flush_buffer()
+        self.pekerja.batalkan((id(self), "halaman"))
+        self.pekerja.batalkan((id(self), "ringkasan"))
+        self.pekerja.batalkan((id(self), "cache"))
+        self.pekerja.batalkan((id(self), "anggaran"))
+        self.pekerja.kirim("lepas_cache", self.username)
         self.root.destroy()
         self.original_root.deiconify() # Tampilkan lagi window login
         
     def on_close(self):
         """Menutup aplikasi sepenuhnya."""
+        # Buffer input cepat ikut diantre sebelum thread database berhenti; jika tidak
+        # sempat ter-commit, entrinya masih ada di jurnal dan dipulihkan saat login berikutnya.
+        self.flush_buffer()
+        self.pekerja.hentikan()
+        PoolKoneksi.tutup_semua()
+        instrumen = instrumentasi_aktif()
+        if instrumen:
+            log.info("Ringkasan instrumentasi:\n%s", instrumen.ringkasan())
         self.root.destroy()
         self.original_root.destroy()
 
 # =============================================================================
-# 7. WINDOW ARSIP TAHUNAN
+# 5. WINDOW ARSIP TAHUNAN
 # =============================================================================
 
 class ArsipWindow:
-    def __init__(self, parent, db, user):
+    # Mode tampilan -> judul kolom pertama
+    MODE = {"Per Bulan": "Bulan", "Per Kategori": "Kategori", "Bandingkan Tahun": "Tahun"}
+
+    def __init__(self, parent, pekerja, user):
         self.win = tk.Toplevel(parent)
         self.win.title("📅 Arsip Tahunan")
         self.win.geometry("600x500")
         self.win.configure(bg=COLORS["cream"])
-        self.db = db
+        self.pekerja = pekerja
         self.user = user
+        self.kunci = (id(self), "arsip") # Pilihan baru membatalkan permintaan rekap sebelumnya
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
 
         create_washi_tape(self.win)
         tk.Label(self.win, text="Rekap Keuangan 📊", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
 
-        # Filter Tahun
+        # Filter Tahun & Mode (daftar tahun diambil dari data, bukan ditulis manual)
         frame_filter = tk.Frame(self.win, bg=COLORS["cream"])
         frame_filter.pack()
-        self.combo_tahun = ttk.Combobox(frame_filter, values=["2025", "2024", "2023"], width=10)
+        self.combo_tahun = ttk.Combobox(frame_filter, values=[str(datetime.now().year)], width=10, state="readonly")
         self.combo_tahun.current(0)
         self.combo_tahun.pack(side="left")
+
+        self.combo_mode = ttk.Combobox(frame_filter, values=list(self.MODE), width=16, state="readonly")
+        self.combo_mode.current(0)
+        self.combo_mode.pack(side="left", padx=5)
         
         tk.Button(frame_filter, text="Cek!", bg=COLORS["lime"], bd=0, command=self.load_data).pack(side="left", padx=5)
 
         # Tabel Arsip
-        self.tree = ttk.Treeview(self.win, columns=("Bulan", "Masuk", "Keluar"), show="headings")
-        for c in ("Bulan", "Masuk", "Keluar"): self.tree.heading(c, text=c)
+        self.tree = ttk.Treeview(self.win, columns=("Periode", "Masuk", "Keluar", "Selisih"), show="headings")
+        for c in ("Periode", "Masuk", "Keluar", "Selisih"): self.tree.heading(c, text=c)
         self.tree.pack(fill="both", expand=True, padx=20, pady=10)
+        self.lbl_status = tk.Label(self.win, text="Memuat... ⏳", bg=COLORS["cream"], fg="grey", font=FONT_UI_S)
+        self.lbl_status.pack(pady=(0, 10))
         
+        # Daftar tahun diambil dulu, setelah itu rekap tahun terbaru
+        self.pekerja.kirim("ambil_daftar_tahun", self.user, kunci=(id(self), "tahun"), selesai=self.isi_daftar_tahun)
+
+    def isi_daftar_tahun(self, daftar_tahun):
+        if daftar_tahun:
+            self.combo_tahun.config(values=[str(t) for t in daftar_tahun])
+            self.combo_tahun.current(0)
         self.load_data()
 
+    @pantau_stall
     def load_data(self):
+        """Semua mode membaca tabel rekap_bulanan, jadi cepat berapa pun jumlah riwayatnya."""
+        mode = self.combo_mode.get()
+        tahun = int(self.combo_tahun.get())
+        self.lbl_status.config(text="Memuat... ⏳")
+
+        selesai = lambda data: self.tampilkan_rekap(mode, data)
+        if mode == "Per Bulan":
+            self.pekerja.kirim("ambil_data_tahunan", self.user, tahun, kunci=self.kunci, selesai=selesai)
+        elif mode == "Per Kategori":
+            self.pekerja.kirim("ambil_rekap_kategori", self.user, tahun, kunci=self.kunci, selesai=selesai)
+        else:
+            daftar_tahun = [int(t) for t in self.combo_tahun.cget("values")]
+            self.pekerja.kirim("ambil_rekap_multi_tahun", self.user, min(daftar_tahun), max(daftar_tahun),
+                               kunci=self.kunci, selesai=selesai)
+
+    def tampilkan_rekap(self, mode, data):
         for i in self.tree.get_children(): self.tree.delete(i)
-        
-        # Ambil data agregat dari DB
-        data = self.db.ambil_data_tahunan(self.user, self.combo_tahun.get())
-        
-        # Struktur data: rekap[bulan] = {'in': 0, 'out': 0}
-        rekap = {f"{i:02d}": {'in':0, 'out':0} for i in range(1,13)}
-        
-        for r in data:
-            bulan_key = r[0]
-            jenis = r[1]
-            total = r[2]
+        self.tree.heading("Periode", text=self.MODE[mode])
+        self.lbl_status.config(text="")
+
+        # Struktur data: rekap[label] = {'in': 0, 'out': 0}, urutan label = urutan tampil
+        rekap = {}
+        if mode == "Per Bulan":
+            rekap = {f"{i:02d}": {'in': 0, 'out': 0} for i in range(1, 13)}
+
+        for label, jenis, total, *_ in data:
             key_jenis = 'in' if jenis == "Pemasukan" else 'out'
-            rekap[bulan_key][key_jenis] = total
+            rekap.setdefault(label, {'in': 0, 'out': 0})[key_jenis] = total
             
-        # Masukkan ke tabel urut bulan
-        for i in range(1,13):
-            k = f"{i:02d}"
-            nama_bulan = calendar.month_name[i]
-            masuk = rekap[k]['in']
-            keluar = rekap[k]['out']
+        for label, nilai in rekap.items():
+            masuk = nilai['in']
+            keluar = nilai['out']
             
             # Hanya tampilkan jika ada transaksi
             if masuk > 0 or keluar > 0:
-                self.tree.insert("", "end", values=(nama_bulan, f"{masuk:,.0f}", f"{keluar:,.0f}"))
+                if mode == "Per Bulan":
+                    label = calendar.month_name[int(label)]
+                self.tree.insert("", "end", values=(label, f"{masuk / SEN_PER_RUPIAH:,.0f}", f"{keluar / SEN_PER_RUPIAH:,.0f}",
+                                                    f"{(masuk - keluar) / SEN_PER_RUPIAH:,.0f}"))
+
+    def on_close(self):
+        self.pekerja.batalkan((id(self), "tahun"))
+        self.pekerja.batalkan(self.kunci)
+        self.win.destroy()
+
+# =============================================================================
+# 6. WINDOW EXPORT CSV
+# Export berjalan di thread terpisah dengan koneksi database sendiri,
+# jadi Dashboard tetap responsif walaupun riwayatnya sangat besar.
+# =============================================================================
+
+class ExportWindow:
+    def __init__(self, parent, db_file, user):
+        self.win = tk.Toplevel(parent)
+        self.win.title("📂 Export CSV")
+        self.win.geometry("380x400")
+        self.win.configure(bg=COLORS["cream"])
+        self.db_file = db_file
+        self.user = user
+        self.antrian = queue.Queue()     # Pesan progres dari thread export ke UI
+        self.batal = threading.Event()
+        self.thread = None
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        create_washi_tape(self.win)
+        tk.Label(self.win, text="Export Laporan 📂", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
+
+        # Form Filter
+        frame_form = tk.Frame(self.win, bg=COLORS["cream"], padx=30)
+        frame_form.pack(fill="x")
+
+        tk.Label(frame_form, text="Dari tanggal (YYYY-MM-DD, opsional):", bg=COLORS["cream"], font=FONT_UI_S).pack(anchor="w")
+        self.entry_dari = tk.Entry(frame_form, font=FONT_STD, bg="white", relief="flat")
+        self.entry_dari.pack(fill="x", pady=5, ipady=3)
+
+        tk.Label(frame_form, text="Sampai tanggal (YYYY-MM-DD, opsional):", bg=COLORS["cream"], font=FONT_UI_S).pack(anchor="w")
+        self.entry_sampai = tk.Entry(frame_form, font=FONT_STD, bg="white", relief="flat")
+        self.entry_sampai.pack(fill="x", pady=5, ipady=3)
+
+        tk.Label(frame_form, text="Kategori:", bg=COLORS["cream"], font=FONT_UI_S).pack(anchor="w")
+        self.combo_kategori = ttk.Combobox(frame_form, values=["Semua"] + DAFTAR_KATEGORI, font=FONT_STD, state="readonly")
+        self.combo_kategori.current(0)
+        self.combo_kategori.pack(fill="x", pady=5)
+
+        self.btn_export = tk.Button(self.win, text="Export Sekarang ✨", bg=COLORS["lime"], fg=COLORS["text"], 
+                                    font=FONT_TITLE_M, relief="flat", cursor="hand2", command=self.mulai_export)
+        self.btn_export.pack(fill="x", padx=30, pady=(15, 5), ipady=3)
+
+        # Indikator Progres
+        self.progress = ttk.Progressbar(self.win, style="Pink.Horizontal.TProgressbar", mode='determinate')
+        self.progress.pack(fill="x", padx=30, pady=5)
+        self.lbl_status = tk.Label(self.win, text="", bg=COLORS["cream"], fg="grey", font=FONT_UI_S)
+        self.lbl_status.pack()
+
+    def mulai_export(self):
+        dari = self.entry_dari.get().strip() or None
+        sampai = self.entry_sampai.get().strip() or None
+        kategori = self.combo_kategori.get()
+        kategori = None if kategori == "Semua" else kategori
+
+        try:
+            for tgl in (dari, sampai):
+                if tgl: datetime.strptime(tgl, "%Y-%m-%d")
+        except ValueError:
+            return messagebox.showwarning("Eits!", "Format tanggal harus YYYY-MM-DD ya 😉", parent=self.win)
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", 
+                                                 filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")], 
+                                                 title="Simpan Laporan", parent=self.win)
+        if not file_path: return
+        self.jalankan_export(file_path, dari, sampai, kategori)
+
+    def jalankan_export(self, file_path, dari=None, sampai=None, kategori=None):
+        """Mulai export di thread terpisah; progres dipantau lewat cek_progress (juga dipakai benchmark)."""
+        self.btn_export.config(state="disabled")
+        self.lbl_status.config(text="Menyiapkan data... ⏳")
+        self.thread = threading.Thread(target=self.kerja_export, args=(file_path, dari, sampai, kategori), daemon=True)
+        self.thread.start()
+        self.win.after(100, self.cek_progress)
+
+    def kerja_export(self, file_path, dari, sampai, kategori):
+        """Dijalankan di thread export. Tidak boleh menyentuh widget Tk secara langsung."""
+        try:
+            # Koneksi SQLite tidak boleh dipakai lintas thread, jadi buka koneksi baru
+            with buka_database(self.db_file) as db:
+                ditulis = db.ekspor_csv(self.user, file_path, dari, sampai, kategori,
+                                        progress=lambda n, total: self.antrian.put(("progres", n, total)),
+                                        batal=self.batal)
+            self.antrian.put(("selesai", ditulis, file_path))
+        except Exception as e:
+            self.antrian.put(("error", str(e), None))
+
+    def cek_progress(self):
+        """Polling antrian dari thread export (dipanggil lewat after)."""
+        try:
+            while True:
+                pesan, a, b = self.antrian.get_nowait()
+                if pesan == "progres":
+                    self.progress['value'] = (a / b * 100) if b else 100
+                    self.lbl_status.config(text=f"{a:,} / {b:,} baris")
+                elif pesan == "selesai":
+                    if a is None: return # Dibatalkan karena window ditutup
+                    self.export_selesai(a, b)
+                    return
+                else:
+                    messagebox.showerror("Error", f"Gagal nyimpen file: {a}", parent=self.win)
+                    self.btn_export.config(state="normal")
+                    return
+        except queue.Empty:
+            pass
+        self.win.after(100, self.cek_progress)
+
+    def export_selesai(self, ditulis, file_path):
+        if ditulis == 0:
+            messagebox.showwarning("Kosong", "Tidak ada data yang cocok dengan filter 😅", parent=self.win)
+        else:
+            messagebox.showinfo("Berhasil", f"{ditulis:,} baris tersimpan di:\n{file_path} ✅", parent=self.win)
+        self.win.destroy()
+
+    def on_close(self):
+        """Batalkan export yang masih berjalan saat window ditutup."""
+        if self.thread and self.thread.is_alive():
+            self.batal.set()
+        self.win.destroy()
+
+# =============================================================================
+# 7. WINDOW ANALITIK
+# Angka dihitung modul wallet_analitik (NumPy) di thread database dan
+# di-cache sampai data user berubah, jadi membuka ulang window ini instan.
+# =============================================================================
+
+class AnalitikWindow:
+    def __init__(self, parent, pekerja, user):
+        self.win = tk.Toplevel(parent)
+        self.win.title("📈 Analitik")
+        self.win.geometry("640x640")
+        self.win.configure(bg=COLORS["cream"])
+        self.pekerja = pekerja
+        self.kunci = (id(self), "analitik")
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        create_washi_tape(self.win)
+        tk.Label(self.win, text="Analitik Keuangan 📈", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
+
+        # Kartu prediksi Meteran Boros
+        self.lbl_prediksi = tk.Label(self.win, text="Menghitung... ⏳", font=FONT_STD, bg="white", fg=COLORS["text"],
+                                     justify="left", anchor="w", padx=15, pady=10)
+        self.lbl_prediksi.pack(fill="x", padx=20)
+
+        # Grafik tren belanja 7 hari bergulir
+        tk.Label(self.win, text=f"Belanja 7 hari bergulir ({wallet_analitik.HARI_TREN} hari terakhir)",
+                 font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack(anchor="w", padx=20, pady=(10, 0))
+        self.canvas = tk.Canvas(self.win, height=110, bg="white", highlightthickness=0)
+        self.canvas.pack(fill="x", padx=20)
+
+        # Tab rincian kategori & per bulan
+        tabs = ttk.Notebook(self.win)
+        tabs.pack(fill="both", expand=True, padx=20, pady=10)
+        self.tree_kategori = ttk.Treeview(tabs, columns=("Kategori", "Masuk", "Keluar", "Transaksi"), show="headings")
+        self.tree_bulan = ttk.Treeview(tabs, columns=("Bulan", "Masuk", "Keluar", "Selisih Keluar"), show="headings")
+        for tree in (self.tree_kategori, self.tree_bulan):
+            for c in tree["columns"]: tree.heading(c, text=c)
+        tabs.add(self.tree_kategori, text="Per Kategori")
+        tabs.add(self.tree_bulan, text="Bulan ke Bulan")
+
+        self.pekerja.kirim(wallet_analitik.analitik_user, user, kunci=self.kunci, selesai=self.tampilkan)
+
+    def tampilkan(self, hasil):
+        prediksi = hasil["prediksi"]
+        teks = (f"Belanja 7 hari: {format_rupiah(hasil['belanja_7_hari'])}   •   "
+                f"30 hari: {format_rupiah(hasil['belanja_30_hari'])}\n"
+                f"Bulan ini: keluar {format_rupiah(prediksi['keluar_bulan_ini'])} "
+                f"dari masuk {format_rupiah(prediksi['masuk_bulan_ini'])}\n"
+                f"Perkiraan akhir bulan: {format_rupiah(prediksi['proyeksi_keluar_akhir_bulan'])} "
+                f"(Meteran Boros ± {prediksi['proyeksi_persen_boros']:.0f}%)")
+        if prediksi["hari_sampai_saldo_habis"] is not None:
+            teks += f"\nDengan rata-rata belanja sekarang, saldo cukup untuk ± {prediksi['hari_sampai_saldo_habis']:,} hari"
+        warna = COLORS["danger"] if prediksi["proyeksi_persen_boros"] > 75 else COLORS["text"]
+        self.lbl_prediksi.config(text=teks, fg=warna)
+
+        for kategori, masuk, keluar, jumlah in hasil["per_kategori"]:
+            self.tree_kategori.insert("", "end", values=(kategori, format_rupiah(masuk), format_rupiah(keluar), f"{jumlah:,}"))
+        for bulan, masuk, keluar, selisih, persen in reversed(hasil["bulanan"]):
+            teks_selisih = format_rupiah(selisih) + (f" ({persen:+.1f}%)" if persen is not None else "")
+            self.tree_bulan.insert("", "end", values=(bulan, format_rupiah(masuk), format_rupiah(keluar), teks_selisih))
+
+        self.gambar_tren(hasil["tren_7_hari"])
+
+    def gambar_tren(self, tren):
+        """Grafik garis sederhana di Canvas (tanpa library chart)."""
+        self.canvas.update_idletasks()
+        lebar, tinggi, tepi = max(self.canvas.winfo_width(), 200), 110, 8
+        puncak = max(tren) or 1
+        titik = []
+        for i, nilai in enumerate(tren):
+            titik.append(tepi + i * (lebar - 2 * tepi) / max(len(tren) - 1, 1))
+            titik.append(tinggi - tepi - nilai / puncak * (tinggi - 2 * tepi))
+        self.canvas.delete("all")
+        if len(titik) >= 4:
+            self.canvas.create_line(*titik, fill=COLORS["pink_main"], width=2, smooth=True)
+        self.canvas.create_text(lebar - tepi, tepi, text=f"maks {format_rupiah(puncak)}", anchor="ne",
+                                font=("Segoe UI Emoji", 8), fill="grey")
+
+    def on_close(self):
+        self.pekerja.batalkan(self.kunci)
+        self.win.destroy()
+
+# =============================================================================
+# 8. WINDOW BACKUP
+# Backup berjalan di thread sendiri dengan SQLite backup API (wallet_backup),
+# jadi Dashboard tetap bisa dipakai selama backup.
+# =============================================================================
+
+class BackupWindow:
+    def __init__(self, parent, db_file):
+        self.win = tk.Toplevel(parent)
+        self.win.title("💾 Backup Database")
+        self.win.geometry("400x420")
+        self.win.configure(bg=COLORS["cream"])
+        self.db_file = db_file
+        self.antrian = queue.Queue()     # Pesan progres dari thread backup ke UI
+        self.batal = threading.Event()
+        self.thread = None
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        create_washi_tape(self.win)
+        tk.Label(self.win, text="Backup Data 💾", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
+
+        frame_form = tk.Frame(self.win, bg=COLORS["cream"], padx=30)
+        frame_form.pack(fill="x")
+
+        tk.Label(frame_form, text="Folder backup:", bg=COLORS["cream"], font=FONT_UI_S).pack(anchor="w")
+        frame_folder = tk.Frame(frame_form, bg=COLORS["cream"])
+        frame_folder.pack(fill="x", pady=5)
+        self.entry_folder = tk.Entry(frame_folder, font=FONT_STD, bg="white", relief="flat")
+        self.entry_folder.insert(0, os.path.join(os.path.dirname(os.path.abspath(db_file)), "backup"))
+        self.entry_folder.pack(side="left", fill="x", expand=True, ipady=3)
+        tk.Button(frame_folder, text="📁", bg=COLORS["lavender"], relief="flat", cursor="hand2",
+                  command=self.pilih_folder).pack(side="left", padx=(5, 0))
+
+        self.var_kompres = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame_form, text="Kompres (.gz)", variable=self.var_kompres, bg=COLORS["cream"],
+                       font=FONT_UI_S, activebackground=COLORS["cream"]).pack(anchor="w", pady=5)
+
+        tk.Label(frame_form, text="Simpan berapa backup terbaru:", bg=COLORS["cream"], font=FONT_UI_S).pack(anchor="w")
+        self.spin_simpan = tk.Spinbox(frame_form, from_=1, to=99, font=FONT_STD, relief="flat", width=5)
+        self.spin_simpan.delete(0, "end")
+        self.spin_simpan.insert(0, "7")
+        self.spin_simpan.pack(anchor="w", pady=5)
+
+        self.btn_backup = tk.Button(self.win, text="Backup Sekarang ✨", bg=COLORS["lime"], fg=COLORS["text"],
+                                    font=FONT_TITLE_M, relief="flat", cursor="hand2", command=self.mulai_backup)
+        self.btn_backup.pack(fill="x", padx=30, pady=(15, 5), ipady=3)
+
+        self.progress = ttk.Progressbar(self.win, style="Pink.Horizontal.TProgressbar", mode='determinate')
+        self.progress.pack(fill="x", padx=30, pady=5)
+        self.lbl_status = tk.Label(self.win, text=self.teks_backup_terakhir(), bg=COLORS["cream"], fg="grey",
+                                   font=FONT_UI_S, wraplength=340)
+        self.lbl_status.pack()
+
+    def teks_backup_terakhir(self):
+        daftar = wallet_backup.daftar_backup(self.entry_folder.get().strip())
+        return f"Backup terakhir: {os.path.basename(daftar[0])}" if daftar else "Belum ada backup di folder ini"
+
+    def pilih_folder(self):
+        folder = filedialog.askdirectory(title="Folder Backup", parent=self.win)
+        if folder:
+            self.entry_folder.delete(0, "end")
+            self.entry_folder.insert(0, folder)
+            self.lbl_status.config(text=self.teks_backup_terakhir())
+
+    def mulai_backup(self):
+        folder = self.entry_folder.get().strip()
+        try:
+            simpan = int(self.spin_simpan.get())
+            if simpan < 1: raise ValueError
+        except ValueError:
+            return messagebox.showwarning("Eits!", "Jumlah backup yang disimpan minimal 1 ya 😉", parent=self.win)
+        if not folder:
+            return messagebox.showwarning("Eits!", "Pilih folder backup dulu ya 😉", parent=self.win)
+
+        self.btn_backup.config(state="disabled")
+        self.lbl_status.config(text="Menyalin database... ⏳")
+        self.thread = threading.Thread(target=self.kerja_backup, args=(folder, self.var_kompres.get(), simpan), daemon=True)
+        self.thread.start()
+        self.win.after(100, self.cek_progress)
+
+    def kerja_backup(self, folder, kompres, simpan):
+        """Dijalankan di thread backup. Tidak boleh menyentuh widget Tk secara langsung."""
+        try:
+            hasil = wallet_backup.buat_backup(self.db_file, folder, kompres, simpan=simpan, batal=self.batal,
+                                              progress=lambda n, total: self.antrian.put(("progres", n, total)))
+            self.antrian.put(("selesai", hasil, None))
+        except Exception as e:
+            self.antrian.put(("error", str(e), None))
+
+    def cek_progress(self):
+        """Polling antrian dari thread backup (dipanggil lewat after)."""
+        try:
+            while True:
+                pesan, a, b = self.antrian.get_nowait()
+                if pesan == "progres":
+                    self.progress['value'] = (a / b * 100) if b else 100
+                    self.lbl_status.config(text=f"{a:,} / {b:,} halaman")
+                elif pesan == "selesai":
+                    if a is None: return # Dibatalkan karena window ditutup
+                    info = a["info"]
+                    messagebox.showinfo("Berhasil", f"Backup tersimpan di:\n{a['file']}\n\n"
+                                        f"{info['transaksi']:,} transaksi, {a['byte'] / 2**20:,.1f} MB ✅", parent=self.win)
+                    self.win.destroy()
+                    return
+                else:
+                    messagebox.showerror("Error", f"Backup gagal: {a}", parent=self.win)
+                    self.btn_backup.config(state="normal")
+                    return
+        except queue.Empty:
+            pass
+        self.win.after(100, self.cek_progress)
+
+    def on_close(self):
+        """Batalkan backup yang masih berjalan saat window ditutup."""
+        if self.thread and self.thread.is_alive():
+            self.batal.set()
+        self.win.destroy()
+
+# =============================================================================
+# 9. WINDOW ANGGARAN
+# Batas belanja bulanan per kategori. Pemakaiannya tidak dihitung di sini:
+# Dashboard membaca rekap bulanan lalu menggesernya per transaksi.
+# =============================================================================
+
+class AnggaranWindow:
+    def __init__(self, parent, pekerja, user, anggaran, setelah_simpan):
+        self.win = tk.Toplevel(parent)
+        self.win.title("🎯 Anggaran Bulanan")
+        self.win.geometry("380x420")
+        self.win.configure(bg=COLORS["cream"])
+        self.pekerja = pekerja
+        self.user = user
+        self.anggaran = anggaran
+        self.setelah_simpan = setelah_simpan
+
+        create_washi_tape(self.win)
+        tk.Label(self.win, text="Anggaran per Bulan 🎯", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
+        tk.Label(self.win, text="Kosongkan untuk tanpa anggaran", font=FONT_UI_S, bg=COLORS["cream"], fg="grey").pack()
+
+        frame_form = tk.Frame(self.win, bg=COLORS["cream"], padx=30)
+        frame_form.pack(fill="x", pady=5)
+        self.entry_batas = {}
+        for baris, kategori in enumerate(DAFTAR_KATEGORI):
+            tk.Label(frame_form, text=kategori, bg=COLORS["cream"], font=FONT_STD).grid(row=baris, column=0, sticky="w", pady=4)
+            entry = tk.Entry(frame_form, font=FONT_STD, bg="white", relief="flat", width=15, justify="right")
+            if kategori in anggaran:
+                entry.insert(0, f"{anggaran[kategori] // SEN_PER_RUPIAH:,}".replace(",", "."))
+            entry.grid(row=baris, column=1, sticky="e", padx=(10, 0), ipady=3)
+            self.entry_batas[kategori] = entry
+        frame_form.columnconfigure(1, weight=1)
+
+        tk.Button(self.win, text="Simpan Anggaran ✨", bg=COLORS["lime"], fg=COLORS["text"], font=FONT_TITLE_M,
+                  relief="flat", cursor="hand2", command=self.simpan).pack(fill="x", padx=30, pady=15, ipady=3)
+
+    def simpan(self):
+        try:
+            baru = {}
+            for kategori, entry in self.entry_batas.items():
+                angka = entry.get().strip().replace(".", "")
+                baru[kategori] = ke_sen(angka) if angka else None
+                if baru[kategori] is not None and baru[kategori] < 0:
+                    raise ValueError(angka)
+        except ValueError:
+            return messagebox.showerror("Error", "Anggaran harus angka ya 🥺", parent=self.win)
+
+        for kategori, batas in baru.items():
+            if batas != self.anggaran.get(kategori):
+                self.pekerja.kirim("simpan_anggaran", self.user, kategori, batas)
+        self.setelah_simpan() # Antrean FIFO: dibaca ulang setelah semua anggaran tersimpan
+        self.win.destroy()
+
+# =============================================================================
+# 10. WINDOW TRANSAKSI RUTIN
+# Aturan gaji / biaya tetap. Kejadian yang sudah jatuh tempo dibuat oleh
+# DatabaseManager.jalankan_rutin (saat login, setelah aturan ditambah, atau
+# lewat wallet_cli.py recurring run).
+# =============================================================================
+
+class RutinWindow:
+    NAMA_SATUAN = {"hari": "Harian", "minggu": "Mingguan", "bulan": "Bulanan"}
+
+    def __init__(self, parent, pekerja, user, setelah_jalan):
+        self.win = tk.Toplevel(parent)
+        self.win.title("🔁 Transaksi Rutin")
+        self.win.geometry("640x560")
+        self.win.configure(bg=COLORS["cream"])
+        self.pekerja = pekerja
+        self.user = user
+        self.setelah_jalan = setelah_jalan
+        self.kunci = (id(self), "rutin")
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        create_washi_tape(self.win)
+        tk.Label(self.win, text="Transaksi Rutin 🔁", font=FONT_TITLE_M, bg=COLORS["cream"], fg=COLORS["text"]).pack(pady=10)
+
+        cols = ("Deskripsi", "Nominal", "Kategori", "Jadwal", "Sampai", "Terakhir")
+        self.tree = ttk.Treeview(self.win, columns=cols, show="headings", height=7)
+        for c in cols: self.tree.heading(c, text=c)
+        for c, lebar in zip(cols, (140, 100, 100, 100, 80, 80)): self.tree.column(c, width=lebar)
+        self.tree.pack(fill="x", padx=20)
+        tk.Button(self.win, text="🗑️ Hapus Aturan", bg=COLORS["rose"], fg="white", bd=0, font=FONT_UI_S,
+                  cursor="hand2", command=self.hapus).pack(anchor="e", padx=20, pady=5)
+
+        frame_form = tk.LabelFrame(self.win, text=" Aturan Baru ", font=FONT_UI_S, bg="white", bd=0, padx=15, pady=10)
+        frame_form.pack(fill="x", padx=20, pady=5)
+        self.entry_desc = self.isian(frame_form, 0, "Keperluan:")
+        self.entry_nom = self.isian(frame_form, 1, "Nominal:")
+        tk.Label(frame_form, text="Kategori:", bg="white", font=FONT_UI_S).grid(row=2, column=0, sticky="e", pady=3)
+        self.combo_kategori = ttk.Combobox(frame_form, values=DAFTAR_KATEGORI, font=FONT_STD, state="readonly", width=18)
+        self.combo_kategori.set("💰 Gaji")
+        self.combo_kategori.grid(row=2, column=1, sticky="w", padx=10)
+        self.var_jenis = tk.StringVar(value="Pemasukan")
+        frame_jenis = tk.Frame(frame_form, bg="white")
+        frame_jenis.grid(row=3, column=1, sticky="w", padx=10)
+        for jenis in ("Pemasukan", "Pengeluaran"):
+            tk.Radiobutton(frame_jenis, text=jenis, variable=self.var_jenis, value=jenis, bg="white",
+                           font=FONT_STD, activebackground="white").pack(side="left")
+
+        tk.Label(frame_form, text="Setiap:", bg="white", font=FONT_UI_S).grid(row=4, column=0, sticky="e", pady=3)
+        frame_jadwal = tk.Frame(frame_form, bg="white")
+        frame_jadwal.grid(row=4, column=1, sticky="w", padx=10)
+        self.spin_setiap = tk.Spinbox(frame_jadwal, from_=1, to=365, font=FONT_STD, relief="flat", width=4, bg=COLORS["cream"])
+        self.spin_setiap.pack(side="left")
+        self.combo_satuan = ttk.Combobox(frame_jadwal, values=SATUAN_RUTIN, font=FONT_STD, state="readonly", width=8)
+        self.combo_satuan.set("bulan")
+        self.combo_satuan.pack(side="left", padx=5)
+        self.entry_mulai = self.isian(frame_form, 5, "Mulai (YYYY-MM-DD):")
+        self.entry_mulai.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.entry_selesai = self.isian(frame_form, 6, "Sampai (opsional):")
+
+        tk.Button(self.win, text="Simpan Aturan ✨", bg=COLORS["lime"], fg=COLORS["text"], font=FONT_TITLE_M,
+                  relief="flat", cursor="hand2", command=self.simpan).pack(fill="x", padx=20, pady=10, ipady=3)
+        self.muat()
+
+    def isian(self, parent, baris, teks):
+        tk.Label(parent, text=teks, bg="white", font=FONT_UI_S).grid(row=baris, column=0, sticky="e", pady=3)
+        entry = tk.Entry(parent, bg=COLORS["cream"], relief="flat", font=FONT_STD, width=22)
+        entry.grid(row=baris, column=1, sticky="w", padx=10, ipady=3)
+        return entry
+
+    def muat(self):
+        self.pekerja.kirim("ambil_rutin", self.user, kunci=self.kunci, selesai=self.tampilkan)
+
+    def tampilkan(self, daftar):
+        self.tree.delete(*self.tree.get_children())
+        for id_rutin, jenis, kategori, deskripsi, nominal, satuan, setiap, mulai, selesai, terakhir in daftar:
+            jadwal = self.NAMA_SATUAN[satuan] if setiap == 1 else f"tiap {setiap} {satuan}"
+            teks_nominal = ("+" if jenis == "Pemasukan" else "-") + format_rupiah(nominal)
+            self.tree.insert("", "end", iid=str(id_rutin), values=(deskripsi, teks_nominal, kategori, jadwal,
+                                                                  (selesai or "-")[:10], (terakhir or "-")[:10]))
+
+    def simpan(self):
+        desc = self.entry_desc.get().strip()
+        try:
+            nominal = ke_sen(self.entry_nom.get().strip().replace(".", ""))
+            setiap = int(self.spin_setiap.get())
+            mulai, selesai = self.entry_mulai.get().strip(), self.entry_selesai.get().strip()
+            for tgl in filter(None, (mulai, selesai)):
+                datetime.strptime(tgl, "%Y-%m-%d")
+        except ValueError:
+            return messagebox.showerror("Error", "Nominal/setiap harus angka dan tanggal pakai format YYYY-MM-DD ya 🥺",
+                                        parent=self.win)
+        if not desc or nominal <= 0 or setiap < 1:
+            return messagebox.showwarning("Eits!", "Keperluan dan nominal diisi dulu dong 😉", parent=self.win)
+
+        self.pekerja.kirim("tambah_rutin", self.user, self.var_jenis.get(), self.combo_kategori.get(), desc, nominal,
+                           self.combo_satuan.get(), setiap, mulai or None, selesai or None,
+                           gagal=lambda e: messagebox.showerror("Error", f"Gagal menyimpan aturan: {e}", parent=self.win))
+        # Kejadian yang sudah lewat (mulai di masa lalu) langsung dibuat sekaligus
+        self.pekerja.kirim("jalankan_rutin", self.user, selesai=self.setelah_jalan)
+        self.entry_desc.delete(0, "end")
+        self.entry_nom.delete(0, "end")
+        self.muat()
+
+    def hapus(self):
+        terpilih = self.tree.selection()
+        if not terpilih: return
+        if messagebox.askyesno("Hapus?", "Hapus aturan ini? Transaksi yang sudah tercatat tetap ada.", parent=self.win):
+            for iid in terpilih:
+                self.pekerja.kirim("hapus_rutin", self.user, int(iid))
+            self.muat()
+
+    def on_close(self):
+        self.pekerja.batalkan(self.kunci)
+        self.win.destroy()
 
 # =============================================================================
 # MAIN PROGRAM
 # =============================================================================
 
 if __name__ == "__main__":
+    # DOMPET_PROFIL=1 python wallet.py : aktifkan log query lambat & statistik per method
+    if aktifkan_dari_env():
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # DOMPET_BACKUP_DIR=backup python wallet.py : backup otomatis berkala selama aplikasi terbuka
+    wallet_backup.mulai_dari_env("dompet_pintar.db")
+
     root = tk.Tk()
     # Menjalankan Login Window terlebih dahulu
     app = LoginWindow(root)
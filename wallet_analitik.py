@@ -0,0 +1,168 @@
+"""
+Analitik Dompet Pintar: rincian kategori, tren belanja, dan prediksi Meteran Boros.
+
+Kolom array dari cache transaksi sesi (DatabaseManager.ambil_cache) dibaca
+langsung sebagai array NumPy (nominal int64, tanggal sebagai nomor hari int32,
+kategori sebagai kode integer kecil), lalu semua perhitungan memakai operasi
+vektor, tanpa loop Python per transaksi. Hasilnya di-cache sampai data user
+berubah (lihat DatabaseManager.ambil_versi_data).
+
+NumPy bersifat opsional: tanpa NumPy, aplikasi tetap jalan dan hanya fitur
+analitik yang tidak tersedia (cek NUMPY_TERSEDIA).
+"""
+import os
+import threading
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError: # NumPy belum terpasang (pip install numpy)
+    np = None
+
+NUMPY_TERSEDIA = np is not None
+
+HARI_TREN = 90       # Panjang grafik tren belanja 7 hari (dalam hari)
+BULAN_DITAMPILKAN = 12
+
+# =============================================================================
+# 1. DATA KOLOM
+# =============================================================================
+
+DETIK_PER_HARI = 86400
+
+class DataKolom:
+    """Transaksi satu user dalam bentuk kolom (semua array panjangnya sama)."""
+    def __init__(self, cache):
+        # np.frombuffer tidak menyalin; indexing dengan mask hidup yang membuat salinan,
+        # jadi cache tetap bebas ditambah setelah DataKolom dibuat.
+        hidup = np.frombuffer(cache.hidup, dtype=np.uint8).astype(bool)
+        self.nominal = np.frombuffer(cache.nominal, dtype=np.int64)[hidup]                       # sen
+        self.hari = (np.frombuffer(cache.waktu, dtype=np.int64)[hidup] // DETIK_PER_HARI).astype(np.int32) # hari sejak 1970-01-01
+        self.kategori = np.frombuffer(cache.kode_kategori, dtype=np.uint16)[hidup]               # kode kategori
+        self.masuk = np.frombuffer(cache.kode_jenis, dtype=np.uint8)[hidup] == 1                 # True = Pemasukan
+        self.nama_kategori = list(cache.nama_kategori)
+
+    def __len__(self):
+        return len(self.nominal)
+
+def muat_data(db, username):
+    """DataKolom dari cache transaksi user (dimuat dari database hanya sekali per sesi)."""
+    return DataKolom(db.ambil_cache(username))
+
+# =============================================================================
+# 2. PERHITUNGAN (SEMUA VEKTOR)
+# Semua nominal tetap int64 dalam sen supaya penjumlahan tepat.
+# =============================================================================
+
+def jumlah_per_kode(kode, nominal, panjang):
+    """Total nominal per kode (0..panjang-1), integer tepat."""
+    total = np.zeros(panjang, dtype=np.int64)
+    np.add.at(total, kode, nominal)
+    return total
+
+def hitung_analitik(data, hari_ini=None):
+    """
+    Menghitung semua angka analitik dari DataKolom. hari_ini = datetime.date
+    (default: hari ini) menjadi acuan jendela 7/30 hari dan prediksi bulan berjalan.
+    Mengembalikan dict berisi tipe Python biasa (nominal dalam sen).
+    """
+    hari_ini = hari_ini or date.today()
+    hari_akhir = int(np.datetime64(hari_ini, "D").astype(np.int32))
+    keluar = ~data.masuk
+
+    # --- Rincian per kategori ---
+    n_kategori = len(data.nama_kategori)
+    masuk_kategori = jumlah_per_kode(data.kategori[data.masuk], data.nominal[data.masuk], n_kategori)
+    keluar_kategori = jumlah_per_kode(data.kategori[keluar], data.nominal[keluar], n_kategori)
+    jumlah_kategori = np.bincount(data.kategori, minlength=n_kategori)
+    urutan = np.lexsort((-masuk_kategori, -keluar_kategori)) # Pengeluaran terbesar dulu
+    per_kategori = [(data.nama_kategori[i], int(masuk_kategori[i]), int(keluar_kategori[i]), int(jumlah_kategori[i]))
+                    for i in urutan if jumlah_kategori[i]] # Kategori yang semua barisnya sudah dihapus dilewati
+
+    # --- Belanja bergulir 7 & 30 hari (cumsum: jumlah jendela = selisih dua titik) ---
+    panjang = HARI_TREN + 30
+    hari_awal = hari_akhir - panjang + 1
+    dalam_jendela = keluar & (data.hari >= hari_awal) & (data.hari <= hari_akhir)
+    harian = jumlah_per_kode(data.hari[dalam_jendela] - hari_awal, data.nominal[dalam_jendela], panjang)
+    kumulatif = np.concatenate(([0], np.cumsum(harian)))
+    bergulir_7 = kumulatif[7:] - kumulatif[:-7]     # bergulir_7[i] = belanja 7 hari yang berakhir di hari ke-(i+6)
+    bergulir_30 = kumulatif[30:] - kumulatif[:-30]
+
+    # --- Per bulan & selisih bulan ke bulan ---
+    bulan = data.hari.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32) # bulan sejak 1970-01
+    bulan_ini = int(np.datetime64(hari_ini, "M").astype(np.int32))
+    bulan_awal = bulan_ini - BULAN_DITAMPILKAN  # Satu bulan ekstra sebagai pembanding bulan pertama
+    dalam_rentang = (bulan >= bulan_awal) & (data.hari <= hari_akhir) # Transaksi bertanggal masa depan diabaikan
+    idx_bulan = bulan[dalam_rentang] - bulan_awal
+    masuk_bulanan = jumlah_per_kode(idx_bulan[data.masuk[dalam_rentang]],
+                                    data.nominal[dalam_rentang & data.masuk], BULAN_DITAMPILKAN + 1)
+    keluar_bulanan = jumlah_per_kode(idx_bulan[keluar[dalam_rentang]],
+                                     data.nominal[dalam_rentang & keluar], BULAN_DITAMPILKAN + 1)
+    selisih_keluar = np.diff(keluar_bulanan)
+    bulanan = []
+    for i in range(1, BULAN_DITAMPILKAN + 1):
+        sebelumnya = int(keluar_bulanan[i - 1])
+        persen = round(int(selisih_keluar[i - 1]) / sebelumnya * 100, 1) if sebelumnya else None
+        label = str(np.datetime64(bulan_awal + i, "M"))
+        bulanan.append((label, int(masuk_bulanan[i]), int(keluar_bulanan[i]), int(selisih_keluar[i - 1]), persen))
+
+    # --- Prediksi Meteran Boros (burn rate bulan berjalan) ---
+    awal_bulan = int(np.datetime64(hari_ini, "M").astype("datetime64[D]").astype(np.int32))
+    hari_dalam_bulan = int((np.datetime64(hari_ini, "M") + 1).astype("datetime64[D]").astype(np.int32)) - awal_bulan
+    hari_berjalan = hari_akhir - awal_bulan + 1
+    keluar_bulan_ini = int(keluar_bulanan[-1])
+    masuk_bulan_ini = int(masuk_bulanan[-1])
+    proyeksi_keluar = keluar_bulan_ini * hari_dalam_bulan // hari_berjalan
+    # Acuan pemasukan: bulan ini, atau rata-rata 3 bulan sebelumnya jika bulan ini belum ada pemasukan
+    acuan_masuk = masuk_bulan_ini or int(masuk_bulanan[-4:-1].sum()) // 3
+    if acuan_masuk > 0:
+        proyeksi_persen = round(proyeksi_keluar / acuan_masuk * 100, 1)
+    else:
+        proyeksi_persen = 100.0 if proyeksi_keluar > 0 else 0.0
+
+    saldo = int(data.nominal[data.masuk].sum()) - int(data.nominal[keluar].sum())
+    rata_harian = int(bergulir_30[-1]) // 30
+    hari_sampai_habis = saldo // rata_harian if saldo > 0 and rata_harian > 0 else None
+
+    return {
+        "jumlah_transaksi": len(data),
+        "per_kategori": per_kategori,
+        "belanja_7_hari": int(bergulir_7[-1]),
+        "belanja_30_hari": int(bergulir_30[-1]),
+        "tren_7_hari": bergulir_7[-HARI_TREN:].tolist(),
+        "bulanan": bulanan,
+        "prediksi": {
+            "keluar_bulan_ini": keluar_bulan_ini,
+            "masuk_bulan_ini": masuk_bulan_ini,
+            "proyeksi_keluar_akhir_bulan": proyeksi_keluar,
+            "proyeksi_persen_boros": proyeksi_persen,
+            "rata_belanja_harian": rata_harian,
+            "saldo": saldo,
+            "hari_sampai_saldo_habis": hari_sampai_habis,
+        },
+    }
+
+# =============================================================================
+# 3. CACHE
+# Hasil disimpan per (file database, user, tanggal acuan) bersama versi data
+# saat dihitung; selama versinya sama, hasil lama dipakai ulang.
+# =============================================================================
+_cache = {}
+_cache_lock = threading.Lock()
+
+def analitik_user(db, username, hari_ini=None):
+    """Analitik user dari cache, atau dihitung ulang jika datanya sudah berubah."""
+    if not NUMPY_TERSEDIA:
+        raise RuntimeError("Fitur analitik butuh NumPy (pip install numpy)")
+    hari_ini = hari_ini or date.today()
+    kunci = (os.path.abspath(db.db_file), username)
+    versi = db.ambil_versi_data(username)
+    with _cache_lock:
+        tersimpan = _cache.get(kunci)
+    if tersimpan is not None and tersimpan[0] == (versi, hari_ini):
+        return tersimpan[1]
+
+    hasil = hitung_analitik(muat_data(db, username), hari_ini)
+    with _cache_lock:
+        _cache[kunci] = ((versi, hari_ini), hasil)
+    return hasil
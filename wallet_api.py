@@ -0,0 +1,259 @@
+"""
+API JSON lokal di atas database Dompet Pintar, supaya beberapa GUI, script,
+dan load test bisa memakai database yang sama bersamaan.
+
+Setiap koneksi klien punya thread ringan sendiri yang hanya mengurus HTTP;
+kerja database diserahkan PER REQUEST ke pool pembaca tetap (setiap thread
+punya koneksi read-only sendiri; mode WAL: pembaca tidak saling menunggu dan
+tidak menunggu penulis). Koneksi keep-alive yang diam tidak menahan pembaca,
+jadi jumlah klien boleh jauh lebih banyak dari --readers. Semua perubahan
+dikirim ke SATU thread penulis lewat antrian, jadi penulis tidak pernah
+berebut lock SQLite (tidak ada "database is locked").
+
+Nominal di JSON selalu dalam sen (integer), sama seperti output --json CLI.
+Server hanya mendengarkan 127.0.0.1 secara default; jika environment
+DOMPET_API_TOKEN diisi, setiap request wajib mengirim header X-Token.
+
+Contoh:
+    python wallet_api.py --port 8765 --readers 8
+    curl "http://127.0.0.1:8765/balance?user=budi"
+    curl "http://127.0.0.1:8765/history?user=budi&limit=50"
+    curl -X POST http://127.0.0.1:8765/transactions \\
+         -d '{"user": "budi", "jenis": "Pengeluaran", "kategori": "🍔 Makanan", "deskripsi": "Kopi", "nominal_sen": 2500000}'
+
+Endpoint:
+    POST /login                {user, password}            -> {ok}
+    GET  /balance              ?user=                      -> saldo & total
+    GET  /history              ?user=&limit=&after_tanggal=&after_id=  -> satu halaman (terbaru dulu)
+    GET  /yearly-report        ?user=&year=                -> rekap per bulan
+    POST /transactions         {user, jenis, kategori, deskripsi, nominal_sen}
+    POST /transactions/delete  {user, ids: [...]}
+"""
+import argparse
+import hmac
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from wallet_core import PoolKoneksi, aktifkan_dari_env, log
+from wallet_shard import buka_database
+
+KOLOM_TRANSAKSI = ("id", "user", "jenis", "kategori", "deskripsi", "nominal_sen", "tanggal")
+BATAS_HALAMAN = 500
+
+# =============================================================================
+# 1. PEMBACA & PENULIS
+# =============================================================================
+
+class PenulisTunggal:
+    """
+    Thread tunggal pemilik koneksi tulis. kirim() mengantre satu panggilan
+    method DatabaseManager dan menunggu hasilnya; karena hanya ada satu
+    penulis, perubahan dari banyak klien dijalankan berurutan tanpa bentrok lock.
+    """
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.antrian = queue.Queue()
+        self.thread = threading.Thread(target=self._jalan, name="penulis-db", daemon=True)
+        self.thread.start()
+
+    def kirim(self, nama_method, *args):
+        hasil = Future()
+        self.antrian.put((hasil, nama_method, args))
+        return hasil.result()
+
+    def _jalan(self):
+        db = buka_database(self.db_file)
+        try:
+            while True:
+                tugas = self.antrian.get()
+                if tugas is None:
+                    break
+                hasil, nama_method, args = tugas
+                try:
+                    hasil.set_result(getattr(db, nama_method)(*args))
+                except Exception as e:
+                    hasil.set_exception(e)
+        finally:
+            db.tutup()
+            PoolKoneksi.tutup_semua()
+
+    def hentikan(self):
+        self.antrian.put(None)
+        self.thread.join()
+
+class ServerAPI(ThreadingHTTPServer):
+    """
+    HTTP server dengan satu thread per koneksi klien (parsing HTTP saja), pool
+    pembaca tetap (satu koneksi read-only per thread) untuk query, dan satu penulis.
+    """
+    daemon_threads = True
+    request_queue_size = 128 # Backlog listen; default socketserver (5) me-reset koneksi saat banyak klien connect bersamaan
+
+    def __init__(self, alamat, db_file, jumlah_pembaca=8, token=None):
+        # Migrasi skema dijalankan sekali di sini, sebelum thread pembaca/penulis membuka koneksi
+        buka_database(db_file).tutup()
+        PoolKoneksi.tutup_semua()
+        super().__init__(alamat, PenanganAPI)
+        self.db_file = db_file
+        self.token = token
+        self.penulis = PenulisTunggal(db_file)
+        self.pool = ThreadPoolExecutor(max_workers=jumlah_pembaca, thread_name_prefix="pembaca-db")
+        self._lokal = threading.local()
+        self._pembaca = []  # Semua DatabaseManager baca yang pernah dibuka, ditutup di server_close
+        self._lock = threading.Lock()
+
+    def baca(self, nama_method, *args):
+        """Menjalankan satu method baca DatabaseManager di pool pembaca dan menunggu hasilnya."""
+        return self.pool.submit(self._baca, nama_method, args).result()
+
+    def _baca(self, nama_method, args):
+        # Dijalankan di thread pool: koneksi read-only milik thread ini dibuka sekali, dipakai untuk semua request
+        db = getattr(self._lokal, "db", None)
+        if db is None:
+            db = self._lokal.db = buka_database(self.db_file, baca_saja=True)
+            with self._lock:
+                self._pembaca.append(db)
+        return getattr(db, nama_method)(*args)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+        # Thread pool sudah berhenti, jadi koneksi baca aman ditutup dari sini
+        with self._lock:
+            for db in self._pembaca:
+                db.tutup()
+            self._pembaca.clear()
+        self.penulis.hentikan()
+
+# =============================================================================
+# 2. ENDPOINT
+# Setiap fungsi menerima (server, data) dan mengembalikan dict untuk JSON.
+# Data = parameter query + isi body JSON. KeyError/ValueError/TypeError = 400.
+# =============================================================================
+
+def baris_ke_dict(baris):
+    return dict(zip(KOLOM_TRANSAKSI, baris))
+
+def api_login(server, data):
+    return {"ok": server.baca("cek_login", data["user"], data["password"])}
+
+def api_balance(server, data):
+    saldo, total_masuk, total_keluar = server.baca("ambil_ringkasan", data["user"])
+    return {"user": data["user"], "saldo_sen": saldo, "total_masuk_sen": total_masuk, "total_keluar_sen": total_keluar}
+
+def api_history(server, data):
+    batas = min(int(data.get("limit", 50)), BATAS_HALAMAN)
+    setelah = (data["after_tanggal"], int(data["after_id"])) if data.get("after_tanggal") else None
+    daftar = server.baca("ambil_halaman", data["user"], setelah, batas)
+    berikutnya = {"after_tanggal": daftar[-1][6], "after_id": daftar[-1][0]} if len(daftar) == batas else None
+    return {"transaksi": [baris_ke_dict(baris) for baris in daftar], "berikutnya": berikutnya}
+
+def api_yearly_report(server, data):
+    tahun = int(data["year"])
+    rekap = {f"{i:02d}": {"masuk": 0, "keluar": 0} for i in range(1, 13)}
+    for bulan, jenis, total in server.baca("ambil_data_tahunan", data["user"], tahun):
+        rekap[bulan]["masuk" if jenis == "Pemasukan" else "keluar"] = total
+    return {"user": data["user"], "tahun": tahun, "bulan": rekap}
+
+def api_tambah(server, data):
+    if data["jenis"] not in ("Pemasukan", "Pengeluaran"):
+        raise ValueError("jenis harus Pemasukan atau Pengeluaran")
+    nominal = data["nominal_sen"]
+    if not isinstance(nominal, int) or isinstance(nominal, bool) or nominal <= 0:
+        raise ValueError("nominal_sen harus integer positif")
+    baris = server.penulis.kirim("tambah_data", data["user"], data["jenis"], data["kategori"],
+                                 data.get("deskripsi", ""), nominal)
+    return {"transaksi": baris_ke_dict(baris)}
+
+def api_hapus(server, data):
+    daftar_id = [int(i) for i in data["ids"]]
+    jumlah, total_masuk, total_keluar = server.penulis.kirim("hapus_banyak", data["user"], daftar_id)
+    return {"dihapus": jumlah, "total_masuk_sen": total_masuk, "total_keluar_sen": total_keluar}
+
+RUTE = {
+    ("POST", "/login"): api_login,
+    ("GET", "/balance"): api_balance,
+    ("GET", "/history"): api_history,
+    ("GET", "/yearly-report"): api_yearly_report,
+    ("POST", "/transactions"): api_tambah,
+    ("POST", "/transactions/delete"): api_hapus,
+}
+
+class PenanganAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive: klien memakai ulang koneksi TCP
+    timeout = 15                  # Koneksi keep-alive yang diam ditutup (hanya thread koneksi, bukan pembaca)
+    disable_nagle_algorithm = True # Header dan body dikirim terpisah; tanpa ini setiap respons tertahan ~40 ms (delayed ACK)
+
+    def do_GET(self):
+        self.layani("GET")
+
+    def do_POST(self):
+        self.layani("POST")
+
+    def layani(self, metode):
+        url = urlsplit(self.path)
+        panjang = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(panjang) if panjang else b""
+        fungsi = RUTE.get((metode, url.path))
+        if fungsi is None:
+            return self.kirim_json(404, {"error": f"tidak ada endpoint {metode} {url.path}"})
+        if self.server.token and not hmac.compare_digest(
+                (self.headers.get("X-Token") or "").encode("utf-8"), self.server.token.encode("utf-8")):
+            return self.kirim_json(401, {"error": "token salah"})
+        try:
+            data = dict(parse_qsl(url.query))
+            if body:
+                data.update(json.loads(body))
+            self.kirim_json(200, fungsi(self.server, data))
+        except KeyError as e:
+            self.kirim_json(400, {"error": f"parameter {e.args[0]} wajib diisi"})
+        except (ValueError, TypeError) as e:
+            self.kirim_json(400, {"error": str(e)})
+        except Exception as e:
+            log.exception("Request %s %s gagal", metode, url.path)
+            self.kirim_json(500, {"error": str(e)})
+
+    def kirim_json(self, status, isi):
+        badan = json.dumps(isi, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(badan)))
+        self.end_headers()
+        self.wfile.write(badan)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+# =============================================================================
+# 3. MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON lokal Dompet Pintar")
+    parser.add_argument("--db", default="dompet_pintar.db", help="lokasi file database (default: dompet_pintar.db)")
+    parser.add_argument("--host", default="127.0.0.1", help="alamat yang didengarkan (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--readers", type=int, default=8, help="jumlah thread/koneksi baca (default: 8)")
+    args = parser.parse_args(argv)
+    if aktifkan_dari_env():
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    server = ServerAPI((args.host, args.port), args.db, args.readers, os.environ.get("DOMPET_API_TOKEN"))
+    print(f"API Dompet Pintar di http://{args.host}:{server.server_address[1]} (Ctrl+C untuk berhenti)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
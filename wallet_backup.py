@@ -0,0 +1,322 @@
+"""
+Backup & restore database Dompet Pintar selagi aplikasi tetap dipakai.
+
+Menyalin file .db biasa saat aplikasi terbuka bisa menghasilkan salinan yang
+setengah jadi (perubahan di file -wal belum ikut). Modul ini memakai SQLite
+backup API (sqlite3.Connection.backup) dari koneksi read-only terpisah, sedikit
+demi sedikit per langkah halaman, jadi Dashboard tetap bisa baca/tulis selama
+backup berjalan dan hasilnya selalu snapshot yang konsisten.
+
+Setiap backup dicek dengan PRAGMA integrity_check, opsional dikompres gzip,
+lalu backup lama dirotasi (hanya N terbaru yang disimpan). Database mode
+shard (wallet_shard.py) ditolak: transaksinya tersebar di folder shard, jadi
+snapshot satu file direktori bukan backup yang utuh.
+
+Contoh:
+    python wallet_cli.py backup --output-dir backup --keep 7
+    python wallet_cli.py verify-backup --input backup/dompet_20250101-120000.db.gz
+    python wallet_cli.py restore --input backup/dompet_20250101-120000.db.gz
+"""
+import contextlib
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from wallet_core import PoolKoneksi, log
+
+HALAMAN_PER_LANGKAH = 1024   # Halaman (4 KB) disalin per langkah backup
+JEDA_LANGKAH = 0.005         # Detik jeda antar langkah, memberi kesempatan thread lain menulis
+LEVEL_GZIP = 3               # Level 6 hanya ~10% lebih kecil tetapi 2-3x lebih lambat
+POLA_FILE = re.compile(r"^dompet_\d{8}-\d{6}(_\d+)?\.db(\.gz)?$")
+
+class _Dibatalkan(Exception):
+    """Dilempar dari callback progress untuk menghentikan backup API."""
+
+# =============================================================================
+# 1. BACKUP
+# =============================================================================
+
+def salin_online(sumber, file_tujuan, halaman_per_langkah=HALAMAN_PER_LANGKAH, jeda=JEDA_LANGKAH,
+                 progress=None, batal=None):
+    """
+    Menyalin database dari koneksi `sumber` ke file_tujuan dengan backup API,
+    per langkah halaman. progress(disalin, total) dipanggil setiap langkah;
+    batal = threading.Event untuk menghentikan (melempar _Dibatalkan).
+
+    Selama menyalin, `sumber` menahan satu transaksi baca. Tanpa itu, setiap
+    commit dari koneksi lain membuat backup API mengulang dari halaman pertama,
+    dan backup database besar tidak pernah selesai selama aplikasi dipakai.
+    Di mode WAL transaksi baca ini tidak menghalangi penulis.
+    """
+    def langkah(status, sisa, total):
+        if batal is not None and batal.is_set():
+            raise _Dibatalkan()
+        if progress:
+            progress(total - sisa, total)
+
+    tujuan = sqlite3.connect(file_tujuan)
+    sumber.execute("BEGIN")
+    try:
+        sumber.execute("SELECT COUNT(*) FROM sqlite_master").fetchone() # Snapshot dimulai di sini
+        sumber.backup(tujuan, pages=halaman_per_langkah, progress=langkah, sleep=jeda)
+        # Snapshot berdiri sendiri: satu file tanpa -wal/-shm
+        tujuan.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        sumber.rollback()
+        tujuan.close()
+
+def _nama_baru(folder):
+    """Nama file backup berdasarkan waktu; diberi nomor jika detiknya sama."""
+    dasar = datetime.now().strftime("dompet_%Y%m%d-%H%M%S")
+    nama, nomor = dasar, 1
+    while any(os.path.exists(os.path.join(folder, nama + akhiran)) for akhiran in (".db", ".db.gz")):
+        nomor += 1
+        nama = f"{dasar}_{nomor}"
+    return os.path.join(folder, nama)
+
+def _tolak_mode_shard(file_db):
+    """ValueError jika file_db adalah direktori mode shard."""
+    conn = PoolKoneksi.buka_baca_saja(file_db)
+    try:
+        baris = conn.execute("SELECT nilai FROM pengaturan WHERE kunci = 'shard_folder'").fetchone()
+    except sqlite3.OperationalError:
+        return # Database lama tanpa tabel pengaturan
+    finally:
+        conn.close()
+    if baris:
+        raise ValueError(f"database dalam mode shard (transaksi ada di folder '{baris[0]}'); backup/restore "
+                         "hanya mencakup satu file. Tutup aplikasi lalu salin file database beserta folder shard")
+
+def _hapus_diam(*daftar_file):
+    for file in daftar_file:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file)
+
+def buat_backup(db_file, folder, kompres=True, verifikasi=True, simpan=None,
+                halaman_per_langkah=HALAMAN_PER_LANGKAH, jeda=JEDA_LANGKAH, progress=None, batal=None):
+    """
+    Membuat snapshot db_file di folder (dompet_YYYYMMDD-HHMMSS.db atau .db.gz).
+    File ditulis ke nama sementara dulu lalu di-rename, jadi folder backup tidak
+    pernah berisi backup setengah jadi. simpan = jumlah backup terbaru yang
+    dipertahankan (None = tanpa rotasi). ValueError untuk database mode shard.
+    Mengembalikan dict: file, byte, byte_asli, detik, info, terhapus
+    (None jika dibatalkan lewat batal).
+    """
+    mulai = time.perf_counter()
+    _tolak_mode_shard(db_file)
+    os.makedirs(folder, exist_ok=True)
+    dasar = _nama_baru(folder)
+    file_db = dasar + ".db"
+    sementara_db = file_db + ".tmp"
+    sementara_gz = file_db + ".gz.tmp"
+
+    sumber = PoolKoneksi.buka_baca_saja(db_file)
+    try:
+        salin_online(sumber, sementara_db, halaman_per_langkah, jeda, progress, batal)
+        info = _cek_integritas(sementara_db) if verifikasi else None
+        byte_asli = os.path.getsize(sementara_db)
+        if kompres:
+            file_akhir = file_db + ".gz"
+            with open(sementara_db, "rb") as f_in, gzip.open(sementara_gz, "wb", compresslevel=LEVEL_GZIP) as f_out:
+                shutil.copyfileobj(f_in, f_out, 1 << 20)
+            if verifikasi:
+                _cek_gzip(sementara_gz)
+            os.replace(sementara_gz, file_akhir)
+            os.remove(sementara_db)
+        else:
+            file_akhir = file_db
+            os.replace(sementara_db, file_akhir)
+    except _Dibatalkan:
+        return None
+    finally:
+        sumber.close()
+        _hapus_diam(sementara_db, sementara_gz)
+
+    terhapus = rotasi_backup(folder, simpan) if simpan else []
+    return {
+        "file": file_akhir,
+        "byte": os.path.getsize(file_akhir),
+        "byte_asli": byte_asli,
+        "detik": time.perf_counter() - mulai,
+        "info": info,
+        "terhapus": terhapus,
+    }
+
+# =============================================================================
+# 2. VERIFIKASI & ROTASI
+# =============================================================================
+
+def _cek_gzip(file_gz):
+    """Membaca file gzip sampai habis; gzip sendiri mengecek CRC & panjang di akhir."""
+    try:
+        with gzip.open(file_gz, "rb") as f:
+            while f.read(1 << 20):
+                pass
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"file gzip rusak: {e}") from e
+
+def _cek_integritas(file_db):
+    """
+    PRAGMA integrity_check pada file database (read-only).
+    Mengembalikan dict: versi_skema, user, transaksi. ValueError jika rusak.
+    """
+    try:
+        conn = PoolKoneksi.buka_baca_saja(file_db)
+    except sqlite3.Error as e:
+        raise ValueError(f"bukan file database: {e}") from e
+    try:
+        hasil = [baris[0] for baris in conn.execute("PRAGMA integrity_check")]
+        if hasil != ["ok"]:
+            raise ValueError("integrity_check gagal: " + "; ".join(hasil[:5]))
+        tabel = {baris[0] for baris in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {"users", "transaksi"} <= tabel:
+            raise ValueError("bukan database Dompet Pintar (tabel users/transaksi tidak ada)")
+        return {
+            "versi_skema": conn.execute("PRAGMA user_version").fetchone()[0],
+            "user": conn.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+            "transaksi": conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0],
+        }
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"database rusak: {e}") from e
+    finally:
+        conn.close()
+
+@contextlib.contextmanager
+def _buka_file_backup(file_backup):
+    """Path file .db yang bisa dibuka SQLite; backup .gz diekstrak dulu ke file sementara."""
+    if not os.path.isfile(file_backup):
+        raise FileNotFoundError(f"file backup tidak ditemukan: {file_backup}")
+    if not file_backup.endswith(".gz"):
+        yield file_backup
+        return
+    fd, sementara = tempfile.mkstemp(suffix=".db", prefix="dompet_pulih_")
+    try:
+        try:
+            with os.fdopen(fd, "wb") as f_out, gzip.open(file_backup, "rb") as f_in:
+                shutil.copyfileobj(f_in, f_out, 1 << 20)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            raise ValueError(f"file gzip rusak: {e}") from e
+        yield sementara
+    finally:
+        _hapus_diam(sementara)
+
+def verifikasi_backup(file_backup):
+    """Mengecek file backup (.db atau .db.gz). Mengembalikan dict info; ValueError jika rusak."""
+    with _buka_file_backup(file_backup) as file_db:
+        return _cek_integritas(file_db)
+
+def daftar_backup(folder):
+    """File backup di folder, terbaru dulu (urutan nama = urutan waktu)."""
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, nama) for nama in sorted(os.listdir(folder), reverse=True) if POLA_FILE.match(nama)]
+
+def rotasi_backup(folder, simpan):
+    """Menghapus backup lama sehingga tersisa `simpan` file terbaru. Mengembalikan file yang dihapus."""
+    if simpan < 1:
+        raise ValueError("jumlah backup yang disimpan minimal 1")
+    terhapus = daftar_backup(folder)[simpan:]
+    _hapus_diam(*terhapus)
+    return terhapus
+
+# =============================================================================
+# 3. RESTORE
+# =============================================================================
+
+def pulihkan_backup(file_backup, db_file, halaman_per_langkah=HALAMAN_PER_LANGKAH, progress=None):
+    """
+    Mengembalikan db_file dari file backup. Backup dicek dulu; isi database
+    saat ini disimpan ke <db_file>.sebelum-pulih sebelum ditimpa. Penimpaan
+    juga lewat backup API, jadi koneksi lain (GUI yang masih terbuka, proses
+    lain) tidak melihat file setengah tertulis, tetapi cache di memori milik
+    proses tersebut tidak ikut diperbarui: tutup aplikasi dulu sebelum restore.
+    Database mode shard (saat ini atau di dalam backup) ditolak dengan ValueError.
+    Mengembalikan dict: info (isi backup), cadangan (file cadangan atau None).
+    """
+    with _buka_file_backup(file_backup) as file_sumber:
+        info = _cek_integritas(file_sumber)
+        _tolak_mode_shard(file_sumber)
+        cadangan = None
+        if os.path.exists(db_file):
+            _tolak_mode_shard(db_file)
+            cadangan = db_file + ".sebelum-pulih"
+            sumber = PoolKoneksi.buka_baca_saja(db_file)
+            try:
+                salin_online(sumber, cadangan + ".tmp", halaman_per_langkah)
+            finally:
+                sumber.close()
+            os.replace(cadangan + ".tmp", cadangan)
+
+        sumber = sqlite3.connect(file_sumber)
+        tujuan = sqlite3.connect(db_file, timeout=30)
+        try:
+            sumber.backup(tujuan, pages=halaman_per_langkah,
+                          progress=(lambda status, sisa, total: progress(total - sisa, total)) if progress else None)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"restore gagal: {e}") from e
+        finally:
+            tujuan.close()
+            sumber.close()
+    return {"info": info, "cadangan": cadangan}
+
+# =============================================================================
+# 4. BACKUP BERKALA
+# Thread latar yang membuat backup setiap interval selama aplikasi terbuka.
+# Aktif jika DOMPET_BACKUP_DIR diisi (lihat mulai_dari_env).
+# =============================================================================
+
+class BackupBerkala:
+    """Membuat backup setiap `interval_detik` dan menyimpan `simpan` backup terbaru."""
+    def __init__(self, db_file, folder, interval_detik=24 * 3600, simpan=7, kompres=True):
+        self.db_file = db_file
+        self.folder = folder
+        self.interval_detik = interval_detik
+        self.simpan = simpan
+        self.kompres = kompres
+        self.berhenti = threading.Event()
+        self.thread = threading.Thread(target=self._jalan, name="dompet-backup", daemon=True)
+
+    def mulai(self):
+        self.thread.start()
+        return self
+
+    def hentikan(self):
+        self.berhenti.set()
+
+    def tunggu_berikutnya(self):
+        """Detik sampai backup berikutnya, dihitung dari umur backup terbaru di folder."""
+        terbaru = daftar_backup(self.folder)
+        if not terbaru:
+            return 0
+        umur = time.time() - os.path.getmtime(terbaru[0])
+        return max(0, self.interval_detik - umur)
+
+    def _jalan(self):
+        while not self.berhenti.wait(self.tunggu_berikutnya()):
+            try:
+                hasil = buat_backup(self.db_file, self.folder, self.kompres, simpan=self.simpan, batal=self.berhenti)
+                if hasil:
+                    log.info("Backup berkala tersimpan: %s (%.1f detik)", hasil["file"], hasil["detik"])
+            except (OSError, ValueError, sqlite3.Error) as e:
+                log.warning("Backup berkala gagal: %s", e)
+                self.berhenti.wait(min(self.interval_detik, 3600)) # Coba lagi nanti, jangan berulang terus
+
+def mulai_dari_env(db_file):
+    """
+    Menyalakan BackupBerkala jika environment variable DOMPET_BACKUP_DIR diisi
+    (interval: DOMPET_BACKUP_JAM, default 24; jumlah disimpan: DOMPET_BACKUP_SIMPAN, default 7).
+    Mengembalikan objek BackupBerkala atau None.
+    """
+    folder = os.environ.get("DOMPET_BACKUP_DIR")
+    if not folder:
+        return None
+    jam = float(os.environ.get("DOMPET_BACKUP_JAM", 24))
+    simpan = int(os.environ.get("DOMPET_BACKUP_SIMPAN", 7))
+    return BackupBerkala(db_file, folder, jam * 3600, simpan).mulai()
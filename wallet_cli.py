@@ -0,0 +1,413 @@
+"""
+Mode command line Dompet Pintar (tanpa GUI), untuk job terjadwal di server.
+Hanya memakai wallet_core, jadi tkinter tidak pernah dimuat.
+
+Contoh:
+    python wallet_cli.py balance --user budi
+    python wallet_cli.py yearly-report --user budi --year 2025
+    python wallet_cli.py export --user budi --output laporan.csv --from 2025-01-01 --to 2025-12-31
+    python wallet_cli.py import --user budi --input mutasi.csv --map tanggal=Tgl --map nominal=Jumlah
+    python wallet_cli.py budget --user budi --category "🍔 Makanan" --limit 1500000
+    python wallet_cli.py recurring add --user budi --desc "Gaji" --amount 5000000 --every 1 --unit bulan --start 2025-01-25
+    python wallet_cli.py recurring run
+    python wallet_cli.py statements --year 2025 --output-dir laporan_2025 --workers 4
+    python wallet_cli.py backup --output-dir backup --keep 7
+    python wallet_cli.py restore --input backup/dompet_20250101-120000.db.gz
+    python wallet_cli.py shard-split --output-dir shard --buckets 16
+    python wallet_cli.py export-changes --output perubahan.csv --checkpoint gudang
+"""
+import argparse
+import calendar
+import json
+import logging
+import sys
+from datetime import datetime
+
+from wallet_core import (
+    PERSEN_PERINGATAN_ANGGARAN, PETA_KOLOM_DEFAULT, SATUAN_RUTIN, SEN_PER_RUPIAH, aktifkan_dari_env, aktifkan_instrumentasi,
+    baca_csv_transaksi, format_rupiah, ke_sen,
+)
+from wallet_shard import buka_database, pecah_database
+
+def cmd_balance(db, args):
+    """Menampilkan saldo, total masuk, dan total keluar user."""
+    saldo, total_masuk, total_keluar = db.ambil_ringkasan(args.user)
+    if args.json:
+        # Nominal JSON dalam sen (integer) agar tepat saat diolah script lain
+        print(json.dumps({"user": args.user, "saldo_sen": saldo, "total_masuk_sen": total_masuk, "total_keluar_sen": total_keluar}))
+    else:
+        print(f"Saldo        : {format_rupiah(saldo)}")
+        print(f"Total masuk  : {format_rupiah(total_masuk)}")
+        print(f"Total keluar : {format_rupiah(total_keluar)}")
+    return 0
+
+def cmd_yearly_report(db, args):
+    """Menampilkan rekap masuk/keluar per bulan untuk satu tahun."""
+    rekap = {f"{i:02d}": {"masuk": 0, "keluar": 0} for i in range(1, 13)}
+    for bulan, jenis, total in db.ambil_data_tahunan(args.user, args.year):
+        rekap[bulan]["masuk" if jenis == "Pemasukan" else "keluar"] = total
+
+    if args.json:
+        # Nominal JSON dalam sen (integer)
+        print(json.dumps({"user": args.user, "tahun": args.year, "bulan": rekap}))
+        return 0
+
+    print(f"{'Bulan':<12}{'Masuk':>18}{'Keluar':>18}{'Selisih':>18}")
+    for i in range(1, 13):
+        data = rekap[f"{i:02d}"]
+        if data["masuk"] or data["keluar"]:
+            masuk, keluar = data["masuk"] / SEN_PER_RUPIAH, data["keluar"] / SEN_PER_RUPIAH
+            print(f"{calendar.month_name[i]:<12}{masuk:>18,.0f}{keluar:>18,.0f}{masuk - keluar:>18,.0f}")
+    return 0
+
+def cmd_export(db, args):
+    """Export riwayat user ke CSV (streaming, tanpa memuat semua data ke memori)."""
+    ditulis = db.ekspor_csv(args.user, args.output, args.dari, args.sampai, args.category)
+    print(f"{ditulis:,} baris ditulis ke {args.output}")
+    return 0
+
+def cmd_export_changes(db, args):
+    """Export inkremental semua user: hanya transaksi yang berubah sejak export terakhir checkpoint ini."""
+    if args.drop:
+        db.hapus_checkpoint(args.checkpoint)
+        print(f"Checkpoint '{args.checkpoint}' dihapus")
+        return 0
+    if not args.output:
+        raise ValueError("--output wajib diisi")
+    if args.reset:
+        db.reset_checkpoint(args.checkpoint)
+    hasil = db.ekspor_perubahan(args.output, args.checkpoint)
+    print(f"{hasil['baris']:,} baris ditulis ke {args.output}")
+    for sumber in hasil["per_file"]:
+        jenis = "export penuh" if sumber["seq_lama"] is None else f"perubahan seq {sumber['seq_lama']:,}..{sumber['seq_baru']:,}"
+        print(f"  {sumber['sumber']}: {sumber['baris']:,} baris ({jenis})")
+    return 0
+
+def cmd_import(db, args):
+    """Import transaksi massal dari CSV."""
+    peta = dict(PETA_KOLOM_DEFAULT)
+    if args.map:
+        peta = {}
+        for pasangan in args.map:
+            field, _, kolom = pasangan.partition("=")
+            peta[field.strip()] = kolom.strip()
+
+    laporan = db.impor_transaksi(args.user, baca_csv_transaksi(args.input, peta, args.delimiter),
+                                 buang_duplikat=not args.keep_duplicates)
+    print(f"Diimport : {laporan['diimpor']:,}")
+    print(f"Duplikat : {laporan['duplikat']:,}")
+    print(f"Ditolak  : {len(laporan['ditolak']):,}")
+    print(f"Waktu    : {laporan['detik']:.2f} detik ({laporan['baris_per_detik']:,.0f} baris/detik)")
+    for nomor_baris, alasan in laporan["ditolak"][:20]:
+        print(f"  baris {nomor_baris}: {alasan}", file=sys.stderr)
+    return 0
+
+def cmd_search(db, args):
+    """Mencari transaksi (full-text deskripsi + filter), terbaru dulu."""
+    hasil = db.cari_transaksi(args.user, args.text, args.category, args.type, args.dari, args.sampai,
+                              ke_sen(args.min) if args.min else None, ke_sen(args.max) if args.max else None,
+                              batas=args.limit)
+    for id_transaksi, _, jenis, kategori, deskripsi, nominal, tanggal in hasil:
+        print(f"{id_transaksi:>8}  {tanggal}  {jenis:<11}  {kategori:<12}  {format_rupiah(nominal):>16}  {deskripsi}")
+    print(f"{len(hasil):,} transaksi ditemukan", file=sys.stderr)
+    return 0
+
+def cmd_budget(db, args):
+    """Mengatur (--category + --limit) atau menampilkan anggaran bulanan per kategori."""
+    if args.category:
+        if args.limit is None:
+            raise ValueError("--limit wajib diisi bersama --category (0 = hapus anggaran)")
+        db.simpan_anggaran(args.user, args.category, ke_sen(args.limit))
+    bulan = args.month or datetime.now().strftime("%Y-%m")
+    anggaran = db.ambil_anggaran(args.user, bulan)
+    if args.json:
+        # Nominal JSON dalam sen (integer)
+        print(json.dumps({"user": args.user, "bulan": bulan,
+                          "anggaran": {k: {"batas_sen": b, "terpakai_sen": t} for k, (b, t) in anggaran.items()}},
+                         ensure_ascii=False))
+        return 0
+
+    print(f"{'Kategori':<16}{'Anggaran':>18}{'Terpakai':>18}{'%':>7}")
+    for kategori, (batas, terpakai) in sorted(anggaran.items()):
+        persen = terpakai * 100 / batas
+        tanda = " ‼️" if persen >= 100 else " ⚠️" if persen >= PERSEN_PERINGATAN_ANGGARAN else ""
+        print(f"{kategori:<16}{format_rupiah(batas):>18}{format_rupiah(terpakai):>18}{persen:>6.0f}%{tanda}")
+    if not anggaran:
+        print("Belum ada anggaran", file=sys.stderr)
+    return 0
+
+def cmd_recurring(db, args):
+    """Aturan transaksi rutin: add / list / delete, dan run (catch-up kejadian yang jatuh tempo)."""
+    if args.aksi != "run" and not args.user:
+        raise ValueError("--user wajib diisi")
+    if args.aksi == "add":
+        if not args.desc or not args.amount:
+            raise ValueError("--desc dan --amount wajib diisi")
+        id_rutin = db.tambah_rutin(args.user, args.type, args.category, args.desc, ke_sen(args.amount),
+                                   args.unit, args.every, args.start, args.end)
+        print(f"Aturan #{id_rutin} disimpan ✅")
+    elif args.aksi == "delete":
+        if args.id is None:
+            raise ValueError("--id wajib diisi")
+        if not db.hapus_rutin(args.user, args.id):
+            print(f"Aturan #{args.id} tidak ditemukan", file=sys.stderr)
+            return 1
+        print(f"Aturan #{args.id} dihapus")
+        return 0
+    elif args.aksi == "list":
+        print(f"{'ID':>4}  {'Jenis':<11}  {'Kategori':<12}  {'Nominal':>16}  {'Jadwal':<12}  {'Terakhir':<10}  Deskripsi")
+        for id_rutin, jenis, kategori, deskripsi, nominal, satuan, setiap, _, selesai, terakhir in db.ambil_rutin(args.user):
+            print(f"{id_rutin:>4}  {jenis:<11}  {kategori:<12}  {format_rupiah(nominal):>16}  "
+                  f"{f'{setiap} {satuan}':<12}  {(terakhir or '-')[:10]:<10}  {deskripsi}"
+                  + (f" (sampai {selesai[:10]})" if selesai else ""))
+        return 0
+
+    # add & run: buat semua kejadian yang sudah jatuh tempo (satu commit)
+    per_user = db.jalankan_rutin(args.user)
+    for username, jumlah in sorted(per_user.items()):
+        print(f"{username}: {jumlah:,} transaksi rutin dibuat")
+    print(f"Total {sum(per_user.values()):,} transaksi dari {len(per_user):,} user", file=sys.stderr)
+    return 0
+
+def cmd_analytics(db, args):
+    """Analitik belanja (butuh NumPy): rincian kategori, tren, dan prediksi akhir bulan."""
+    import wallet_analitik
+    hasil = wallet_analitik.analitik_user(db, args.user)
+    if args.json:
+        # Nominal JSON dalam sen (integer)
+        print(json.dumps(hasil, ensure_ascii=False))
+        return 0
+
+    prediksi = hasil["prediksi"]
+    print(f"Belanja 7 hari   : {format_rupiah(hasil['belanja_7_hari'])}")
+    print(f"Belanja 30 hari  : {format_rupiah(hasil['belanja_30_hari'])}")
+    print(f"Prediksi keluar  : {format_rupiah(prediksi['proyeksi_keluar_akhir_bulan'])} akhir bulan "
+          f"(Meteran Boros ± {prediksi['proyeksi_persen_boros']:.0f}%)")
+    print(f"\n{'Kategori':<16}{'Masuk':>18}{'Keluar':>18}{'Transaksi':>12}")
+    for kategori, masuk, keluar, jumlah in hasil["per_kategori"]:
+        print(f"{kategori:<16}{format_rupiah(masuk):>18}{format_rupiah(keluar):>18}{jumlah:>12,}")
+    print(f"\n{'Bulan':<10}{'Keluar':>18}{'Selisih':>18}{'%':>9}")
+    for bulan, _, keluar, selisih, persen in hasil["bulanan"]:
+        print(f"{bulan:<10}{format_rupiah(keluar):>18}{format_rupiah(selisih):>18}{'' if persen is None else f'{persen:+.1f}':>9}")
+    return 0
+
+def cmd_statements(db, args):
+    """Laporan tahunan semua user terdaftar, dibuat paralel di beberapa proses."""
+    import wallet_laporan
+    def progress(selesai, total):
+        print(f"\r{selesai:,} / {total:,} user", end="", file=sys.stderr, flush=True)
+
+    hasil = wallet_laporan.buat_laporan_semua_user(db.db_file, args.year, args.output_dir, args.workers,
+                                                   args.chunk, progress)
+    print(file=sys.stderr)
+    print(f"{hasil['user']:,} laporan ({hasil['transaksi']:,} transaksi) dalam {hasil['detik']:.2f} detik "
+          f"({hasil['user_per_detik']:,.1f} user/detik)")
+    print(f"Ringkasan: {hasil['file_ringkasan']}")
+    return 0
+
+def _progress_halaman(disalin, total):
+    print(f"\r{disalin:,} / {total:,} halaman", end="", file=sys.stderr, flush=True)
+
+def cmd_backup(db, args):
+    """Snapshot database yang konsisten (boleh selagi GUI terbuka), lalu rotasi backup lama."""
+    import wallet_backup
+    hasil = wallet_backup.buat_backup(db.db_file, args.output_dir, kompres=not args.no_compress,
+                                      verifikasi=not args.no_verify, simpan=args.keep, progress=_progress_halaman)
+    print(file=sys.stderr)
+    print(f"Backup tersimpan: {hasil['file']} ({hasil['byte'] / 2**20:,.1f} MB dari {hasil['byte_asli'] / 2**20:,.1f} MB) "
+          f"dalam {hasil['detik']:.2f} detik")
+    if hasil["info"]:
+        print(f"Terverifikasi ✅ {hasil['info']['user']:,} user, {hasil['info']['transaksi']:,} transaksi")
+    for file in hasil["terhapus"]:
+        print(f"Backup lama dihapus: {file}")
+    return 0
+
+def cmd_verify_backup(db, args):
+    """Mengecek keutuhan file backup tanpa mengubah database."""
+    import wallet_backup
+    info = wallet_backup.verifikasi_backup(args.input)
+    print(f"Backup utuh ✅ skema versi {info['versi_skema']}, {info['user']:,} user, {info['transaksi']:,} transaksi")
+    return 0
+
+def cmd_restore(db, args):
+    """Mengembalikan database dari file backup (tutup GUI dulu)."""
+    import wallet_backup
+    db.tutup()
+    hasil = wallet_backup.pulihkan_backup(args.input, args.db, progress=_progress_halaman)
+    print(file=sys.stderr)
+    print(f"Database dipulihkan ✅ {hasil['info']['user']:,} user, {hasil['info']['transaksi']:,} transaksi")
+    if hasil["cadangan"]:
+        print(f"Isi sebelumnya disimpan di: {hasil['cadangan']}")
+    return 0
+
+def cmd_shard_split(db, args):
+    """Memecah transaksi ke file shard per user / per bucket (bisa dijalankan ulang jika terputus)."""
+    db.tutup()
+    def progress(selesai, total):
+        print(f"\r{selesai:,} / {total:,} file shard", end="", file=sys.stderr, flush=True)
+
+    hasil = pecah_database(args.db, args.output_dir, args.buckets, progress)
+    print(file=sys.stderr)
+    print(f"{hasil['transaksi']:,} transaksi dipindah ke {hasil['file']:,} file shard "
+          f"({hasil['user']:,} user) dalam {hasil['detik']:.2f} detik ✅")
+    return 0
+
+def cmd_check_index(db, args):
+    """Memastikan query utama memakai index (EXPLAIN QUERY PLAN)."""
+    semua_oke = True
+    for nama, detail, pakai_index in db.cek_rencana_query():
+        print(f"{'OK  ' if pakai_index else 'SCAN'} {nama}: {detail}")
+        semua_oke = semua_oke and pakai_index
+    return 0 if semua_oke else 1
+
+def cmd_migrate(db, args):
+    """Migrasi skema sudah berjalan otomatis saat database dibuka; perintah ini hanya melaporkan hasilnya."""
+    versi = db.cursor.execute("PRAGMA user_version").fetchone()[0]
+    print(f"Skema database sudah di versi {versi} ✅")
+    return 0
+
+def cmd_rebuild_summary(db, args):
+    """Menghitung ulang ringkasan saldo dan rekap bulanan dari data transaksi mentah."""
+    db.bangun_ulang_ringkasan(args.user)
+    db.bangun_ulang_rekap_bulanan(args.user)
+    if not args.user:
+        db.bangun_ulang_fts()
+    print("Ringkasan saldo, rekap bulanan, dan index pencarian sudah dihitung ulang ✅")
+    return 0
+
+def buat_parser():
+    parser = argparse.ArgumentParser(prog="wallet_cli.py", description="Dompet Pintar versi command line")
+    parser.add_argument("--db", default="dompet_pintar.db", help="lokasi file database (default: dompet_pintar.db)")
+    parser.add_argument("--profil", action="store_true", help="catat statistik query dan log query lambat ke stderr")
+    parser.add_argument("--ambang-ms", type=float, default=50, help="ambang query lambat untuk --profil (default: 50)")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p = sub.add_parser("balance", help="tampilkan saldo user")
+    p.add_argument("--user", required=True)
+    p.add_argument("--json", action="store_true", help="output dalam format JSON")
+    p.set_defaults(fungsi=cmd_balance)
+
+    p = sub.add_parser("yearly-report", help="rekap masuk/keluar per bulan")
+    p.add_argument("--user", required=True)
+    p.add_argument("--year", required=True, type=int)
+    p.add_argument("--json", action="store_true", help="output dalam format JSON")
+    p.set_defaults(fungsi=cmd_yearly_report)
+
+    p = sub.add_parser("export", help="export riwayat transaksi ke CSV")
+    p.add_argument("--user", required=True)
+    p.add_argument("--output", required=True, help="file CSV tujuan")
+    p.add_argument("--from", dest="dari", help="tanggal awal YYYY-MM-DD (inklusif)")
+    p.add_argument("--to", dest="sampai", help="tanggal akhir YYYY-MM-DD (inklusif)")
+    p.add_argument("--category", help="hanya kategori ini")
+    p.set_defaults(fungsi=cmd_export)
+
+    p = sub.add_parser("export-changes", help="export inkremental semua user sejak checkpoint terakhir")
+    p.add_argument("--output", help="file CSV tujuan (wajib, kecuali dengan --drop)")
+    p.add_argument("--checkpoint", default="gudang", help="nama checkpoint (satu per pipeline, default: gudang)")
+    p.add_argument("--reset", action="store_true", help="export ulang semua transaksi dari awal")
+    p.add_argument("--drop", action="store_true", help="hapus checkpoint (berhenti mencatat perubahan untuknya)")
+    p.set_defaults(fungsi=cmd_export_changes)
+
+    p = sub.add_parser("import", help="import transaksi dari CSV")
+    p.add_argument("--user", required=True)
+    p.add_argument("--input", required=True, help="file CSV sumber")
+    p.add_argument("--map", action="append", metavar="FIELD=KOLOM",
+                   help="pemetaan kolom, bisa diulang (field: tanggal, jenis, kategori, deskripsi, nominal, masuk, keluar)")
+    p.add_argument("--delimiter", default=",")
+    p.add_argument("--keep-duplicates", action="store_true", help="jangan buang baris duplikat")
+    p.set_defaults(fungsi=cmd_import)
+
+    p = sub.add_parser("search", help="cari transaksi berdasarkan deskripsi dan filter")
+    p.add_argument("--user", required=True)
+    p.add_argument("--text", help="kata di deskripsi (semua kata harus ada, boleh awalan kata)")
+    p.add_argument("--category", help="hanya kategori ini")
+    p.add_argument("--type", choices=["Pemasukan", "Pengeluaran"], help="hanya jenis ini")
+    p.add_argument("--from", dest="dari", help="tanggal awal YYYY-MM-DD (inklusif)")
+    p.add_argument("--to", dest="sampai", help="tanggal akhir YYYY-MM-DD (inklusif)")
+    p.add_argument("--min", help="nominal minimum (Rupiah)")
+    p.add_argument("--max", help="nominal maksimum (Rupiah)")
+    p.add_argument("--limit", type=int, default=50, help="jumlah hasil maksimum (default: 50)")
+    p.set_defaults(fungsi=cmd_search)
+
+    p = sub.add_parser("budget", help="atur / tampilkan anggaran bulanan per kategori")
+    p.add_argument("--user", required=True)
+    p.add_argument("--category", help="kategori yang diatur anggarannya")
+    p.add_argument("--limit", help="batas per bulan (Rupiah, 0 = hapus anggaran)")
+    p.add_argument("--month", help="bulan YYYY-MM yang ditampilkan (default: bulan ini)")
+    p.add_argument("--json", action="store_true", help="output dalam format JSON")
+    p.set_defaults(fungsi=cmd_budget)
+
+    p = sub.add_parser("recurring", help="transaksi rutin: add / list / delete / run (catch-up)")
+    p.add_argument("aksi", choices=["add", "list", "delete", "run"])
+    p.add_argument("--user", help="wajib kecuali run (run tanpa --user = semua user)")
+    p.add_argument("--type", choices=["Pemasukan", "Pengeluaran"], default="Pemasukan")
+    p.add_argument("--category", default="💰 Gaji")
+    p.add_argument("--desc", help="deskripsi transaksi")
+    p.add_argument("--amount", help="nominal per kejadian (Rupiah)")
+    p.add_argument("--every", type=int, default=1, help="tiap berapa satuan (default: 1)")
+    p.add_argument("--unit", choices=SATUAN_RUTIN, default="bulan")
+    p.add_argument("--start", help="tanggal kejadian pertama (default: sekarang)")
+    p.add_argument("--end", help="tanggal terakhir (inklusif, default: tanpa akhir)")
+    p.add_argument("--id", type=int, help="ID aturan untuk delete")
+    p.set_defaults(fungsi=cmd_recurring)
+
+    p = sub.add_parser("analytics", help="analitik belanja per kategori, tren, dan prediksi (butuh NumPy)")
+    p.add_argument("--user", required=True)
+    p.add_argument("--json", action="store_true", help="output dalam format JSON")
+    p.set_defaults(fungsi=cmd_analytics)
+
+    p = sub.add_parser("statements", help="laporan tahunan CSV untuk semua user (paralel)")
+    p.add_argument("--year", required=True, type=int)
+    p.add_argument("--output-dir", required=True, help="folder tujuan file laporan")
+    p.add_argument("--workers", type=int, help="jumlah proses worker (default: jumlah core CPU)")
+    p.add_argument("--chunk", type=int, help="jumlah user per tugas worker (default: otomatis, ~4 tugas per worker)")
+    p.set_defaults(fungsi=cmd_statements)
+
+    p = sub.add_parser("backup", help="backup database (aman selagi aplikasi terbuka)")
+    p.add_argument("--output-dir", required=True, help="folder tujuan backup")
+    p.add_argument("--keep", type=int, help="simpan hanya N backup terbaru di folder")
+    p.add_argument("--no-compress", action="store_true", help="simpan sebagai .db biasa (tanpa gzip)")
+    p.add_argument("--no-verify", action="store_true", help="lewati PRAGMA integrity_check")
+    p.set_defaults(fungsi=cmd_backup)
+
+    p = sub.add_parser("verify-backup", help="cek keutuhan file backup")
+    p.add_argument("--input", required=True, help="file backup (.db atau .db.gz)")
+    p.set_defaults(fungsi=cmd_verify_backup)
+
+    p = sub.add_parser("restore", help="kembalikan database dari file backup")
+    p.add_argument("--input", required=True, help="file backup (.db atau .db.gz)")
+    p.set_defaults(fungsi=cmd_restore)
+
+    p = sub.add_parser("shard-split", help="pecah database ke file SQLite per user / per bucket user")
+    p.add_argument("--output-dir", default="shard", help="folder file shard, relatif terhadap database (default: shard)")
+    p.add_argument("--buckets", type=int, default=0, help="jumlah bucket hash username (default: 0 = satu file per user)")
+    p.set_defaults(fungsi=cmd_shard_split)
+
+    p = sub.add_parser("check-index", help="cek query utama memakai index")
+    p.set_defaults(fungsi=cmd_check_index)
+
+    p = sub.add_parser("migrate", help="jalankan migrasi skema (bisa dilanjutkan jika terputus)")
+    p.set_defaults(fungsi=cmd_migrate)
+
+    p = sub.add_parser("rebuild-summary", help="hitung ulang ringkasan saldo, rekap bulanan, dan index pencarian")
+    p.add_argument("--user", help="hanya user ini (default: semua user, termasuk index pencarian)")
+    p.set_defaults(fungsi=cmd_rebuild_summary)
+    return parser
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+    instrumen = aktifkan_instrumentasi(args.ambang_ms) if args.profil else aktifkan_dari_env()
+    if instrumen:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    try:
+        with buka_database(args.db) as db:
+            return args.fungsi(db, args)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if instrumen:
+            print(instrumen.ringkasan(), file=sys.stderr)
+
+if __name__ == "__main__":
+    sys.exit(main())
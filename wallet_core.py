@@ -0,0 +1,1965 @@
+"""
+Inti aplikasi Dompet Pintar: database dan logika transaksi.
+Modul ini sengaja TIDAK mengimpor tkinter, sehingga bisa dipakai di server
+tanpa layar (lihat wallet_cli.py) maupun oleh GUI di wallet.py.
+"""
+import sqlite3
+import bisect
+import calendar
+import contextlib
+import csv
+import functools
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+# =============================================================================
+# 1. KONFIGURASI GLOBAL
+# =============================================================================
+
+# Pilihan kategori transaksi (dipakai form input dan filter)
+DAFTAR_KATEGORI = ["🍔 Makanan", "🚗 Transport", "🛍️ Belanja", "💰 Gaji", "💅 Skincare", "✨ Lainnya"]
+
+# Anggaran bulanan per kategori: peringatan saat terpakai >= persen ini, "jebol" saat >= 100%
+PERSEN_PERINGATAN_ANGGARAN = 80
+
+# Semua nominal di database disimpan sebagai INTEGER dalam satuan sen
+# (1 Rupiah = 100 sen), supaya penjumlahan selalu tepat tanpa pembulatan float.
+SEN_PER_RUPIAH = 100
+
+def ke_sen(nilai):
+    """Mengubah nominal Rupiah (int/float/str/Decimal) menjadi integer sen."""
+    try:
+        sen = Decimal(str(nilai)) * SEN_PER_RUPIAH
+        return int(sen.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"nominal tidak valid: {nilai!r}")
+
+def format_rupiah(sen):
+    """Teks untuk ditampilkan di layar: 150000 sen -> 'Rp 1,500'."""
+    return f"Rp {sen / SEN_PER_RUPIAH:,.0f}"
+
+def teks_rupiah(sen):
+    """Angka Rupiah polos yang tepat untuk CSV/JSON: 150000 -> '1500', 150050 -> '1500.50'."""
+    rupiah, sisa = divmod(abs(sen), SEN_PER_RUPIAH)
+    tanda = "-" if sen < 0 else ""
+    return f"{tanda}{rupiah}" if sisa == 0 else f"{tanda}{rupiah}.{sisa:02d}"
+
+# =============================================================================
+# 2. DATABASE MANAGER
+# Menangani semua koneksi ke SQLite (Create, Read, Delete).
+# =============================================================================
+def rentang_tahun(tahun):
+    """Batas [awal, akhir) sebuah tahun dalam format kolom tanggal (agar bisa memakai index)."""
+    tahun = int(tahun)
+    return f"{tahun:04d}-01-01", f"{tahun + 1:04d}-01-01"
+
+def rentang_bulan(tahun, bulan):
+    """Batas [awal, akhir) sebuah bulan dalam format kolom tanggal."""
+    tahun, bulan = int(tahun), int(bulan)
+    awal = f"{tahun:04d}-{bulan:02d}-01"
+    akhir = f"{tahun + 1:04d}-01-01" if bulan == 12 else f"{tahun:04d}-{bulan + 1:02d}-01"
+    return awal, akhir
+
+def batas_atas_tanggal(sampai):
+    """'YYYY-MM-DD' inklusif -> batas atas eksklusif (hari berikutnya), agar filter tetap memakai index."""
+    besok = datetime.strptime(sampai, "%Y-%m-%d").toordinal() + 1
+    return datetime.fromordinal(besok).strftime("%Y-%m-%d")
+
+def query_fts(username, teks):
+    """
+    Menyusun query FTS5 yang aman dari input bebas user: setiap kata menjadi
+    prefix ("mak" cocok dengan "makan"), semua kata harus ada (AND), dan
+    hanya baris milik username yang ikut dicocokkan di dalam index FTS.
+    """
+    kata = ['"' + k.replace('"', '""') + '"*' for k in teks.split()]
+    return '{username} : "' + username.replace('"', '""') + '" AND deskripsi : (' + " ".join(kata) + ")"
+
+def nama_file_user(username):
+    """Nama file aman untuk username apa pun (karakter aneh diganti, ditambah hash agar tidak bentrok)."""
+    aman = re.sub(r"[^\w.-]", "_", username)
+    if aman != username or aman.startswith("."):
+        aman = f"{aman}_{zlib.crc32(username.encode('utf-8')):08x}"
+    return aman
+
+def rentang_tahun_rekap(tahun_awal, tahun_akhir=None):
+    """Batas [awal, akhir) kolom bulan (YYYY-MM) di tabel rekap_bulanan, dari tahun_awal s.d. tahun_akhir."""
+    tahun_awal = int(tahun_awal)
+    tahun_akhir = tahun_awal if tahun_akhir is None else int(tahun_akhir)
+    return f"{tahun_awal:04d}-01", f"{tahun_akhir + 1:04d}-01"
+
+# -----------------------------------------------------------------------------
+# POOL KONEKSI
+# Semua DatabaseManager di thread yang sama memakai SATU koneksi per file
+# database. Thread lain (misalnya export di background) otomatis mendapat
+# koneksi sendiri, karena objek koneksi SQLite tidak boleh dipakai lintas thread.
+# Mode WAL membuat pembaca tidak terblokir oleh penulis (dan sebaliknya).
+# -----------------------------------------------------------------------------
+PRAGMA_KONEKSI = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",    # Aman di mode WAL, fsync hanya saat checkpoint
+    "PRAGMA cache_size = -16000",     # Cache halaman ~16 MB
+    "PRAGMA mmap_size = 268435456",   # Baca lewat memory-mapped I/O (256 MB)
+    "PRAGMA temp_store = MEMORY",     # Tabel/index sementara (sorting, import) di RAM
+)
+
+class PoolKoneksi:
+    _koneksi = {}  # (path, id_thread) -> [koneksi, jumlah_pemakai]
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _kunci(db_file):
+        return (os.path.abspath(db_file), threading.get_ident())
+
+    @staticmethod
+    def buka(db_file):
+        """Membuka koneksi baru yang sudah diatur (WAL, cache, prepared-statement cache)."""
+        conn = sqlite3.connect(db_file, timeout=10, cached_statements=256)
+        for pragma in PRAGMA_KONEKSI:
+            conn.execute(pragma)
+        return conn
+
+    @staticmethod
+    def buka_baca_saja(db_file, lintas_thread=False):
+        """
+        Koneksi read-only (mode=ro) di luar pool: pemiliknya tidak mungkin mengubah
+        database. lintas_thread=True mengizinkan koneksi ditutup dari thread lain
+        setelah thread pemakainya berhenti (misalnya saat server ditutup).
+        """
+        uri = "file:" + os.path.abspath(db_file).replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=10, cached_statements=256, check_same_thread=not lintas_thread)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA cache_size = -16000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+
+    @classmethod
+    def ambil(cls, db_file):
+        """Mengambil koneksi bersama untuk thread ini (dibuat jika belum ada)."""
+        if db_file == ":memory:":
+            return cls.buka(db_file) # Database memori selalu terpisah, tidak bisa dibagi
+        kunci = cls._kunci(db_file)
+        with cls._lock:
+            entri = cls._koneksi.get(kunci)
+            if entri is None:
+                entri = cls._koneksi[kunci] = [cls.buka(db_file), 0]
+            entri[1] += 1
+            return entri[0]
+
+    @classmethod
+    def lepas(cls, db_file, conn):
+        """Melepas pemakaian koneksi; koneksi ditutup saat pemakai terakhir selesai."""
+        if db_file == ":memory:":
+            conn.close()
+            return
+        kunci = cls._kunci(db_file)
+        with cls._lock:
+            entri = cls._koneksi.get(kunci)
+            if entri is None or entri[0] is not conn:
+                return
+            entri[1] -= 1
+            if entri[1] <= 0:
+                del cls._koneksi[kunci]
+                conn.close()
+
+    @classmethod
+    def tutup_semua(cls):
+        """Menutup semua koneksi milik thread ini (dipanggil saat aplikasi ditutup)."""
+        id_thread = threading.get_ident()
+        with cls._lock:
+            for kunci in [k for k in cls._koneksi if k[1] == id_thread]:
+                conn, _ = cls._koneksi.pop(kunci)
+                conn.close()
+
+# -----------------------------------------------------------------------------
+# INSTRUMENTASI (OPSIONAL)
+# Untuk mencari sumber "aplikasinya lambat". Mati secara default; aktifkan
+# lewat aktifkan_instrumentasi() atau environment variable DOMPET_PROFIL=1
+# (ambang query lambat: DOMPET_PROFIL_AMBANG_MS, default 50 ms).
+# -----------------------------------------------------------------------------
+log = logging.getLogger("dompet_pintar")
+
+BATAS_HISTOGRAM_MS = (1, 5, 10, 50, 100, 500, 1000) # Batas atas tiap ember histogram latensi
+
+INSTRUMENTASI = None # Diisi objek Instrumentasi saat diaktifkan
+
+class Instrumentasi:
+    def __init__(self, ambang_lambat_ms=50, ambang_stall_ms=100):
+        self.ambang_lambat_ms = ambang_lambat_ms   # Query di atas ini dicatat beserta EXPLAIN QUERY PLAN
+        self.ambang_stall_ms = ambang_stall_ms     # Handler Tk di atas ini dilaporkan sebagai stall
+        self.statistik = {}                        # nama -> dict statistik
+        self._lock = threading.Lock()              # Bisa dipanggil dari thread export/worker
+
+    def catat(self, nama, durasi_ms, baris=0):
+        """Menambahkan satu pengukuran ke statistik method/handler."""
+        ember = next((i for i, batas in enumerate(BATAS_HISTOGRAM_MS) if durasi_ms <= batas), len(BATAS_HISTOGRAM_MS))
+        with self._lock:
+            data = self.statistik.get(nama)
+            if data is None:
+                data = self.statistik[nama] = {"panggilan": 0, "total_ms": 0.0, "maks_ms": 0.0, "baris": 0,
+                                               "histogram": [0] * (len(BATAS_HISTOGRAM_MS) + 1)}
+            data["panggilan"] += 1
+            data["total_ms"] += durasi_ms
+            data["maks_ms"] = max(data["maks_ms"], durasi_ms)
+            data["baris"] += baris
+            data["histogram"][ember] += 1
+
+    def cek_query_lambat(self, conn, sql, params, durasi_ms):
+        """Mencatat query yang melewati ambang, lengkap dengan rencana eksekusinya."""
+        if durasi_ms < self.ambang_lambat_ms:
+            return
+        perintah = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        plan = ""
+        if perintah in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+            try:
+                baris_plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+                plan = " | ".join(b[3] for b in baris_plan)
+            except sqlite3.Error as e:
+                plan = f"(EXPLAIN gagal: {e})"
+        log.warning("Query lambat %.1f ms: %s\n    plan: %s", durasi_ms, " ".join(sql.split()), plan or "-")
+
+    def ringkasan(self):
+        """Tabel teks berisi statistik semua method, urut dari total waktu terbesar."""
+        kepala_histogram = " ".join(f"<={b}" for b in BATAS_HISTOGRAM_MS) + " >"
+        baris = [f"{'method':<36}{'panggilan':>10}{'total ms':>12}{'rata ms':>10}{'maks ms':>10}{'baris':>10}  histogram ms ({kepala_histogram})"]
+        with self._lock:
+            urutan = sorted(self.statistik.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            for nama, d in urutan:
+                rata = d["total_ms"] / d["panggilan"]
+                histogram = " ".join(str(n) for n in d["histogram"])
+                baris.append(f"{nama:<36}{d['panggilan']:>10}{d['total_ms']:>12.1f}{rata:>10.2f}{d['maks_ms']:>10.1f}{d['baris']:>10}  {histogram}")
+        return "\n".join(baris)
+
+def aktifkan_instrumentasi(ambang_lambat_ms=50, ambang_stall_ms=100):
+    """Menyalakan instrumentasi untuk semua DatabaseManager yang dibuat setelah ini."""
+    global INSTRUMENTASI
+    INSTRUMENTASI = Instrumentasi(ambang_lambat_ms, ambang_stall_ms)
+    return INSTRUMENTASI
+
+def instrumentasi_aktif():
+    """Objek Instrumentasi yang sedang aktif, atau None."""
+    return INSTRUMENTASI
+
+def aktifkan_dari_env():
+    """Menyalakan instrumentasi jika DOMPET_PROFIL diset (dipanggil oleh program utama)."""
+    if os.environ.get("DOMPET_PROFIL") and INSTRUMENTASI is None:
+        ambang = float(os.environ.get("DOMPET_PROFIL_AMBANG_MS", 50))
+        aktifkan_instrumentasi(ambang_lambat_ms=ambang, ambang_stall_ms=ambang * 2)
+    return INSTRUMENTASI
+
+def _jumlah_baris(hasil):
+    """Perkiraan jumlah baris dari nilai kembalian method DatabaseManager."""
+    if isinstance(hasil, list):
+        return len(hasil)
+    if isinstance(hasil, bool) or hasil is None:
+        return 0
+    if isinstance(hasil, int):
+        return hasil # contoh: jumlah baris hasil ekspor_csv
+    if isinstance(hasil, dict):
+        return hasil.get("diimpor", 0)
+    return 1
+
+def terukur(method):
+    """Decorator: mencatat jumlah panggilan, latensi, dan baris hasil sebuah method DatabaseManager."""
+    @functools.wraps(method)
+    def pembungkus(self, *args, **kwargs):
+        instrumen = INSTRUMENTASI
+        if instrumen is None:
+            return method(self, *args, **kwargs)
+        mulai = time.perf_counter()
+        hasil = method(self, *args, **kwargs)
+        instrumen.catat(method.__name__, (time.perf_counter() - mulai) * 1000, _jumlah_baris(hasil))
+        return hasil
+    return pembungkus
+
+def pantau_stall(handler):
+    """
+    Decorator untuk event handler Tk: handler yang berjalan lebih lama dari
+    ambang_stall_ms berarti event loop (dan seluruh UI) tertahan selama itu.
+    """
+    @functools.wraps(handler)
+    def pembungkus(*args, **kwargs):
+        instrumen = INSTRUMENTASI
+        if instrumen is None:
+            return handler(*args, **kwargs)
+        mulai = time.perf_counter()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            durasi_ms = (time.perf_counter() - mulai) * 1000
+            instrumen.catat(f"ui:{handler.__qualname__}", durasi_ms)
+            if durasi_ms >= instrumen.ambang_stall_ms:
+                log.warning("Event loop Tk tertahan %.1f ms di %s", durasi_ms, handler.__qualname__)
+    return pembungkus
+
+class CursorTerukur:
+    """Pembungkus cursor SQLite yang mengukur setiap execute saat instrumentasi aktif."""
+    def __init__(self, cursor, instrumen):
+        self._cursor = cursor
+        self._instrumen = instrumen
+
+    def execute(self, sql, params=()):
+        mulai = time.perf_counter()
+        self._cursor.execute(sql, params)
+        durasi_ms = (time.perf_counter() - mulai) * 1000
+        self._instrumen.catat("sql:execute", durasi_ms)
+        self._instrumen.cek_query_lambat(self._cursor.connection, sql, params, durasi_ms)
+        return self
+
+    def executemany(self, sql, seq_params):
+        mulai = time.perf_counter()
+        self._cursor.executemany(sql, seq_params)
+        durasi_ms = (time.perf_counter() - mulai) * 1000
+        self._instrumen.catat("sql:executemany", durasi_ms, max(self._cursor.rowcount, 0))
+        if durasi_ms >= self._instrumen.ambang_lambat_ms:
+            log.warning("executemany lambat %.1f ms: %s", durasi_ms, " ".join(sql.split()))
+        return self
+
+    def executescript(self, script):
+        mulai = time.perf_counter()
+        self._cursor.executescript(script)
+        self._instrumen.catat("sql:executescript", (time.perf_counter() - mulai) * 1000)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, nama):
+        # fetchone/fetchall/fetchmany/rowcount/lastrowid/close diteruskan ke cursor asli
+        return getattr(self._cursor, nama)
+
+# -----------------------------------------------------------------------------
+# CACHE TRANSAKSI PER SESI
+# Riwayat satu user disimpan di memori sebagai kolom array (bukan list tuple):
+# id/waktu/nominal int64, jenis & kategori berupa kode kecil, username tidak
+# diulang per baris, deskripsi yang sama memakai satu objek string.
+# -----------------------------------------------------------------------------
+
+def ke_detik(tanggal):
+    """'YYYY-MM-DD HH:MM:SS' -> detik sejak 1970 (dibaca sebagai UTC agar bolak-balik tepat)."""
+    return calendar.timegm(time.strptime(tanggal, "%Y-%m-%d %H:%M:%S"))
+
+def dari_detik(detik):
+    """Kebalikan ke_detik()."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(detik))
+
+class CacheTransaksi:
+    """
+    Riwayat transaksi satu user, urut menurut id. Baris yang dihapus hanya
+    ditandai (kolom hidup) dan dibuang sekaligus saat sudah cukup banyak.
+    """
+    __slots__ = ("username", "versi", "id", "waktu", "nominal", "kode_jenis", "kode_kategori",
+                 "deskripsi", "hidup", "jumlah_hidup", "nama_kategori", "_kode", "_teks")
+    NAMA_JENIS = ("Pengeluaran", "Pemasukan") # kode_jenis 1 = Pemasukan
+
+    def __init__(self, username, versi=0):
+        self.username = username
+        self.versi = versi           # versi_data saat cache terakhir sinkron
+        self.id = array("q")
+        self.waktu = array("q")      # detik sejak 1970, lihat ke_detik()
+        self.nominal = array("q")    # sen
+        self.kode_jenis = array("B")
+        self.kode_kategori = array("H")
+        self.deskripsi = []
+        self.hidup = bytearray()     # 0 = sudah dihapus
+        self.jumlah_hidup = 0
+        self.nama_kategori = []      # kode -> nama
+        self._kode = {}              # nama -> kode
+        self._teks = {}              # deskripsi unik (satu objek per teks)
+
+    def __len__(self):
+        return self.jumlah_hidup
+
+    def tambah_banyak(self, baris):
+        """Menambah baris (id, detik, 1 jika Pemasukan, kategori, deskripsi, nominal); id harus naik dan lebih besar dari isi cache."""
+        if not baris:
+            return
+        daftar_id, waktu, masuk, kategori, deskripsi, nominal = zip(*baris)
+        if (self.id and daftar_id[0] <= self.id[-1]) or any(a >= b for a, b in zip(daftar_id, daftar_id[1:])):
+            raise ValueError("id baris baru harus naik dan lebih besar dari id terakhir cache")
+        for nama in set(kategori).difference(self._kode):
+            self._kode[nama] = len(self.nama_kategori)
+            self.nama_kategori.append(nama)
+        teks = self._teks
+        self.id.extend(daftar_id)
+        self.waktu.extend(waktu)
+        self.nominal.extend(nominal)
+        self.kode_jenis.extend(1 if m else 0 for m in masuk)
+        self.kode_kategori.extend(map(self._kode.__getitem__, kategori))
+        self.deskripsi.extend(teks.setdefault(d, d) for d in deskripsi)
+        self.hidup.extend(b"\x01" * len(daftar_id))
+        self.jumlah_hidup += len(daftar_id)
+
+    def tambah(self, *baris_transaksi):
+        """Menambah baris berbentuk hasil SELECT * (seperti kembalian tambah_data)."""
+        self.tambah_banyak([(id_transaksi, ke_detik(tanggal), jenis == "Pemasukan", kategori, deskripsi, nominal)
+                            for id_transaksi, _, jenis, kategori, deskripsi, nominal, tanggal in baris_transaksi])
+
+    def hapus(self, daftar_id):
+        """Menandai id sebagai terhapus (id yang tidak ada di cache diabaikan)."""
+        for id_transaksi in daftar_id:
+            i = bisect.bisect_left(self.id, id_transaksi)
+            if i < len(self.id) and self.id[i] == id_transaksi and self.hidup[i]:
+                self.hidup[i] = 0
+                self.jumlah_hidup -= 1
+        if len(self.hidup) - self.jumlah_hidup > len(self.hidup) // 2:
+            self.padatkan()
+
+    def padatkan(self):
+        """Membuang baris yang sudah ditandai terhapus."""
+        if self.jumlah_hidup == len(self.hidup):
+            return
+        sisa = [i for i, h in enumerate(self.hidup) if h]
+        for nama in ("id", "waktu", "nominal", "kode_jenis", "kode_kategori"):
+            kolom = getattr(self, nama)
+            setattr(self, nama, array(kolom.typecode, [kolom[i] for i in sisa]))
+        self.deskripsi = [self.deskripsi[i] for i in sisa]
+        self.hidup = bytearray(b"\x01") * len(sisa)
+        self._teks = {teks: teks for teks in self.deskripsi}
+
+    def baris(self):
+        """Generator baris berbentuk hasil SELECT * (urut id), username disusun ulang."""
+        for i, h in enumerate(self.hidup):
+            if h:
+                yield (self.id[i], self.username, self.NAMA_JENIS[self.kode_jenis[i]],
+                       self.nama_kategori[self.kode_kategori[i]], self.deskripsi[i],
+                       self.nominal[i], dari_detik(self.waktu[i]))
+
+    def ukuran_byte(self):
+        """Perkiraan memori cache (kolom + list deskripsi + teks unik), dalam byte."""
+        kolom = sum(k.buffer_info()[1] * k.itemsize
+                    for k in (self.id, self.waktu, self.nominal, self.kode_jenis, self.kode_kategori))
+        return (kolom + len(self.hidup) + sys.getsizeof(self.deskripsi)
+                + sum(sys.getsizeof(t) for t in self._teks) + sum(sys.getsizeof(n) for n in self.nama_kategori))
+
+class DatabaseManager:
+    def __init__(self, db_file="dompet_pintar.db", baca_saja=False):
+        self.db_file = db_file
+        self.baca_saja = baca_saja
+        self._fts_tersedia = None
+        self.cache = {} # username -> CacheTransaksi, lihat ambil_cache()
+        if baca_saja:
+            # Koneksi read-only sendiri (bukan dari pool); skema harus sudah dimigrasi penulis
+            self.conn = PoolKoneksi.buka_baca_saja(db_file, lintas_thread=True)
+            self.cursor = self.cursor_baru()
+        else:
+            self.conn = PoolKoneksi.ambil(db_file)
+            self.cursor = self.cursor_baru()
+            self.buat_tabel()
+
+    def cursor_baru(self):
+        """Cursor baru pada koneksi ini (terukur jika instrumentasi aktif)."""
+        cursor = self.conn.cursor()
+        return CursorTerukur(cursor, INSTRUMENTASI) if INSTRUMENTASI else cursor
+
+    def tutup(self):
+        """Melepas koneksi ke pool. Aman dipanggil lebih dari sekali."""
+        if self.conn is not None:
+            self.cursor.close()
+            if self.baca_saja:
+                self.conn.close()
+            else:
+                PoolKoneksi.lepas(self.db_file, self.conn)
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
+
+    def buat_tabel(self):
+        """Membuat tabel users dan transaksi jika belum ada."""
+        # Tabel untuk Login
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT
+        )
+        """)
+        # Tabel untuk Data Keuangan
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS transaksi (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT,
+            jenis TEXT,
+            kategori TEXT,
+            deskripsi TEXT,
+            nominal INTEGER NOT NULL, -- dalam sen
+            tanggal TEXT
+        )
+        """)
+        self.conn.commit()
+        self.jalankan_migrasi()
+
+    # -------------------------------------------------------------------------
+    # MIGRASI SKEMA
+    # Versi skema disimpan di PRAGMA user_version. Setiap langkah hanya
+    # dijalankan sekali, berurutan, untuk database lama maupun baru.
+    # -------------------------------------------------------------------------
+    def jalankan_migrasi(self):
+        """Menerapkan langkah migrasi yang belum pernah dijalankan."""
+        langkah_migrasi = [
+            self._migrasi_1_index_transaksi,
+            self._migrasi_2_ringkasan_user,
+            self._migrasi_3_nominal_integer,
+            self._migrasi_4_rekap_bulanan,
+            self._migrasi_5_pencarian,
+            self._migrasi_6_versi_data,
+            self._migrasi_7_direktori_shard,
+            self._migrasi_8_log_perubahan,
+            self._migrasi_9_anggaran,
+            self._migrasi_10_transaksi_rutin,
+        ]
+        versi = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        for nomor, migrasi in enumerate(langkah_migrasi, start=1):
+            if versi >= nomor:
+                continue
+            migrasi()
+            self.cursor.execute(f"PRAGMA user_version = {nomor}")
+            self.conn.commit()
+
+    def _migrasi_1_index_transaksi(self):
+        """Index komposit untuk riwayat per user dan rekap per jenis."""
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transaksi_user_tanggal ON transaksi (username, tanggal)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transaksi_user_jenis_tanggal ON transaksi (username, jenis, tanggal)")
+
+    def _migrasi_2_ringkasan_user(self):
+        """
+        Tabel ringkasan saldo per user yang dijaga oleh trigger, sehingga
+        header Dashboard cukup membaca satu baris (O(1)) berapa pun jumlah riwayatnya.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS ringkasan_user (
+            username TEXT PRIMARY KEY,
+            total_masuk INTEGER NOT NULL DEFAULT 0,  -- dalam sen
+            total_keluar INTEGER NOT NULL DEFAULT 0, -- dalam sen
+            jumlah_transaksi INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_ringkasan_insert AFTER INSERT ON transaksi
+        BEGIN
+            INSERT OR IGNORE INTO ringkasan_user (username) VALUES (NEW.username);
+            UPDATE ringkasan_user SET
+                total_masuk = total_masuk + (CASE WHEN NEW.jenis = 'Pemasukan' THEN NEW.nominal ELSE 0 END),
+                total_keluar = total_keluar + (CASE WHEN NEW.jenis = 'Pemasukan' THEN 0 ELSE NEW.nominal END),
+                jumlah_transaksi = jumlah_transaksi + 1
+            WHERE username = NEW.username;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_ringkasan_delete AFTER DELETE ON transaksi
+        BEGIN
+            UPDATE ringkasan_user SET
+                total_masuk = total_masuk - (CASE WHEN OLD.jenis = 'Pemasukan' THEN OLD.nominal ELSE 0 END),
+                total_keluar = total_keluar - (CASE WHEN OLD.jenis = 'Pemasukan' THEN 0 ELSE OLD.nominal END),
+                jumlah_transaksi = jumlah_transaksi - 1
+            WHERE username = OLD.username;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_ringkasan_update AFTER UPDATE OF username, jenis, nominal ON transaksi
+        BEGIN
+            UPDATE ringkasan_user SET
+                total_masuk = total_masuk - (CASE WHEN OLD.jenis = 'Pemasukan' THEN OLD.nominal ELSE 0 END),
+                total_keluar = total_keluar - (CASE WHEN OLD.jenis = 'Pemasukan' THEN 0 ELSE OLD.nominal END),
+                jumlah_transaksi = jumlah_transaksi - 1
+            WHERE username = OLD.username;
+            INSERT OR IGNORE INTO ringkasan_user (username) VALUES (NEW.username);
+            UPDATE ringkasan_user SET
+                total_masuk = total_masuk + (CASE WHEN NEW.jenis = 'Pemasukan' THEN NEW.nominal ELSE 0 END),
+                total_keluar = total_keluar + (CASE WHEN NEW.jenis = 'Pemasukan' THEN 0 ELSE NEW.nominal END),
+                jumlah_transaksi = jumlah_transaksi + 1
+            WHERE username = NEW.username;
+        END;
+        """)
+        self.bangun_ulang_ringkasan(commit=False)
+
+    def _migrasi_3_nominal_integer(self, ukuran_chunk=50000):
+        """
+        Mengubah kolom nominal dari REAL (Rupiah) menjadi INTEGER (sen).
+        Data disalin per chunk ke tabel baru dan setiap chunk langsung di-commit,
+        jadi jika proses terputus, migrasi berikutnya melanjutkan dari ID terakhir.
+        Tabel lama baru ditukar setelah semua baris tersalin.
+        """
+        kolom = {baris[1]: baris[2] for baris in self.cursor.execute("PRAGMA table_info(transaksi)").fetchall()}
+        if kolom["nominal"].upper() != "INTEGER":
+            self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS transaksi_sen (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT,
+                jenis TEXT,
+                kategori TEXT,
+                deskripsi TEXT,
+                nominal INTEGER NOT NULL, -- dalam sen
+                tanggal TEXT
+            )
+            """)
+            self.conn.commit()
+            while True:
+                self.cursor.execute("""
+                    INSERT INTO transaksi_sen (id, username, jenis, kategori, deskripsi, nominal, tanggal)
+                    SELECT id, username, jenis, kategori, deskripsi, CAST(ROUND(nominal * 100) AS INTEGER), tanggal
+                    FROM transaksi
+                    WHERE id > (SELECT COALESCE(MAX(id), 0) FROM transaksi_sen)
+                    ORDER BY id LIMIT ?
+                """, (ukuran_chunk,))
+                tersalin = self.cursor.rowcount
+                self.conn.commit()
+                if tersalin < ukuran_chunk:
+                    break
+
+            # Pertahankan urutan AUTOINCREMENT lama (ID yang pernah dihapus tidak dipakai ulang)
+            baris = self.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'transaksi'").fetchone()
+            seq_lama = baris[0] if baris else 0
+            self.cursor.executescript(f"""
+                BEGIN;
+                DROP TABLE transaksi;
+                ALTER TABLE transaksi_sen RENAME TO transaksi;
+                UPDATE sqlite_sequence SET seq = MAX(seq, {int(seq_lama)}) WHERE name = 'transaksi';
+                DROP TABLE IF EXISTS ringkasan_user;
+                COMMIT;
+            """)
+        # Index dan trigger ikut terhapus bersama tabel lama, jadi dibuat ulang.
+        # Langkah ini juga aman diulang jika migrasi sempat terputus setelah penukaran tabel.
+        self._migrasi_1_index_transaksi()
+        self._migrasi_2_ringkasan_user()
+
+    def _migrasi_4_rekap_bulanan(self):
+        """
+        Tabel rekap per (user, bulan, jenis, kategori) yang dijaga oleh trigger.
+        Arsip tahunan, perbandingan antar tahun, dan rincian kategori cukup membaca
+        paling banyak 12 x 2 x jumlah kategori baris per tahun, berapa pun jumlah transaksinya.
+        Baris rekap yang jumlahnya menjadi 0 langsung dihapus, jadi daftar tahun selalu sesuai data.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS rekap_bulanan (
+            username TEXT NOT NULL,
+            bulan TEXT NOT NULL, -- YYYY-MM
+            jenis TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0, -- dalam sen
+            jumlah INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, bulan, jenis, kategori)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rekap_insert AFTER INSERT ON transaksi
+        BEGIN
+            INSERT OR IGNORE INTO rekap_bulanan (username, bulan, jenis, kategori)
+            VALUES (NEW.username, substr(NEW.tanggal, 1, 7), NEW.jenis, NEW.kategori);
+            UPDATE rekap_bulanan SET total = total + NEW.nominal, jumlah = jumlah + 1
+            WHERE username = NEW.username AND bulan = substr(NEW.tanggal, 1, 7)
+              AND jenis = NEW.jenis AND kategori = NEW.kategori;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rekap_delete AFTER DELETE ON transaksi
+        BEGIN
+            UPDATE rekap_bulanan SET total = total - OLD.nominal, jumlah = jumlah - 1
+            WHERE username = OLD.username AND bulan = substr(OLD.tanggal, 1, 7)
+              AND jenis = OLD.jenis AND kategori = OLD.kategori;
+            DELETE FROM rekap_bulanan
+            WHERE username = OLD.username AND bulan = substr(OLD.tanggal, 1, 7)
+              AND jenis = OLD.jenis AND kategori = OLD.kategori AND jumlah <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rekap_update AFTER UPDATE OF username, jenis, kategori, nominal, tanggal ON transaksi
+        BEGIN
+            UPDATE rekap_bulanan SET total = total - OLD.nominal, jumlah = jumlah - 1
+            WHERE username = OLD.username AND bulan = substr(OLD.tanggal, 1, 7)
+              AND jenis = OLD.jenis AND kategori = OLD.kategori;
+            DELETE FROM rekap_bulanan
+            WHERE username = OLD.username AND bulan = substr(OLD.tanggal, 1, 7)
+              AND jenis = OLD.jenis AND kategori = OLD.kategori AND jumlah <= 0;
+            INSERT OR IGNORE INTO rekap_bulanan (username, bulan, jenis, kategori)
+            VALUES (NEW.username, substr(NEW.tanggal, 1, 7), NEW.jenis, NEW.kategori);
+            UPDATE rekap_bulanan SET total = total + NEW.nominal, jumlah = jumlah + 1
+            WHERE username = NEW.username AND bulan = substr(NEW.tanggal, 1, 7)
+              AND jenis = NEW.jenis AND kategori = NEW.kategori;
+        END;
+        """)
+        self.bangun_ulang_rekap_bulanan(commit=False)
+
+    def _migrasi_5_pencarian(self):
+        """
+        Index untuk filter kategori, dan index full-text (FTS5) atas deskripsi
+        yang disinkronkan lewat trigger. Kolom username ikut diindex di FTS supaya
+        pencarian langsung dipersempit ke milik satu user di dalam index.
+        Jika SQLite tidak dikompilasi dengan FTS5, pencarian jatuh ke LIKE.
+        """
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transaksi_user_kategori_tanggal ON transaksi (username, kategori, tanggal)")
+        try:
+            self.cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS transaksi_fts USING fts5(
+                    username, deskripsi, content='transaksi', content_rowid='id', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            log.warning("FTS5 tidak tersedia (%s), pencarian memakai LIKE", e)
+            return
+        self.cursor.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_fts_insert AFTER INSERT ON transaksi
+        BEGIN
+            INSERT INTO transaksi_fts (rowid, username, deskripsi) VALUES (NEW.id, NEW.username, NEW.deskripsi);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON transaksi
+        BEGIN
+            INSERT INTO transaksi_fts (transaksi_fts, rowid, username, deskripsi) VALUES ('delete', OLD.id, OLD.username, OLD.deskripsi);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_fts_update AFTER UPDATE OF username, deskripsi ON transaksi
+        BEGIN
+            INSERT INTO transaksi_fts (transaksi_fts, rowid, username, deskripsi) VALUES ('delete', OLD.id, OLD.username, OLD.deskripsi);
+            INSERT INTO transaksi_fts (rowid, username, deskripsi) VALUES (NEW.id, NEW.username, NEW.deskripsi);
+        END;
+        """)
+        self.bangun_ulang_fts(commit=False)
+
+    def _migrasi_6_versi_data(self):
+        """
+        Nomor versi data per user yang naik setiap kali transaksinya berubah
+        (insert/update/delete). Dipakai sebagai kunci cache hasil olahan
+        (misalnya analitik) tanpa perlu membandingkan isi data.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS versi_data (
+            username TEXT PRIMARY KEY,
+            versi INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_versi_insert AFTER INSERT ON transaksi
+        BEGIN
+            INSERT OR IGNORE INTO versi_data (username) VALUES (NEW.username);
+            UPDATE versi_data SET versi = versi + 1 WHERE username = NEW.username;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_versi_delete AFTER DELETE ON transaksi
+        BEGIN
+            UPDATE versi_data SET versi = versi + 1 WHERE username = OLD.username;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_versi_update AFTER UPDATE ON transaksi
+        BEGIN
+            INSERT OR IGNORE INTO versi_data (username) VALUES (NEW.username);
+            UPDATE versi_data SET versi = versi + 1 WHERE username IN (OLD.username, NEW.username);
+        END;
+
+        INSERT OR IGNORE INTO versi_data (username, versi) SELECT DISTINCT username, 1 FROM transaksi;
+        """)
+
+    def _migrasi_7_direktori_shard(self):
+        """
+        Tabel pengaturan (kunci-nilai) dan direktori shard: di mode shard (lihat
+        wallet_shard.py) file ini hanya berisi akun, dan direktori_shard mencatat
+        file SQLite tempat transaksi setiap user disimpan.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS pengaturan (
+            kunci TEXT PRIMARY KEY,
+            nilai TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS direktori_shard (
+            username TEXT PRIMARY KEY,
+            file TEXT NOT NULL  -- relatif terhadap folder shard
+        );
+        """)
+
+    def _migrasi_8_log_perubahan(self):
+        """
+        Log perubahan transaksi untuk export inkremental (lihat ekspor_perubahan).
+        Setiap insert/update/delete mendapat nomor urut (seq) yang selalu naik;
+        AUTOINCREMENT menjamin seq tidak dipakai ulang walaupun log dipangkas.
+        Trigger hanya mencatat jika ada checkpoint terdaftar, jadi database
+        yang tidak pernah memakai export inkremental tidak menanggung biayanya.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS checkpoint_ekspor (
+            nama TEXT PRIMARY KEY,
+            seq INTEGER,  -- NULL = belum pernah export (export berikutnya penuh)
+            waktu TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS log_perubahan (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            aksi TEXT NOT NULL,  -- 'I' insert, 'U' update, 'D' delete
+            id_transaksi INTEGER NOT NULL,
+            username TEXT
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_log_insert AFTER INSERT ON transaksi
+        WHEN EXISTS (SELECT 1 FROM checkpoint_ekspor)
+        BEGIN
+            INSERT INTO log_perubahan (aksi, id_transaksi, username) VALUES ('I', NEW.id, NEW.username);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_log_update AFTER UPDATE ON transaksi
+        WHEN EXISTS (SELECT 1 FROM checkpoint_ekspor)
+        BEGIN
+            INSERT INTO log_perubahan (aksi, id_transaksi, username) VALUES ('U', NEW.id, NEW.username);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_log_delete AFTER DELETE ON transaksi
+        WHEN EXISTS (SELECT 1 FROM checkpoint_ekspor)
+        BEGIN
+            INSERT INTO log_perubahan (aksi, id_transaksi, username) VALUES ('D', OLD.id, OLD.username);
+        END;
+        """)
+
+    def _migrasi_9_anggaran(self):
+        """
+        Anggaran bulanan per (user, kategori). Pemakaiannya tidak disimpan di sini:
+        total pengeluaran per kategori per bulan sudah dijaga trigger di rekap_bulanan.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS anggaran (
+            username TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            batas INTEGER NOT NULL, -- per bulan, dalam sen
+            PRIMARY KEY (username, kategori)
+        ) WITHOUT ROWID;
+        """)
+
+    def _migrasi_10_transaksi_rutin(self):
+        """
+        Aturan transaksi rutin (gaji, biaya tetap). Kolom terakhir = tanggal kejadian
+        terakhir yang sudah dibuat; diperbarui dalam transaksi yang sama dengan
+        insert-nya, jadi menjalankan ulang tidak pernah membuat transaksi ganda.
+        """
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS transaksi_rutin (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            jenis TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            deskripsi TEXT,
+            nominal INTEGER NOT NULL, -- dalam sen
+            satuan TEXT NOT NULL,     -- 'hari', 'minggu', 'bulan'
+            setiap INTEGER NOT NULL DEFAULT 1,
+            mulai TEXT NOT NULL,
+            selesai TEXT,             -- NULL = tanpa akhir
+            terakhir TEXT             -- NULL = belum pernah dibuat
+        );
+        CREATE INDEX IF NOT EXISTS idx_rutin_user ON transaksi_rutin(username);
+        """)
+
+    def ambil_pengaturan(self, kunci, default=None):
+        self.cursor.execute("SELECT nilai FROM pengaturan WHERE kunci=?", (kunci,))
+        baris = self.cursor.fetchone()
+        return baris[0] if baris else default
+
+    def simpan_pengaturan(self, commit=True, **nilai):
+        self.cursor.executemany("INSERT OR REPLACE INTO pengaturan VALUES (?, ?)",
+                                [(kunci, str(isi)) for kunci, isi in nilai.items()])
+        if commit:
+            self.conn.commit()
+
+    def fts_tersedia(self):
+        """True jika index full-text transaksi_fts ada di database ini."""
+        if self._fts_tersedia is None:
+            self._fts_tersedia = self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'transaksi_fts'").fetchone() is not None
+        return self._fts_tersedia
+
+    @terukur
+    def bangun_ulang_fts(self, commit=True):
+        """Membangun ulang index full-text dari tabel transaksi (perintah perbaikan)."""
+        if self.fts_tersedia():
+            self.cursor.execute("INSERT INTO transaksi_fts (transaksi_fts) VALUES ('rebuild')")
+        if commit:
+            self.conn.commit()
+
+    @terukur
+    def bangun_ulang_ringkasan(self, username=None, commit=True):
+        """
+        Menghitung ulang ringkasan dari baris transaksi mentah.
+        Dipakai saat migrasi dan sebagai perintah perbaikan jika ringkasan tidak konsisten.
+        """
+        filter_user = "WHERE username = ?" if username else ""
+        params = (username,) if username else ()
+        self.cursor.execute(f"DELETE FROM ringkasan_user {filter_user}", params)
+        self.cursor.execute(f"""
+            INSERT INTO ringkasan_user (username, total_masuk, total_keluar, jumlah_transaksi)
+            SELECT username,
+                   SUM(CASE WHEN jenis = 'Pemasukan' THEN nominal ELSE 0 END),
+                   SUM(CASE WHEN jenis = 'Pemasukan' THEN 0 ELSE nominal END),
+                   COUNT(*)
+            FROM transaksi {filter_user}
+            GROUP BY username
+        """, params)
+        if commit:
+            self.conn.commit()
+
+    @terukur
+    def bangun_ulang_rekap_bulanan(self, username=None, commit=True):
+        """Menghitung ulang tabel rekap_bulanan dari baris transaksi mentah."""
+        filter_user = "WHERE username = ?" if username else ""
+        params = (username,) if username else ()
+        self.cursor.execute(f"DELETE FROM rekap_bulanan {filter_user}", params)
+        self.cursor.execute(f"""
+            INSERT INTO rekap_bulanan (username, bulan, jenis, kategori, total, jumlah)
+            SELECT username, substr(tanggal, 1, 7), jenis, kategori, SUM(nominal), COUNT(*)
+            FROM transaksi {filter_user}
+            GROUP BY username, substr(tanggal, 1, 7), jenis, kategori
+        """, params)
+        if commit:
+            self.conn.commit()
+
+    def cek_rencana_query(self):
+        """
+        Menjalankan EXPLAIN QUERY PLAN untuk query utama.
+        Mengembalikan list (nama, detail_plan, pakai_index) supaya bisa dicek
+        bahwa tidak ada query yang melakukan full-table scan.
+        """
+        query_utama = [
+            ("ambil_semua_data", self.QUERY_SEMUA_DATA, ("user",)),
+            ("ambil_data_tahunan", self.QUERY_TAHUNAN, ("user", *rentang_tahun_rekap(2025))),
+            ("ambil_rekap_multi_tahun", self.QUERY_REKAP_TAHUN, ("user", *rentang_tahun_rekap(2023, 2025))),
+            ("ambil_rekap_kategori", self.QUERY_REKAP_KATEGORI, ("user", *rentang_tahun_rekap(2025))),
+            ("ambil_data_bulanan", self.QUERY_BULANAN, ("user", *rentang_bulan(2025, 1))),
+            ("ambil_anggaran", self.QUERY_ANGGARAN, ("2025-01", "user")),
+            ("ambil_halaman", self.QUERY_HALAMAN_LANJUT, ("user", "2025-01-01 00:00:00", 1, 200)),
+            ("cari_transaksi (teks)", *self._susun_pencarian("user", "makan", None, None, None, None, None, None, None, 50)),
+            ("cari_transaksi (kategori)", *self._susun_pencarian("user", None, "🍔 Makanan", None, "2025-01-01", None, None, None, None, 50)),
+            ("cari_transaksi (jenis)", *self._susun_pencarian("user", None, None, "Pemasukan", None, None, 100, None, None, 50)),
+        ]
+        hasil = []
+        for nama, query, params in query_utama:
+            plan = self.cursor.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+            detail = " | ".join(baris[3] for baris in plan)
+            # "SEARCH ... USING INDEX" = lookup lewat index, "SCAN <tabel>" = baca seluruh tabel
+            # (kecuali SCAN pada tabel virtual FTS, yang sebenarnya lookup ke index full-text)
+            ada_scan = any(baris[3].startswith("SCAN") and "VIRTUAL TABLE" not in baris[3] for baris in plan)
+            pakai_index = ("USING" in detail or "VIRTUAL TABLE" in detail) and not ada_scan
+            hasil.append((nama, detail, pakai_index))
+        return hasil
+
+    @terukur
+    def registrasi_user(self, username, password):
+        """Mendaftarkan user baru."""
+        try:
+            self.cursor.execute("INSERT INTO users VALUES (?, ?)", (username, password))
+            self.conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            return False # Username sudah ada
+
+    @terukur
+    def cek_login(self, username, password):
+        """Memvalidasi login user."""
+        self.cursor.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
+        return self.cursor.fetchone() is not None
+
+    @terukur
+    def tambah_data(self, username, jenis, kategori, deskripsi, nominal):
+        """
+        Menyimpan transaksi ke database. nominal dalam sen (lihat ke_sen()).
+        Mengembalikan baris yang baru disimpan (bentuknya sama dengan hasil SELECT *).
+        """
+        tanggal = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.cursor.execute("""
+            INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal) 
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (username, jenis, kategori, deskripsi, nominal, tanggal))
+        self.conn.commit()
+        baris = (self.cursor.lastrowid, username, jenis, kategori, deskripsi, nominal, tanggal)
+        self._ikuti_perubahan(username, 1, lambda cache: cache.tambah(baris))
+        return baris
+
+    @terukur
+    def tambah_banyak(self, username, daftar_transaksi):
+        """
+        Menyimpan banyak transaksi (jenis, kategori, deskripsi, nominal sen, tanggal)
+        dalam SATU transaksi database, untuk input cepat (group commit).
+        Mengembalikan baris-baris yang disimpan (bentuknya sama dengan hasil SELECT *).
+        """
+        baris_baru = []
+        try:
+            for jenis, kategori, deskripsi, nominal, tanggal in daftar_transaksi:
+                self.cursor.execute("""
+                    INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (username, jenis, kategori, deskripsi, nominal, tanggal))
+                baris_baru.append((self.cursor.lastrowid, username, jenis, kategori, deskripsi, nominal, tanggal))
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self._ikuti_perubahan(username, len(baris_baru), lambda cache: cache.tambah(*baris_baru))
+        return baris_baru
+
+    def pulihkan_jurnal(self, username, file_pulih):
+        """
+        Menyimpan entri input cepat yang tertinggal di file jurnal (aplikasi mati
+        sebelum flush), lalu menghapus file tersebut. Entri yang ternyata sudah
+        tersimpan (aplikasi mati setelah commit, sebelum jurnal ditulis ulang)
+        dilewati sebanyak kembarannya di tabel transaksi; entri kembar di dalam
+        jurnal sendiri (dua "Kopi" di detik yang sama) tetap disimpan semuanya.
+        Mengembalikan jumlah entri yang benar-benar ditambahkan.
+        """
+        entri = []
+        with open(file_pulih, encoding="utf-8") as file:
+            for baris in file:
+                try:
+                    entri.append(tuple(json.loads(baris)))
+                except ValueError: # Baris terakhir terpotong saat aplikasi mati
+                    log.warning("Baris jurnal rusak dilewati: %r", baris)
+        lewati = {}
+        for jenis, kategori, deskripsi, nominal, tanggal in set(entri):
+            lewati[(jenis, kategori, deskripsi, nominal, tanggal)] = self.cursor.execute("""
+                SELECT COUNT(*) FROM transaksi
+                WHERE username = ? AND tanggal = ? AND jenis = ? AND kategori = ? AND deskripsi = ? AND nominal = ?
+            """, (username, tanggal, jenis, kategori, deskripsi, nominal)).fetchone()[0]
+        baru = []
+        for e in entri:
+            if lewati[e]:
+                lewati[e] -= 1
+            else:
+                baru.append(e)
+        laporan = self.impor_transaksi(username, ((i, e, None) for i, e in enumerate(baru, 1)), buang_duplikat=False)
+        os.remove(file_pulih)
+        return laporan["diimpor"]
+
+    # Query disimpan sebagai konstanta agar bisa dicek lewat cek_rencana_query().
+    # Filter tanggal memakai rentang (>= awal AND < akhir) supaya index terpakai.
+    QUERY_SEMUA_DATA = "SELECT * FROM transaksi WHERE username=? ORDER BY tanggal DESC, id DESC"
+    # Rekap dibaca dari tabel rekap_bulanan (bukan transaksi mentah), dengan
+    # rentang bulan [awal, akhir) dalam format YYYY-MM di atas primary key-nya.
+    QUERY_TAHUNAN = """
+        SELECT substr(bulan, 6, 2) as bln, jenis, SUM(total)
+        FROM rekap_bulanan
+        WHERE username = ? AND bulan >= ? AND bulan < ?
+        GROUP BY bln, jenis
+    """
+    QUERY_REKAP_TAHUN = """
+        SELECT substr(bulan, 1, 4) as thn, jenis, SUM(total), SUM(jumlah)
+        FROM rekap_bulanan
+        WHERE username = ? AND bulan >= ? AND bulan < ?
+        GROUP BY thn, jenis
+        ORDER BY thn
+    """
+    QUERY_REKAP_KATEGORI = """
+        SELECT kategori, jenis, SUM(total), SUM(jumlah)
+        FROM rekap_bulanan
+        WHERE username = ? AND bulan >= ? AND bulan < ?
+        GROUP BY kategori, jenis
+        ORDER BY SUM(total) DESC
+    """
+    QUERY_BULANAN = """
+        SELECT * FROM transaksi
+        WHERE username = ? AND tanggal >= ? AND tanggal < ?
+        ORDER BY tanggal DESC, id DESC
+    """
+
+    # Anggaran + pemakaian bulan itu: satu lookup primary key rekap_bulanan per kategori.
+    QUERY_ANGGARAN = """
+        SELECT a.kategori, a.batas, COALESCE(r.total, 0)
+        FROM anggaran a
+        LEFT JOIN rekap_bulanan r ON r.username = a.username AND r.bulan = ?
+                                 AND r.jenis = 'Pengeluaran' AND r.kategori = a.kategori
+        WHERE a.username = ?
+    """
+
+    # Keyset pagination di atas index (username, tanggal) + rowid: halaman ke-N
+    # sama murahnya dengan halaman pertama (tidak memakai OFFSET).
+    QUERY_HALAMAN_AWAL = "SELECT * FROM transaksi WHERE username=? ORDER BY tanggal DESC, id DESC LIMIT ?"
+    QUERY_HALAMAN_LANJUT = """
+        SELECT * FROM transaksi
+        WHERE username = ? AND (tanggal, id) < (?, ?)
+        ORDER BY tanggal DESC, id DESC LIMIT ?
+    """
+
+    @terukur
+    def ambil_semua_data(self, username):
+        """Mengambil data milik user tertentu."""
+        self.cursor.execute(self.QUERY_SEMUA_DATA, (username,))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_data_tahunan(self, username, tahun):
+        """Mengambil rekap data per bulan untuk tahun tertentu: list (bulan 'MM', jenis, total sen)."""
+        self.cursor.execute(self.QUERY_TAHUNAN, (username, *rentang_tahun_rekap(tahun)))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_daftar_tahun(self, username):
+        """Tahun-tahun yang punya transaksi (terbaru dulu), diambil dari tabel rekap."""
+        self.cursor.execute("""
+            SELECT DISTINCT substr(bulan, 1, 4) FROM rekap_bulanan
+            WHERE username = ? ORDER BY 1 DESC
+        """, (username,))
+        return [int(baris[0]) for baris in self.cursor.fetchall()]
+
+    @terukur
+    def ambil_rekap_multi_tahun(self, username, tahun_awal, tahun_akhir):
+        """Mengambil total per tahun untuk perbandingan: list (tahun 'YYYY', jenis, total sen, jumlah transaksi)."""
+        self.cursor.execute(self.QUERY_REKAP_TAHUN, (username, *rentang_tahun_rekap(tahun_awal, tahun_akhir)))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_rekap_kategori(self, username, tahun_awal, tahun_akhir=None):
+        """Mengambil total per kategori (terbesar dulu): list (kategori, jenis, total sen, jumlah transaksi)."""
+        self.cursor.execute(self.QUERY_REKAP_KATEGORI, (username, *rentang_tahun_rekap(tahun_awal, tahun_akhir)))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_data_bulanan(self, username, tahun, bulan):
+        """Mengambil transaksi user pada satu bulan tertentu."""
+        awal, akhir = rentang_bulan(tahun, bulan)
+        self.cursor.execute(self.QUERY_BULANAN, (username, awal, akhir))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_halaman(self, username, setelah=None, batas=200):
+        """
+        Mengambil satu halaman riwayat (terbaru dulu).
+        setelah = (tanggal, id) dari baris terakhir halaman sebelumnya, None untuk halaman pertama.
+        """
+        if setelah is None:
+            self.cursor.execute(self.QUERY_HALAMAN_AWAL, (username, batas))
+        else:
+            self.cursor.execute(self.QUERY_HALAMAN_LANJUT, (username, setelah[0], setelah[1], batas))
+        return self.cursor.fetchall()
+
+    def _susun_pencarian(self, username, teks, kategori, jenis, dari, sampai, nominal_min, nominal_max, setelah, batas):
+        """Menyusun (query, params) untuk cari_transaksi()."""
+        sumber = "transaksi t"
+        kondisi = ["t.username = ?"]
+        params = [username]
+        if teks and teks.strip():
+            if self.fts_tersedia():
+                # FTS mengembalikan rowid yang cocok, lalu baris diambil lewat primary key.
+                # CROSS JOIN memaksa urutan ini (tanpanya SQLite bisa memilih menelusuri
+                # seluruh riwayat user dan mengecek FTS per baris).
+                sumber = "transaksi_fts CROSS JOIN transaksi t ON t.id = transaksi_fts.rowid"
+                kondisi.append("transaksi_fts MATCH ?")
+                params.append(query_fts(username, teks))
+            else:
+                for k in teks.split():
+                    kondisi.append("t.deskripsi LIKE ?")
+                    params.append(f"%{k}%")
+        if kategori:
+            kondisi.append("t.kategori = ?")
+            params.append(kategori)
+        if jenis:
+            kondisi.append("t.jenis = ?")
+            params.append(jenis)
+        if dari:
+            kondisi.append("t.tanggal >= ?")
+            params.append(dari)
+        if sampai:
+            kondisi.append("t.tanggal < ?")
+            params.append(batas_atas_tanggal(sampai))
+        if nominal_min is not None:
+            kondisi.append("t.nominal >= ?")
+            params.append(nominal_min)
+        if nominal_max is not None:
+            kondisi.append("t.nominal <= ?")
+            params.append(nominal_max)
+        if setelah is not None:
+            kondisi.append("(t.tanggal, t.id) < (?, ?)")
+            params.extend(setelah)
+        params.append(batas)
+        query = f"""
+            SELECT t.* FROM {sumber}
+            WHERE {" AND ".join(kondisi)}
+            ORDER BY t.tanggal DESC, t.id DESC LIMIT ?
+        """
+        return query, tuple(params)
+
+    @terukur
+    def cari_transaksi(self, username, teks=None, kategori=None, jenis=None, dari=None, sampai=None,
+                       nominal_min=None, nominal_max=None, setelah=None, batas=200):
+        """
+        Mencari transaksi user: teks dicocokkan ke deskripsi (full-text, per kata, prefix),
+        bisa digabung filter kategori, jenis, tanggal dari/sampai ('YYYY-MM-DD', inklusif)
+        dan nominal_min/nominal_max (sen). Hasil terbaru dulu, per halaman seperti ambil_halaman().
+        """
+        self.cursor.execute(*self._susun_pencarian(username, teks, kategori, jenis, dari, sampai,
+                                                   nominal_min, nominal_max, setelah, batas))
+        return self.cursor.fetchall()
+
+    @terukur
+    def ambil_ringkasan(self, username):
+        """Mengambil (saldo, total_masuk, total_keluar) dalam sen dari tabel ringkasan."""
+        self.cursor.execute("SELECT total_masuk, total_keluar FROM ringkasan_user WHERE username=?", (username,))
+        baris = self.cursor.fetchone()
+        if baris is None:
+            return 0, 0, 0
+        total_masuk, total_keluar = baris
+        return total_masuk - total_keluar, total_masuk, total_keluar
+
+    def simpan_anggaran(self, username, kategori, batas):
+        """Mengatur anggaran bulanan kategori (sen). batas None/0 = hapus anggaran kategori itu."""
+        if batas is not None and batas < 0:
+            raise ValueError("anggaran tidak boleh negatif")
+        if batas:
+            self.cursor.execute("INSERT OR REPLACE INTO anggaran VALUES (?, ?, ?)", (username, kategori, batas))
+        else:
+            self.cursor.execute("DELETE FROM anggaran WHERE username=? AND kategori=?", (username, kategori))
+        self.conn.commit()
+
+    @terukur
+    def ambil_anggaran(self, username, bulan=None):
+        """
+        {kategori: (batas, terpakai)} dalam sen untuk bulan 'YYYY-MM' (default: bulan ini).
+        Terpakai dibaca dari rekap_bulanan (satu baris per kategori lewat primary key),
+        jadi biayanya tetap berapa pun jumlah transaksi bulan itu.
+        """
+        self.cursor.execute(self.QUERY_ANGGARAN, (bulan or datetime.now().strftime("%Y-%m"), username))
+        return {kategori: (batas, terpakai) for kategori, batas, terpakai in self.cursor.fetchall()}
+
+    def ambil_versi_data(self, username):
+        """Versi data transaksi user (berubah setiap ada insert/update/delete)."""
+        self.cursor.execute("SELECT versi FROM versi_data WHERE username=?", (username,))
+        baris = self.cursor.fetchone()
+        return baris[0] if baris else 0
+
+    @terukur
+    def ambil_cache(self, username):
+        """
+        Riwayat user sebagai CacheTransaksi. Dimuat dari database sekali per sesi;
+        tambah_data/hapus_banyak/impor_transaksi lewat objek ini langsung
+        memperbarui cache, sedangkan perubahan dari koneksi lain (versi_data
+        tidak cocok) membuat cache dimuat ulang.
+        """
+        versi = self.ambil_versi_data(username)
+        cache = self.cache.get(username)
+        if cache is None or cache.versi != versi:
+            cache = CacheTransaksi(username, versi)
+            self._isi_cache(cache)
+            self.cache[username] = cache
+        return cache
+
+    def lepas_cache(self, username):
+        """Membuang cache user (misalnya saat logout)."""
+        self.cache.pop(username, None)
+
+    def _isi_cache(self, cache, setelah_id=0):
+        """Memuat transaksi user dengan id > setelah_id ke cache."""
+        cursor = self.cursor_baru()
+        cursor.execute("""
+            SELECT id, COALESCE(CAST(strftime('%s', tanggal) AS INTEGER), 0), jenis = 'Pemasukan',
+                   kategori, deskripsi, nominal
+            FROM transaksi WHERE username = ? AND id > ?
+            ORDER BY id
+        """, (cache.username, setelah_id))
+        while True:
+            batch = cursor.fetchmany(5000)
+            if not batch:
+                break
+            cache.tambah_banyak(batch)
+        cursor.close()
+
+    def _ikuti_perubahan(self, username, jumlah_perubahan, terapkan):
+        """
+        Menerapkan perubahan yang baru di-commit ke cache user (jika ada).
+        Jika versi_data naik lebih dari jumlah_perubahan, berarti ada penulis
+        lain di antaranya: cache dibuang dan dimuat ulang saat dibutuhkan.
+        """
+        cache = self.cache.get(username)
+        if cache is None or not jumlah_perubahan:
+            return
+        if self.ambil_versi_data(username) == cache.versi + jumlah_perubahan:
+            terapkan(cache)
+            cache.versi += jumlah_perubahan
+        else:
+            del self.cache[username]
+
+    @terukur
+    def hapus_data(self, id_transaksi):
+        """Menghapus data berdasarkan ID."""
+        self.cursor.execute("DELETE FROM transaksi WHERE id=?", (id_transaksi,))
+        self.conn.commit()
+
+    @terukur
+    def hapus_banyak(self, username, daftar_id, ukuran_chunk=500):
+        """
+        Menghapus banyak transaksi milik user dalam SATU transaksi database
+        (DELETE ... WHERE id IN (...) per chunk, jadi hanya satu commit/fsync).
+        ID milik user lain otomatis diabaikan.
+        Mengembalikan (jumlah_terhapus, total_masuk_terhapus, total_keluar_terhapus), total dalam sen.
+        """
+        daftar_id = list(daftar_id)
+        jumlah = total_masuk = total_keluar = 0
+        try:
+            for i in range(0, len(daftar_id), ukuran_chunk):
+                chunk = daftar_id[i:i + ukuran_chunk]
+                filter_sql = f"WHERE username = ? AND id IN ({', '.join('?' * len(chunk))})"
+                params = (username, *chunk)
+                n, masuk, keluar = self.cursor.execute(f"""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(CASE WHEN jenis = 'Pemasukan' THEN nominal ELSE 0 END), 0),
+                           COALESCE(SUM(CASE WHEN jenis = 'Pemasukan' THEN 0 ELSE nominal END), 0)
+                    FROM transaksi {filter_sql}
+                """, params).fetchone()
+                self.cursor.execute(f"DELETE FROM transaksi {filter_sql}", params)
+                jumlah += n
+                total_masuk += masuk
+                total_keluar += keluar
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self._ikuti_perubahan(username, jumlah, lambda cache: cache.hapus(daftar_id))
+        return jumlah, total_masuk, total_keluar
+
+    @terukur
+    def ekspor_csv(self, username, file_path, dari=None, sampai=None, kategori=None,
+                   progress=None, batal=None, ukuran_batch=5000):
+        """
+        Menulis riwayat user ke CSV langsung dari cursor, per batch (fetchmany),
+        jadi seluruh riwayat tidak pernah dimuat ke memori sekaligus.
+        dari/sampai = 'YYYY-MM-DD' (inklusif), kategori = None untuk semua.
+        progress(ditulis, total) dipanggil setiap batch; batal = threading.Event untuk membatalkan.
+        Mengembalikan jumlah baris yang ditulis (None jika dibatalkan).
+        """
+        filter_sql = "WHERE username = ?"
+        params = [username]
+        if dari:
+            filter_sql += " AND tanggal >= ?"
+            params.append(dari)
+        if sampai:
+            filter_sql += " AND tanggal < ?"
+            params.append(batas_atas_tanggal(sampai))
+        if kategori:
+            filter_sql += " AND kategori = ?"
+            params.append(kategori)
+
+        cursor = self.cursor_baru() # Cursor terpisah agar tidak bentrok dengan self.cursor
+        total = cursor.execute(f"SELECT COUNT(*) FROM transaksi {filter_sql}", params).fetchone()[0]
+        cursor.execute(f"""
+            SELECT id, tanggal,
+                   CASE WHEN jenis = 'Pemasukan' THEN 'Masuk' ELSE 'Keluar' END,
+                   kategori, deskripsi,
+                   CASE WHEN nominal % 100 = 0 THEN nominal / 100 ELSE printf('%.2f', nominal / 100.0) END
+            FROM transaksi {filter_sql}
+            ORDER BY tanggal DESC, id DESC
+        """, params)
+
+        ditulis = 0
+        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(("ID", "Tanggal", "Jenis", "Kategori", "Deskripsi", "Nominal"))
+            while True:
+                if batal is not None and batal.is_set():
+                    break
+                batch = cursor.fetchmany(ukuran_batch)
+                if not batch:
+                    break
+                writer.writerows(batch)
+                ditulis += len(batch)
+                if progress:
+                    progress(ditulis, total)
+        cursor.close()
+
+        if batal is not None and batal.is_set():
+            os.remove(file_path) # Jangan tinggalkan file setengah jadi
+            return None
+        return ditulis
+
+    # -------------------------------------------------------------------------
+    # EXPORT INKREMENTAL (LOG PERUBAHAN + CHECKPOINT)
+    # Export pertama untuk sebuah checkpoint berisi semua transaksi; setelah
+    # itu hanya transaksi yang berubah sejak export sebelumnya. Setiap
+    # transaksi muncul sekali dengan keadaan terakhirnya: aksi "simpan"
+    # (insert/update, timpa berdasarkan Sumber + ID) atau "hapus".
+    # -------------------------------------------------------------------------
+    QUERY_PERUBAHAN = """
+        SELECT akhir.seq, CASE WHEN t.id IS NULL THEN 'hapus' ELSE 'simpan' END,
+               ubah.id_transaksi, COALESCE(t.username, akhir.username), t.tanggal, t.jenis, t.kategori, t.deskripsi,
+               CASE WHEN t.nominal % 100 = 0 THEN t.nominal / 100
+                    WHEN t.nominal IS NOT NULL THEN printf('%.2f', t.nominal / 100.0) END
+        FROM (
+            SELECT id_transaksi, MIN(seq) AS seq_awal, MAX(seq) AS seq_akhir
+            FROM log_perubahan WHERE seq > ? AND seq <= ? GROUP BY id_transaksi
+        ) AS ubah
+        JOIN log_perubahan awal ON awal.seq = ubah.seq_awal
+        JOIN log_perubahan akhir ON akhir.seq = ubah.seq_akhir
+        LEFT JOIN transaksi t ON t.id = ubah.id_transaksi
+        WHERE NOT (t.id IS NULL AND awal.aksi = 'I') -- dibuat lalu dihapus di antara dua export: lewati
+        ORDER BY akhir.seq
+    """
+    QUERY_SNAPSHOT = """
+        SELECT ?, 'simpan', id, username, tanggal, jenis, kategori, deskripsi,
+               CASE WHEN nominal % 100 = 0 THEN nominal / 100 ELSE printf('%.2f', nominal / 100.0) END
+        FROM transaksi ORDER BY id
+    """
+
+    def daftarkan_checkpoint(self, nama_checkpoint):
+        """Mulai mencatat perubahan untuk checkpoint ini (jika belum). Export berikutnya berisi semua transaksi."""
+        self.cursor.execute("INSERT OR IGNORE INTO checkpoint_ekspor (nama) VALUES (?)", (nama_checkpoint,))
+        self.conn.commit()
+
+    def reset_checkpoint(self, nama_checkpoint):
+        """Export berikutnya untuk checkpoint ini kembali penuh (misalnya setelah gudang data dibangun ulang)."""
+        self.cursor.execute("UPDATE checkpoint_ekspor SET seq = NULL WHERE nama = ?", (nama_checkpoint,))
+        self.conn.commit()
+        self.pangkas_log_perubahan()
+
+    def hapus_checkpoint(self, nama_checkpoint):
+        """Berhenti mencatat untuk checkpoint ini; log yang tidak dibutuhkan checkpoint lain dibuang."""
+        self.cursor.execute("DELETE FROM checkpoint_ekspor WHERE nama = ?", (nama_checkpoint,))
+        self.conn.commit()
+        self.pangkas_log_perubahan()
+
+    def ambil_checkpoint(self):
+        """[(nama, seq, waktu, jumlah perubahan yang menunggu)] semua checkpoint terdaftar."""
+        return self.cursor.execute("""
+            SELECT c.nama, c.seq, c.waktu,
+                   CASE WHEN c.seq IS NULL THEN NULL
+                        ELSE (SELECT COUNT(*) FROM log_perubahan l WHERE l.seq > c.seq) END
+            FROM checkpoint_ekspor c ORDER BY c.nama
+        """).fetchall()
+
+    def pangkas_log_perubahan(self, commit=True):
+        """Membuang log yang sudah diexport oleh semua checkpoint."""
+        # Checkpoint seq NULL tidak butuh log (export berikutnya penuh); tanpa checkpoint ber-seq, log dibuang semua
+        self.cursor.execute("""
+            DELETE FROM log_perubahan
+            WHERE seq <= COALESCE((SELECT MIN(seq) FROM checkpoint_ekspor),
+                                  (SELECT seq FROM sqlite_sequence WHERE name = 'log_perubahan'))
+        """)
+        if commit:
+            self.conn.commit()
+
+    def tulis_perubahan(self, writer, nama_checkpoint, ukuran_batch=5000):
+        """
+        Menulis perubahan sejak checkpoint ke csv writer dari satu snapshot baca
+        yang konsisten (transaksi baca SQLite), tanpa memajukan checkpoint.
+        Setiap baris diawali nama file database ini (kolom Sumber).
+        Mengembalikan (seq_lama, seq_baru, jumlah_baris) untuk majukan_checkpoint().
+        """
+        sumber = os.path.basename(self.db_file)
+        self.daftarkan_checkpoint(nama_checkpoint)
+        cursor = self.cursor_baru()
+        cursor.execute("BEGIN") # Snapshot: batas seq dan isi transaksi dibaca dari keadaan yang sama
+        try:
+            seq_lama = cursor.execute("SELECT seq FROM checkpoint_ekspor WHERE nama = ?", (nama_checkpoint,)).fetchone()[0]
+            seq_baru = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'log_perubahan'").fetchone()[0]
+            if seq_lama is None:
+                cursor.execute(self.QUERY_SNAPSHOT, (seq_baru,))
+            else:
+                cursor.execute(self.QUERY_PERUBAHAN, (seq_lama, seq_baru))
+            jumlah = 0
+            while True:
+                batch = cursor.fetchmany(ukuran_batch)
+                if not batch:
+                    break
+                writer.writerows((sumber, *baris) for baris in batch)
+                jumlah += len(batch)
+        finally:
+            self.conn.rollback() # Hanya membaca; mengakhiri snapshot
+            cursor.close()
+        return seq_lama, seq_baru, jumlah
+
+    def majukan_checkpoint(self, nama_checkpoint, seq_lama, seq_baru):
+        """
+        Memajukan checkpoint ke seq_baru dan memangkas log dalam satu transaksi.
+        Gagal (RuntimeError) jika checkpoint sudah dimajukan proses lain sejak dibaca.
+        """
+        self.cursor.execute("""
+            UPDATE checkpoint_ekspor SET seq = ?, waktu = datetime('now', 'localtime')
+            WHERE nama = ? AND seq IS ?
+        """, (seq_baru, nama_checkpoint, seq_lama))
+        if self.cursor.rowcount != 1:
+            self.conn.rollback()
+            raise RuntimeError(f"checkpoint '{nama_checkpoint}' berubah selama export (export lain berjalan bersamaan?)")
+        self.pangkas_log_perubahan(commit=False)
+        self.conn.commit()
+
+    @terukur
+    def ekspor_perubahan(self, file_path, nama_checkpoint="gudang", ukuran_batch=5000):
+        """
+        Export inkremental semua user ke CSV: hanya transaksi yang berubah sejak
+        export terakhir untuk checkpoint ini (export pertama berisi semuanya).
+        Lihat tulis_ekspor_perubahan(). Mengembalikan dict: baris, penuh, per_file.
+        """
+        return tulis_ekspor_perubahan([self], file_path, nama_checkpoint, ukuran_batch)
+
+    # -------------------------------------------------------------------------
+    # TRANSAKSI RUTIN
+    # Kejadian yang terlewat dibuat sekaligus (catch-up) saat aplikasi dibuka
+    # atau lewat wallet_cli.py recurring run: satu INSERT ... SELECT dalam satu
+    # transaksi database, berapa pun jumlah kejadiannya.
+    # -------------------------------------------------------------------------
+    def tambah_rutin(self, username, jenis, kategori, deskripsi, nominal, satuan, setiap=1, mulai=None, selesai=None):
+        """
+        Menyimpan aturan rutin (nominal dalam sen). satuan = 'hari'/'minggu'/'bulan',
+        setiap = tiap berapa satuan. mulai/selesai = tanggal (selesai inklusif,
+        None = tanpa akhir). Mengembalikan ID aturan.
+        """
+        if jenis not in ("Pemasukan", "Pengeluaran"):
+            raise ValueError("jenis harus Pemasukan atau Pengeluaran")
+        if satuan not in SATUAN_RUTIN:
+            raise ValueError(f"satuan harus salah satu dari {', '.join(SATUAN_RUTIN)}")
+        if int(setiap) < 1:
+            raise ValueError("setiap minimal 1")
+        mulai = parse_tanggal(mulai) if mulai else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if selesai:
+            selesai = parse_tanggal(selesai)
+            if selesai.endswith(" 00:00:00"): # Hanya tanggal: sampai akhir hari itu
+                selesai = selesai[:10] + " 23:59:59"
+        self.cursor.execute("""
+            INSERT INTO transaksi_rutin (username, jenis, kategori, deskripsi, nominal, satuan, setiap, mulai, selesai)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (username, jenis, kategori, deskripsi, nominal, satuan, int(setiap), mulai, selesai or None))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def ambil_rutin(self, username):
+        """Aturan rutin user: list (id, jenis, kategori, deskripsi, nominal, satuan, setiap, mulai, selesai, terakhir)."""
+        self.cursor.execute("""
+            SELECT id, jenis, kategori, deskripsi, nominal, satuan, setiap, mulai, selesai, terakhir
+            FROM transaksi_rutin WHERE username = ? ORDER BY id
+        """, (username,))
+        return self.cursor.fetchall()
+
+    def hapus_rutin(self, username, id_rutin):
+        """Menghapus aturan (transaksi yang sudah dibuat tetap ada). True jika aturan ditemukan."""
+        self.cursor.execute("DELETE FROM transaksi_rutin WHERE id = ? AND username = ?", (id_rutin, username))
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    @terukur
+    def jalankan_rutin(self, username=None, sampai=None):
+        """
+        Membuat semua kejadian aturan rutin yang jatuh tempo sampai `sampai`
+        (default: sekarang) dan belum pernah dibuat, untuk satu user atau semua
+        user (username=None). Semua kejadian masuk lewat satu INSERT ... SELECT
+        dalam satu transaksi (BEGIN IMMEDIATE, jadi dua proses yang berjalan
+        bersamaan tidak membuat kejadian yang sama dua kali).
+        Mengembalikan {username: jumlah transaksi yang dibuat}.
+        """
+        sampai = sampai or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            filter_sql, params = ("WHERE username = ?", (username,)) if username else ("", ())
+            aturan = self.cursor.execute(f"""
+                SELECT id, satuan, setiap, mulai, selesai, terakhir FROM transaksi_rutin {filter_sql}
+            """, params).fetchall()
+            kejadian = [(id_rutin, tanggal)
+                        for id_rutin, satuan, setiap, mulai, selesai, terakhir in aturan
+                        for tanggal in kejadian_rutin(mulai, satuan, setiap, terakhir, min(selesai or sampai, sampai))]
+            if not kejadian:
+                self.conn.rollback()
+                return {}
+
+            self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS rutin_sementara (id_rutin INTEGER, tanggal TEXT)")
+            self.cursor.execute("DELETE FROM temp.rutin_sementara")
+            self.cursor.executemany("INSERT INTO temp.rutin_sementara VALUES (?, ?)", kejadian)
+            per_user = dict(self.cursor.execute("""
+                SELECT r.username, COUNT(*) FROM temp.rutin_sementara s JOIN transaksi_rutin r ON r.id = s.id_rutin
+                GROUP BY r.username
+            """).fetchall())
+            self.cursor.execute("""
+                INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal)
+                SELECT r.username, r.jenis, r.kategori, r.deskripsi, r.nominal, s.tanggal
+                FROM temp.rutin_sementara s JOIN transaksi_rutin r ON r.id = s.id_rutin
+                ORDER BY s.tanggal, s.id_rutin
+            """)
+            self.cursor.execute("""
+                UPDATE transaksi_rutin
+                SET terakhir = (SELECT MAX(tanggal) FROM temp.rutin_sementara s WHERE s.id_rutin = transaksi_rutin.id)
+                WHERE id IN (SELECT id_rutin FROM temp.rutin_sementara)
+            """)
+            self.cursor.execute("DELETE FROM temp.rutin_sementara")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        for nama, jumlah in per_user.items():
+            self._ikuti_perubahan(nama, jumlah, lambda cache: self._isi_cache(cache, cache.id[-1] if cache.id else 0))
+        return per_user
+
+    @terukur
+    def impor_transaksi(self, username, sumber_baris, ukuran_batch=50000, buang_duplikat=True):
+        """
+        Memasukkan banyak transaksi sekaligus dalam SATU transaksi database.
+        sumber_baris menghasilkan (nomor_baris, (jenis, kategori, deskripsi, nominal, tanggal), alasan_tolak),
+        contohnya generator baca_csv_transaksi(). Baris ditampung dulu di tabel TEMP lewat executemany,
+        lalu disalin ke tabel transaksi dengan satu INSERT ... SELECT yang sekaligus membuang
+        duplikat di dalam file maupun yang sudah ada di database.
+        Mengembalikan laporan berupa dict.
+        """
+        mulai = time.perf_counter()
+        dibaca = 0
+        ditolak = []
+        self.cursor.execute("DROP TABLE IF EXISTS temp.impor_sementara")
+        self.cursor.execute("""
+            CREATE TEMP TABLE impor_sementara (
+                jenis TEXT, kategori TEXT, deskripsi TEXT, nominal INTEGER, tanggal TEXT
+            )
+        """)
+        query_tampung = "INSERT INTO impor_sementara VALUES (?, ?, ?, ?, ?)"
+        try:
+            batch = []
+            for nomor_baris, baris, alasan in sumber_baris:
+                if alasan:
+                    ditolak.append((nomor_baris, alasan))
+                    continue
+                batch.append(baris)
+                dibaca += 1
+                if len(batch) >= ukuran_batch:
+                    self.cursor.executemany(query_tampung, batch)
+                    batch.clear()
+            if batch:
+                self.cursor.executemany(query_tampung, batch)
+
+            query_salin = """
+                INSERT INTO transaksi (username, jenis, kategori, deskripsi, nominal, tanggal)
+                SELECT ?, s.jenis, s.kategori, s.deskripsi, s.nominal, s.tanggal
+                FROM impor_sementara s
+            """
+            params = (username,)
+            if buang_duplikat:
+                # Cek ke tabel transaksi hanya untuk baris yang tanggalnya bertumpuk
+                # dengan riwayat user; import pertama kali tidak perlu lookup sama sekali.
+                awal, akhir = self.cursor.execute(
+                    "SELECT MIN(tanggal), MAX(tanggal) FROM transaksi WHERE username=?", (username,)).fetchone()
+                if awal is not None:
+                    query_salin += """
+                    WHERE s.tanggal < ? OR s.tanggal > ? OR NOT EXISTS (
+                        SELECT 1 FROM transaksi t
+                        WHERE t.username = ? AND t.tanggal = s.tanggal AND t.jenis = s.jenis
+                          AND t.kategori = s.kategori AND t.deskripsi = s.deskripsi AND t.nominal = s.nominal
+                    )
+                    """
+                    params += (awal, akhir, username)
+                # GROUP BY membuang duplikat di dalam file itu sendiri
+                query_salin += " GROUP BY s.tanggal, s.jenis, s.kategori, s.deskripsi, s.nominal"
+            self.cursor.execute(query_salin + " ORDER BY s.tanggal", params)
+            diimpor = self.cursor.rowcount
+            self.cursor.execute("DROP TABLE temp.impor_sementara")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self._ikuti_perubahan(username, diimpor, lambda cache: self._isi_cache(cache, cache.id[-1] if cache.id else 0))
+
+        detik = time.perf_counter() - mulai
+        return {
+            "dibaca": dibaca,
+            "diimpor": diimpor,
+            "duplikat": dibaca - diimpor,
+            "ditolak": ditolak,
+            "detik": detik,
+            "baris_per_detik": (dibaca + len(ditolak)) / detik if detik > 0 else 0,
+        }
+
+# -----------------------------------------------------------------------------
+# IMPOR CSV (MUTASI BANK / HASIL EXPORT)
+# File dibaca baris per baris lewat generator, jadi ukuran file tidak
+# berpengaruh ke pemakaian memori.
+# -----------------------------------------------------------------------------
+
+# Field transaksi -> nama kolom di CSV. Default-nya cocok dengan hasil Export CSV.
+# Untuk mutasi bank dengan kolom debit/kredit terpisah, pakai "masuk"/"keluar"
+# sebagai ganti "nominal" (dan "jenis" boleh dihapus).
+PETA_KOLOM_DEFAULT = {
+    "tanggal": "Tanggal",
+    "jenis": "Jenis",
+    "kategori": "Kategori",
+    "deskripsi": "Deskripsi",
+    "nominal": "Nominal",
+}
+
+ALIAS_JENIS = {
+    "pemasukan": "Pemasukan", "masuk": "Pemasukan", "kredit": "Pemasukan", "credit": "Pemasukan", "cr": "Pemasukan",
+    "pengeluaran": "Pengeluaran", "keluar": "Pengeluaran", "debit": "Pengeluaran", "debet": "Pengeluaran", "db": "Pengeluaran",
+}
+
+FORMAT_TANGGAL_IMPOR = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+KATEGORI_DEFAULT_IMPOR = "✨ Lainnya"
+
+def parse_nominal(teks):
+    """Mengubah teks uang ('Rp 1.500.000', '1,500,000.50', '-25000') menjadi integer sen."""
+    t = teks.replace("Rp", "").replace(" ", "").strip()
+    if "," in t and "." in t:
+        # Pemisah yang muncul paling akhir adalah pemisah desimal
+        if t.rfind(",") > t.rfind("."):
+            t = t.replace(".", "").replace(",", ".")
+        else:
+            t = t.replace(",", "")
+    elif "," in t:
+        bagian = t.split(",")
+        t = t.replace(",", "") if len(bagian) > 2 or len(bagian[-1]) == 3 else t.replace(",", ".")
+    elif t.count(".") > 1 or (t.count(".") == 1 and len(t.split(".")[1]) == 3):
+        t = t.replace(".", "") # Format ribuan Indonesia: 1.500.000
+    if t.isdigit():
+        return int(t) * SEN_PER_RUPIAH # Jalur cepat untuk angka bulat
+    return ke_sen(t)
+
+def parse_tanggal(teks):
+    """Menormalkan tanggal ke format kolom database: YYYY-MM-DD HH:MM:SS."""
+    t = teks.strip()
+    # Jalur cepat untuk format ISO (termasuk hasil Export CSV aplikasi ini)
+    if len(t) == 19 and t[4] == "-" and t[10] == " ":
+        return t
+    if len(t) == 10 and t[4] == "-" and t[7] == "-":
+        return t + " 00:00:00"
+    for fmt in FORMAT_TANGGAL_IMPOR:
+        try:
+            return datetime.strptime(t, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+    raise ValueError(f"format tanggal tidak dikenal: {teks!r}")
+
+def baca_csv_transaksi(file_path, peta_kolom=None, delimiter=","):
+    """
+    Generator yang membaca CSV baris demi baris.
+    Menghasilkan (nomor_baris, (jenis, kategori, deskripsi, nominal, tanggal), None) untuk baris valid,
+    atau (nomor_baris, None, alasan) untuk baris yang ditolak.
+    """
+    peta = peta_kolom or PETA_KOLOM_DEFAULT
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        posisi = {nama.strip(): i for i, nama in enumerate(header)}
+        hilang = [kolom for kolom in peta.values() if kolom not in posisi]
+        if hilang:
+            raise ValueError(f"Kolom tidak ditemukan di CSV: {', '.join(hilang)}")
+        idx = {field: posisi[kolom] for field, kolom in peta.items()}
+        idx_jenis = idx.get("jenis")
+        idx_kategori = idx.get("kategori")
+        idx_deskripsi = idx.get("deskripsi")
+        idx_nominal = idx.get("nominal")
+        idx_masuk, idx_keluar = idx.get("masuk"), idx.get("keluar")
+        lebar = max(idx.values()) + 1
+
+        for nomor_baris, row in enumerate(reader, start=2):
+            if not row or not any(row):
+                continue # Baris kosong dilewati tanpa dihitung
+            if len(row) < lebar:
+                yield nomor_baris, None, "jumlah kolom kurang"
+                continue
+            try:
+                if idx_nominal is not None:
+                    nominal = parse_nominal(row[idx_nominal])
+                    jenis_default = "Pengeluaran" if nominal < 0 else "Pemasukan"
+                else:
+                    teks_masuk, teks_keluar = row[idx_masuk].strip(), row[idx_keluar].strip()
+                    nominal = parse_nominal(teks_masuk or teks_keluar)
+                    jenis_default = "Pemasukan" if teks_masuk else "Pengeluaran"
+                nominal = abs(nominal)
+                tanggal = parse_tanggal(row[idx["tanggal"]])
+            except ValueError as e:
+                yield nomor_baris, None, str(e)
+                continue
+
+            jenis = jenis_default
+            if idx_jenis is not None:
+                jenis = ALIAS_JENIS.get(row[idx_jenis].strip().lower())
+                if jenis is None:
+                    yield nomor_baris, None, f"jenis tidak dikenal: {row[idx_jenis]!r}"
+                    continue
+            if nominal == 0:
+                yield nomor_baris, None, "nominal nol"
+                continue
+
+            kategori = row[idx_kategori].strip() if idx_kategori is not None else ""
+            deskripsi = row[idx_deskripsi].strip() if idx_deskripsi is not None else ""
+            yield nomor_baris, (jenis, kategori or KATEGORI_DEFAULT_IMPOR, deskripsi, nominal, tanggal), None
+
+# -----------------------------------------------------------------------------
+# JADWAL TRANSAKSI RUTIN
+# -----------------------------------------------------------------------------
+
+SATUAN_RUTIN = ("hari", "minggu", "bulan")
+
+def kejadian_rutin(mulai, satuan, setiap, setelah, sampai):
+    """
+    Tanggal kejadian aturan rutin (format kolom tanggal, urut naik) yang > setelah
+    (None = dari awal) dan <= sampai. Kejadian ke-k = mulai + k x setiap satuan;
+    untuk bulanan, tanggal 29-31 jatuh di hari terakhir bulan yang lebih pendek
+    tanpa menggeser bulan-bulan berikutnya. Langsung melompat ke sekitar
+    `setelah`, jadi aturan yang sudah berjalan lama tidak dihitung dari awal.
+    """
+    awal = datetime.strptime(mulai, "%Y-%m-%d %H:%M:%S")
+    batas = datetime.strptime(sampai, "%Y-%m-%d %H:%M:%S")
+    lewati = datetime.strptime(setelah, "%Y-%m-%d %H:%M:%S") if setelah else None
+    if satuan == "bulan":
+        def ke(k):
+            indeks = awal.month - 1 + k * setiap
+            tahun, bulan = awal.year + indeks // 12, indeks % 12 + 1
+            return awal.replace(year=tahun, month=bulan, day=min(awal.day, calendar.monthrange(tahun, bulan)[1]))
+        k = max(0, ((lewati.year - awal.year) * 12 + lewati.month - awal.month) // setiap) if lewati else 0
+    elif satuan in ("hari", "minggu"):
+        langkah = timedelta(days=setiap * (7 if satuan == "minggu" else 1))
+        def ke(k):
+            return awal + k * langkah
+        k = max(0, (lewati - awal) // langkah) if lewati else 0
+    else:
+        raise ValueError(f"satuan tidak dikenal: {satuan!r}")
+
+    while True:
+        tanggal = ke(k)
+        if tanggal > batas:
+            return
+        if lewati is None or tanggal > lewati:
+            yield tanggal.strftime("%Y-%m-%d %H:%M:%S")
+        k += 1
+
+# -----------------------------------------------------------------------------
+# EXPORT INKREMENTAL KE FILE
+# File ditulis ke .tmp lalu di-rename, baru setelah itu checkpoint dimajukan.
+# Jika proses mati di antaranya, export berikutnya mengulang perubahan yang
+# sama (at-least-once); baris export aman diterapkan ulang karena berisi
+# keadaan terakhir per transaksi. Kunci transaksi adalah (Sumber, ID): di mode
+# shard ID dan Seq hanya unik di dalam satu file.
+# -----------------------------------------------------------------------------
+
+KOLOM_EKSPOR_PERUBAHAN = ("Sumber", "Seq", "Aksi", "ID", "Username", "Tanggal", "Jenis", "Kategori", "Deskripsi", "Nominal")
+
+def tulis_ekspor_perubahan(daftar_db, file_path, nama_checkpoint="gudang", ukuran_batch=5000):
+    """
+    Export perubahan dari satu atau beberapa DatabaseManager (mode shard: satu
+    per file, masing-masing dengan checkpoint sendiri) ke satu file CSV.
+    Mengembalikan dict: baris, penuh (ada file yang export pertama/reset), dan
+    per_file: [{sumber, seq_lama, seq_baru, baris}] checkpoint setiap file
+    (seq_lama None = export penuh).
+    """
+    hasil = []
+    file_tmp = file_path + ".tmp"
+    try:
+        with open(file_tmp, mode="w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(KOLOM_EKSPOR_PERUBAHAN)
+            for db in daftar_db:
+                hasil.append((db, *db.tulis_perubahan(writer, nama_checkpoint, ukuran_batch)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(file_tmp, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(file_tmp)
+        raise
+
+    for db, seq_lama, seq_baru, _ in hasil:
+        db.majukan_checkpoint(nama_checkpoint, seq_lama, seq_baru)
+    return {
+        "baris": sum(jumlah for *_, jumlah in hasil),
+        "penuh": any(seq_lama is None for _, seq_lama, _, _ in hasil),
+        "per_file": [{"sumber": os.path.basename(db.db_file), "seq_lama": seq_lama, "seq_baru": seq_baru, "baris": jumlah}
+                     for db, seq_lama, seq_baru, jumlah in hasil],
+    }
+
+# -----------------------------------------------------------------------------
+# BUFFER INPUT CEPAT (GROUP COMMIT)
+# Entri ditampung dulu lalu disimpan sekaligus lewat tambah_banyak (satu
+# commit). Sampai ter-commit, setiap entri juga dicatat di file jurnal
+# (JSON per baris), jadi tidak hilang walaupun aplikasi mati sebelum flush;
+# DatabaseManager.pulihkan_jurnal() menyimpannya saat user login lagi.
+# -----------------------------------------------------------------------------
+
+def file_jurnal(db_file, username):
+    """Lokasi file jurnal input cepat milik user (di samping file database)."""
+    return f"{db_file}-jurnal-{zlib.crc32(username.encode('utf-8')):08x}.jsonl"
+
+class BufferTulis:
+    """
+    Antrean entri (jenis, kategori, deskripsi, nominal sen, tanggal) satu user
+    yang belum tersimpan. `kunci` adalah penanda bebas milik pemanggil
+    (misalnya iid baris sementara di tabel) yang dibawa bersama entrinya.
+    """
+    def __init__(self, username, file_jurnal):
+        self.username = username
+        self.file_jurnal = file_jurnal
+        self.antre = []    # (kunci, entri) yang belum dikirim
+        self.dikirim = []  # (kunci, entri) yang sedang disimpan
+
+    def __len__(self):
+        return len(self.antre)
+
+    def tambah(self, kunci, jenis, kategori, deskripsi, nominal, tanggal=None):
+        """Menampung satu entri (tanggal default: sekarang) dan mencatatnya di jurnal."""
+        entri = (jenis, kategori, deskripsi, nominal, tanggal or datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with open(self.file_jurnal, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entri, ensure_ascii=False) + "\n")
+        self.antre.append((kunci, entri))
+        return entri
+
+    def ambil(self):
+        """Memindahkan semua entri antre ke status dikirim; mengembalikan list (kunci, entri)."""
+        batch, self.antre = self.antre, []
+        self.dikirim.extend(batch)
+        return batch
+
+    def tersimpan(self, batch):
+        """Batch sudah ter-commit: jurnal ditulis ulang hanya dengan entri yang belum tersimpan."""
+        selesai = {id(x) for x in batch}
+        self.dikirim = [x for x in self.dikirim if id(x) not in selesai]
+        sisa = self.dikirim + self.antre
+        if not sisa:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.file_jurnal)
+            return
+        with open(self.file_jurnal + ".tmp", "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(entri, ensure_ascii=False) + "\n" for _, entri in sisa)
+        os.replace(self.file_jurnal + ".tmp", self.file_jurnal)
+
+    def gagal(self, batch):
+        """Batch gagal disimpan: dikembalikan ke depan antrean (jurnal tidak berubah)."""
+        selesai = {id(x) for x in batch}
+        self.dikirim = [x for x in self.dikirim if id(x) not in selesai]
+        self.antre[:0] = batch
+
+    def pindahkan_jurnal_lama(self):
+        """
+        Memindahkan jurnal sisa sesi sebelumnya ke <jurnal>.pulih supaya entri baru
+        tidak tercampur. Mengembalikan path file .pulih, atau None jika tidak ada sisa.
+        """
+        pulih = self.file_jurnal + ".pulih"
+        if os.path.exists(self.file_jurnal):
+            if os.path.exists(pulih): # Pemulihan sebelumnya gagal: gabungkan
+                with open(self.file_jurnal, encoding="utf-8") as f_in, open(pulih, "a", encoding="utf-8") as f_out:
+                    f_out.write(f_in.read())
+                os.remove(self.file_jurnal)
+            else:
+                os.replace(self.file_jurnal, pulih)
+        return pulih if os.path.exists(pulih) else None
+
+# =============================================================================
+# 3. PENERAPAN OOP (CORE LOGIC)
+# Bagian ini PENTING untuk nilai UAS: Inheritance, Encapsulation, Polymorphism.
+# =============================================================================
+
+class Transaksi(ABC):
+    """
+    [PARENT CLASS] Kelas abstrak untuk semua jenis transaksi.
+    """
+    def __init__(self, deskripsi, nominal, kategori):
+        self.deskripsi = deskripsi
+        self.kategori = kategori
+        # [ENCAPSULATION] Atribut private
+        self.__nominal = nominal 
+
+    def get_nominal(self):
+        return self.__nominal
+
+    @abstractmethod
+    def info_sukses(self):
+        """[POLYMORPHISM] Method abstrak yang akan di-override anak."""
+        pass
+
+class Pemasukan(Transaksi):
+    """[CHILD CLASS] Mewarisi Transaksi."""
+    def info_sukses(self):
+        # [POLYMORPHISM] Override pesan untuk Pemasukan
+        return f"Yey! Uang masuk Rp {self.get_nominal():,.0f} berhasil disimpan! 🤑"
+
+class Pengeluaran(Transaksi):
+    """[CHILD CLASS] Mewarisi Transaksi."""
+    def info_sukses(self):
+        # [POLYMORPHISM] Override pesan untuk Pengeluaran
+        return f"Oke, pengeluaran Rp {self.get_nominal():,.0f} tercatat. Hemat ya! 🥺"
@@ -0,0 +1,140 @@
+"""
+Laporan tahunan massal untuk SEMUA user terdaftar (tabel users).
+
+User dibagi per chunk ke beberapa proses (ProcessPoolExecutor), jadi laporan
+dibuat paralel di semua core CPU. Setiap proses worker membuka koneksi SQLite
+sendiri dalam mode read-only, menulis satu file CSV per user, lalu proses utama
+menggabungkan ringkasan semua user ke satu file. Di mode shard (wallet_shard.py)
+setiap user dibaca dari file shard-nya sendiri.
+
+Contoh:
+    python wallet_cli.py statements --year 2025 --output-dir laporan_2025 --workers 4
+"""
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from wallet_core import DatabaseManager, PoolKoneksi, nama_file_user, rentang_tahun, rentang_tahun_rekap, teks_rupiah
+from wallet_shard import buka_database, daftar_user_shard
+
+NAMA_BULAN = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+              "Agustus", "September", "Oktober", "November", "Desember"]
+
+# =============================================================================
+# 1. WORKER (DIJALANKAN DI PROSES TERPISAH)
+# =============================================================================
+
+_koneksi_worker = {} # File database -> koneksi read-only milik proses worker ini
+
+def _koneksi(file):
+    """Koneksi read-only proses ini ke file (direktori atau shard), dibuka sekali lalu dipakai untuk semua chunk."""
+    conn = _koneksi_worker.get(file)
+    if conn is None:
+        conn = _koneksi_worker[file] = PoolKoneksi.buka_baca_saja(file)
+    return conn
+
+def tulis_laporan_user(conn, username, tahun, folder):
+    """
+    Menulis laporan tahunan satu user (rekap per bulan + daftar transaksi) ke CSV.
+    Mengembalikan baris ringkasan (username, masuk, keluar, jumlah_transaksi, nama_file).
+    """
+    rekap = {f"{i:02d}": [0, 0] for i in range(1, 13)}
+    for bulan, jenis, total in conn.execute(DatabaseManager.QUERY_TAHUNAN, (username, *rentang_tahun_rekap(tahun))):
+        rekap[bulan][0 if jenis == "Pemasukan" else 1] = total
+    total_masuk = sum(m for m, _ in rekap.values())
+    total_keluar = sum(k for _, k in rekap.values())
+
+    nama_file = f"laporan_{tahun}_{nama_file_user(username)}.csv"
+    jumlah = 0
+    with open(os.path.join(folder, nama_file), mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("Laporan Tahunan", tahun, username))
+        writer.writerow(("Bulan", "Masuk", "Keluar", "Selisih"))
+        for i, (masuk, keluar) in enumerate(rekap.values()):
+            writer.writerow((NAMA_BULAN[i], teks_rupiah(masuk), teks_rupiah(keluar), teks_rupiah(masuk - keluar)))
+        writer.writerow(("Total", teks_rupiah(total_masuk), teks_rupiah(total_keluar), teks_rupiah(total_masuk - total_keluar)))
+        writer.writerow(())
+
+        writer.writerow(("ID", "Tanggal", "Jenis", "Kategori", "Deskripsi", "Nominal"))
+        cursor = conn.execute("""
+            SELECT id, tanggal, CASE WHEN jenis = 'Pemasukan' THEN 'Masuk' ELSE 'Keluar' END, kategori, deskripsi, nominal
+            FROM transaksi WHERE username = ? AND tanggal >= ? AND tanggal < ?
+            ORDER BY tanggal, id
+        """, (username, *rentang_tahun(tahun)))
+        while True:
+            batch = cursor.fetchmany(5000)
+            if not batch:
+                break
+            writer.writerows(baris[:5] + (teks_rupiah(baris[5]),) for baris in batch)
+            jumlah += len(batch)
+    return (username, total_masuk, total_keluar, jumlah, nama_file)
+
+def _proses_chunk(daftar_user, tahun, folder):
+    """Dijalankan di proses worker untuk satu chunk (username, file database)."""
+    return [tulis_laporan_user(_koneksi(file), username, tahun, folder) for username, file in daftar_user]
+
+# =============================================================================
+# 2. KOORDINATOR (PROSES UTAMA)
+# =============================================================================
+
+def bagi_chunk(daftar_user, ukuran_chunk):
+    """
+    Membagi user (sudah urut dari yang transaksinya terbanyak) ke chunk secara
+    berselang-seling, jadi setiap chunk mendapat campuran user berat dan ringan.
+    Dengan riwayat yang timpang, chunk berurutan biasa membuat satu worker
+    mengerjakan hampir semua baris sementara worker lain menganggur.
+    """
+    jumlah_chunk = max(1, -(-len(daftar_user) // ukuran_chunk))
+    return [daftar_user[i::jumlah_chunk] for i in range(jumlah_chunk)]
+
+def buat_laporan_semua_user(db_file, tahun, folder, jumlah_worker=None, ukuran_chunk=None, progress=None):
+    """
+    Membuat laporan tahunan untuk semua user terdaftar secara paralel.
+    jumlah_worker = jumlah proses (default: jumlah core CPU; 1 = tanpa proses tambahan),
+    ukuran_chunk = jumlah user per tugas (default: sekitar 4 tugas per worker),
+    progress(selesai, total) dipanggil setiap chunk selesai.
+    Mengembalikan dict: user, transaksi, detik, user_per_detik, file_ringkasan.
+    """
+    mulai = time.perf_counter()
+    os.makedirs(folder, exist_ok=True)
+    with buka_database(db_file) as db: # Sekaligus memastikan migrasi skema sudah berjalan
+        daftar_user = daftar_user_shard(db)
+    jumlah_worker = jumlah_worker or os.cpu_count() or 1
+    ukuran_chunk = ukuran_chunk or max(1, -(-len(daftar_user) // (jumlah_worker * 4)))
+    chunks = bagi_chunk(daftar_user, ukuran_chunk)
+
+    ringkasan = []
+    if jumlah_worker == 1:
+        try:
+            for chunk in chunks:
+                ringkasan.extend(_proses_chunk(chunk, tahun, folder))
+                if progress:
+                    progress(len(ringkasan), len(daftar_user))
+        finally:
+            for conn in _koneksi_worker.values():
+                conn.close()
+            _koneksi_worker.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=jumlah_worker) as pool:
+            tugas = [pool.submit(_proses_chunk, chunk, tahun, folder) for chunk in chunks]
+            for selesai in as_completed(tugas):
+                ringkasan.extend(selesai.result())
+                if progress:
+                    progress(len(ringkasan), len(daftar_user))
+
+    file_ringkasan = os.path.join(folder, f"ringkasan_{tahun}.csv")
+    with open(file_ringkasan, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("Username", "Masuk", "Keluar", "Selisih", "Jumlah Transaksi", "File"))
+        for username, masuk, keluar, jumlah, nama_file in sorted(ringkasan):
+            writer.writerow((username, teks_rupiah(masuk), teks_rupiah(keluar), teks_rupiah(masuk - keluar), jumlah, nama_file))
+
+    detik = time.perf_counter() - mulai
+    return {
+        "user": len(ringkasan),
+        "transaksi": sum(baris[3] for baris in ringkasan),
+        "detik": detik,
+        "user_per_detik": len(ringkasan) / detik if detik > 0 else 0.0,
+        "file_ringkasan": file_ringkasan,
+    }
@@ -0,0 +1,273 @@
+"""
+Mode penyimpanan shard (opsional): transaksi setiap user disimpan di file
+SQLite sendiri (atau satu file per bucket hash username), bukan di satu
+tabel transaksi bersama.
+
+File database utama tetap menjadi direktori: tabel users untuk akun dan
+tabel direktori_shard yang mencatat file shard setiap user. Setiap file shard
+memakai skema DatabaseManager yang sama, jadi semua query per user berjalan
+apa adanya, hanya di file yang jauh lebih kecil. Penulis untuk user berbeda
+menulis ke file berbeda, sehingga tidak saling mengunci.
+
+Database lama dipecah sekali dengan:
+    python wallet_cli.py shard-split --output-dir shard              # satu file per user
+    python wallet_cli.py shard-split --output-dir shard --buckets 16 # 16 file bucket
+
+Setelah itu semua program membuka database lewat buka_database(), yang
+otomatis memakai DatabaseShard jika direktori sudah dalam mode shard.
+"""
+import os
+import sqlite3
+import time
+import zlib
+
+from wallet_core import DatabaseManager, log, nama_file_user, tulis_ekspor_perubahan
+
+# =============================================================================
+# 1. ROUTER SHARD
+# =============================================================================
+
+def nama_file_shard(username, jumlah_bucket=0):
+    """Nama file shard untuk user: satu file per user (jumlah_bucket=0) atau per bucket hash."""
+    if jumlah_bucket:
+        return f"bucket_{zlib.crc32(username.encode('utf-8')) % jumlah_bucket:03d}.db"
+    return f"user_{nama_file_user(username)}.db"
+
+class DatabaseShard:
+    """
+    Pengganti DatabaseManager untuk mode shard. Method yang menerima username
+    sebagai argumen pertama diteruskan ke DatabaseManager milik file shard user
+    itu; method lain (login, cek index, dst.) berjalan di file direktori.
+    User yang belum tercatat di direktori_shard tetap dilayani file direktori,
+    begitu juga (mode baca_saja) user yang file shard-nya belum ada: direktori
+    tidak punya barisnya, jadi hasilnya kosong.
+    """
+    METHOD_PER_USER = frozenset({
+        "tambah_data", "tambah_banyak", "hapus_banyak", "pulihkan_jurnal", "impor_transaksi", "ekspor_csv",
+        "ambil_semua_data", "ambil_data_tahunan", "ambil_daftar_tahun", "ambil_rekap_multi_tahun",
+        "ambil_rekap_kategori", "ambil_data_bulanan", "ambil_halaman", "cari_transaksi", "ambil_ringkasan",
+        "ambil_versi_data", "ambil_cache", "lepas_cache", "simpan_anggaran", "ambil_anggaran",
+        "tambah_rutin", "ambil_rutin", "hapus_rutin",
+    })
+
+    def __init__(self, direktori):
+        self.direktori = direktori
+        self.db_file = direktori.db_file
+        self.conn = direktori.conn
+        self.cursor = direktori.cursor
+        self.folder = os.path.join(os.path.dirname(os.path.abspath(self.db_file)),
+                                   direktori.ambil_pengaturan("shard_folder"))
+        self.jumlah_bucket = int(direktori.ambil_pengaturan("shard_bucket", 0))
+        self._file_user = {}  # username -> path file shard (hanya user yang sudah tercatat)
+        self._shard = {}      # path file shard -> DatabaseManager
+
+    def file_shard(self, username):
+        """Path file shard user, atau None jika transaksinya masih di file direktori."""
+        if username not in self._file_user:
+            baris = self.direktori.cursor.execute(
+                "SELECT file FROM direktori_shard WHERE username=?", (username,)).fetchone()
+            if baris is None:
+                return None # Tidak di-cache: user bisa didaftarkan proses lain (penulis API) setelah ini
+            self._file_user[username] = os.path.join(self.folder, baris[0])
+        return self._file_user[username]
+
+    def untuk_user(self, username):
+        """DatabaseManager yang menyimpan transaksi user ini."""
+        file = self.file_shard(username)
+        if file is None:
+            return self.direktori
+        db = self._shard.get(file)
+        if db is None:
+            if self.direktori.baca_saja and not os.path.exists(file):
+                return self.direktori # Read-only tidak bisa membuat file; dicek ulang di panggilan berikutnya
+            db = self._shard[file] = DatabaseManager(file, self.direktori.baca_saja)
+        return db
+
+    def semua_db(self):
+        """Direktori dan semua file shard yang tercatat (untuk perawatan massal)."""
+        daftar = [self.direktori]
+        for (file,) in self.direktori.cursor.execute("SELECT DISTINCT file FROM direktori_shard ORDER BY file").fetchall():
+            path = os.path.join(self.folder, file)
+            if path not in self._shard:
+                if self.direktori.baca_saja and not os.path.exists(path):
+                    continue
+                self._shard[path] = DatabaseManager(path, self.direktori.baca_saja)
+            daftar.append(self._shard[path])
+        return daftar
+
+    def __getattr__(self, nama):
+        if nama in self.METHOD_PER_USER:
+            def teruskan(username, *args, **kwargs):
+                return getattr(self.untuk_user(username), nama)(username, *args, **kwargs)
+            return teruskan
+        return getattr(self.direktori, nama)
+
+    def registrasi_user(self, username, password):
+        """
+        Mendaftarkan user baru sekaligus menentukan file shard-nya (satu
+        transaksi), lalu membuat dan memigrasi file shard itu supaya pembaca
+        read-only (wallet_api) bisa langsung membukanya.
+        """
+        try:
+            self.cursor.execute("INSERT INTO users VALUES (?, ?)", (username, password))
+            self.cursor.execute("INSERT INTO direktori_shard VALUES (?, ?)",
+                                (username, nama_file_shard(username, self.jumlah_bucket)))
+            self.conn.commit()
+        except sqlite3.IntegrityError:
+            self.conn.rollback()
+            return False # Username sudah ada
+        self.untuk_user(username)
+        return True
+
+    def hapus_data(self, id_transaksi):
+        raise RuntimeError("hapus_data(id) tidak tersedia di mode shard (ID hanya unik per file); pakai hapus_banyak(username, ...)")
+
+    def bangun_ulang_ringkasan(self, username=None, commit=True):
+        for db in ([self.untuk_user(username)] if username else self.semua_db()):
+            db.bangun_ulang_ringkasan(username, commit)
+
+    def bangun_ulang_rekap_bulanan(self, username=None, commit=True):
+        for db in ([self.untuk_user(username)] if username else self.semua_db()):
+            db.bangun_ulang_rekap_bulanan(username, commit)
+
+    def bangun_ulang_fts(self, commit=True):
+        for db in self.semua_db():
+            db.bangun_ulang_fts(commit)
+
+    def jalankan_rutin(self, username=None, sampai=None):
+        """Catch-up transaksi rutin untuk satu user, atau semua user di semua file."""
+        if username:
+            return self.untuk_user(username).jalankan_rutin(username, sampai)
+        hasil = {}
+        for db in self.semua_db():
+            hasil.update(db.jalankan_rutin(None, sampai))
+        return hasil
+
+    def ekspor_perubahan(self, file_path, nama_checkpoint="gudang", ukuran_batch=5000):
+        """Export inkremental dari direktori dan semua shard ke satu CSV (checkpoint per file, kunci Sumber + ID)."""
+        return tulis_ekspor_perubahan(self.semua_db(), file_path, nama_checkpoint, ukuran_batch)
+
+    def reset_checkpoint(self, nama_checkpoint):
+        for db in self.semua_db():
+            db.reset_checkpoint(nama_checkpoint)
+
+    def hapus_checkpoint(self, nama_checkpoint):
+        for db in self.semua_db():
+            db.hapus_checkpoint(nama_checkpoint)
+
+    def tutup(self):
+        for db in self._shard.values():
+            db.tutup()
+        self._shard.clear()
+        self.direktori.tutup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
+
+def buka_database(db_file="dompet_pintar.db", baca_saja=False):
+    """
+    DatabaseManager untuk db_file, atau DatabaseShard jika file itu direktori mode shard.
+    baca_saja=True: semua file dibuka read-only (skema harus sudah dimigrasi).
+    """
+    db = DatabaseManager(db_file, baca_saja)
+    if db.ambil_pengaturan("shard_folder") is None:
+        return db
+    return DatabaseShard(db)
+
+def daftar_user_shard(db):
+    """
+    (username, path file yang menyimpan transaksinya) untuk semua user
+    terdaftar, urut dari yang transaksinya terbanyak. Di mode shard jumlah
+    transaksi dibaca dari ringkasan_user di setiap file shard (semua shard
+    sekaligus dibuka, jadi migrasinya pasti sudah berjalan).
+    """
+    jumlah = {}
+    for sumber in (db.semua_db() if isinstance(db, DatabaseShard) else [db]):
+        jumlah.update(sumber.cursor.execute("SELECT username, jumlah_transaksi FROM ringkasan_user").fetchall())
+    daftar = [(username, db.file_shard(username) if isinstance(db, DatabaseShard) else None)
+              for (username,) in db.cursor.execute("SELECT username FROM users").fetchall()]
+    daftar.sort(key=lambda baris: (-jumlah.get(baris[0], 0), baris[0]))
+    return [(username, file or db.db_file) for username, file in daftar]
+
+# =============================================================================
+# 2. MIGRASI: MEMECAH DATABASE MONOLITIK
+# =============================================================================
+
+KOLOM_TRANSAKSI = "id, username, jenis, kategori, deskripsi, nominal, tanggal"
+KOLOM_RUTIN = "id, username, jenis, kategori, deskripsi, nominal, satuan, setiap, mulai, selesai, terakhir"
+
+def pecah_database(db_file, folder="shard", jumlah_bucket=0, progress=None):
+    """
+    Memindahkan transaksi, anggaran, dan aturan rutin setiap user terdaftar
+    dari db_file ke file shard di `folder` (relatif terhadap lokasi db_file).
+    ID transaksi dan aturan rutin (beserta kolom terakhir, supaya catch-up
+    tidak mengulang kejadian) dipertahankan, jadi proses yang terputus aman
+    dijalankan ulang: baris yang sudah tersalin dilewati (INSERT OR IGNORE).
+    Per file shard, penyalinan di-commit dulu, baru kemudian user dicatat di
+    direktori dan barisnya dihapus dari db_file. Terakhir file direktori di-VACUUM supaya ukurannya mengecil.
+    progress(selesai, total) dipanggil setiap satu file shard selesai.
+    Mengembalikan dict: user, file, transaksi, detik.
+    """
+    mulai = time.perf_counter()
+    with DatabaseManager(db_file) as direktori:
+        folder_lama = direktori.ambil_pengaturan("shard_folder")
+        if folder_lama is not None and (folder_lama, int(direktori.ambil_pengaturan("shard_bucket", 0))) != (folder, jumlah_bucket):
+            raise ValueError(f"database ini sudah dipecah ke '{folder_lama}' dengan pengaturan lain")
+        direktori.simpan_pengaturan(shard_folder=folder, shard_bucket=jumlah_bucket)
+        folder_abs = os.path.join(os.path.dirname(os.path.abspath(db_file)), folder)
+        os.makedirs(folder_abs, exist_ok=True)
+
+        per_file = {}
+        for (username,) in direktori.cursor.execute("""
+            SELECT username FROM users
+            WHERE username NOT IN (SELECT username FROM direktori_shard) ORDER BY username
+        """).fetchall():
+            per_file.setdefault(nama_file_shard(username, jumlah_bucket), []).append(username)
+
+        dipindah = 0
+        for nomor, (file, daftar_user) in enumerate(sorted(per_file.items()), start=1):
+            with DatabaseManager(os.path.join(folder_abs, file)) as shard:
+                shard.cursor.execute("ATTACH DATABASE ? AS sumber", (os.path.abspath(db_file),))
+                try:
+                    for username in daftar_user:
+                        shard.cursor.execute(f"""
+                            INSERT OR IGNORE INTO transaksi ({KOLOM_TRANSAKSI})
+                            SELECT {KOLOM_TRANSAKSI} FROM sumber.transaksi WHERE username = ? ORDER BY id
+                        """, (username,))
+                        shard.cursor.execute("""
+                            INSERT OR IGNORE INTO anggaran (username, kategori, batas)
+                            SELECT username, kategori, batas FROM sumber.anggaran WHERE username = ?
+                        """, (username,))
+                        shard.cursor.execute(f"""
+                            INSERT OR IGNORE INTO transaksi_rutin ({KOLOM_RUTIN})
+                            SELECT {KOLOM_RUTIN} FROM sumber.transaksi_rutin WHERE username = ? ORDER BY id
+                        """, (username,))
+                    shard.conn.commit()
+                finally:
+                    shard.cursor.execute("DETACH DATABASE sumber")
+
+            # Baru setelah shard ter-commit: catat di direktori dan hapus dari file lama (satu transaksi)
+            direktori.cursor.executemany("INSERT OR REPLACE INTO direktori_shard VALUES (?, ?)",
+                                         [(username, file) for username in daftar_user])
+            for username in daftar_user:
+                direktori.cursor.execute("DELETE FROM transaksi WHERE username = ?", (username,))
+                dipindah += max(direktori.cursor.rowcount, 0)
+                direktori.cursor.execute("DELETE FROM anggaran WHERE username = ?", (username,))
+                direktori.cursor.execute("DELETE FROM transaksi_rutin WHERE username = ?", (username,))
+            direktori.conn.commit()
+            log.info("Shard %s: %d user", file, len(daftar_user))
+            if progress:
+                progress(nomor, len(per_file))
+
+        direktori.cursor.execute("VACUUM")
+        jumlah_user = direktori.cursor.execute("SELECT COUNT(*) FROM direktori_shard").fetchone()[0]
+        jumlah_file = direktori.cursor.execute("SELECT COUNT(DISTINCT file) FROM direktori_shard").fetchone()[0]
+    return {
+        "user": jumlah_user,
+        "file": jumlah_file,
+        "transaksi": dipindah,
+        "detik": time.perf_counter() - mulai,
+    }